@@ -0,0 +1,140 @@
+"""
+Document analysis for django-meditor
+Word, link and image counts are gathered during the post-processor tree
+walk and code languages while fenced code is being found, so analysing a
+document costs no extra pass over it. Results are cached with the HTML.
+"""
+import html
+import re
+from typing import Any, Dict, List, Optional
+from xml.etree.ElementTree import Element
+
+from markdown.extensions.attr_list import get_attrs_and_remainder
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+from markdown.preprocessors import Preprocessor
+from markdown.util import HTML_PLACEHOLDER_RE, STX
+
+
+WORDS_PER_MINUTE = 200
+
+# Stashed HTML that is never read: styles, scripts and comments
+_HIDDEN_HTML_PATTERN = re.compile(r'<(style|script)\b.*?</\1\s*>|<!--.*?-->', re.DOTALL | re.IGNORECASE)
+_TAG_PATTERN = re.compile(r'<[^>]*>')
+
+
+def reading_time(words: int) -> int:
+    """Minutes at WORDS_PER_MINUTE, at least one for any text"""
+    return max(1, round(words / WORDS_PER_MINUTE)) if words else 0
+
+
+def empty_analysis() -> Dict[str, Any]:
+    return {
+        'words': 0,
+        'characters': 0,
+        'reading_time': 0,
+        'headings': [],
+        'links': 0,
+        'images': 0,
+        'code_blocks': 0,
+        'code_languages': [],
+    }
+
+
+def _count_words(text: Optional[str]) -> int:
+    if not text:
+        return 0
+    if STX in text:
+        # Inline raw HTML is a placeholder token until serialization; its words are counted from the stash
+        text = HTML_PLACEHOLDER_RE.sub('', text)
+    return len(text.split())
+
+
+def _count_stashed_words(stashed) -> int:
+    """Words of raw HTML, extension output and code that the tree only holds as placeholders"""
+    if not isinstance(stashed, str):
+        return sum(_count_words(text) for text in stashed.itertext())
+    if '<' in stashed:
+        stashed = _TAG_PATTERN.sub('', _HIDDEN_HTML_PATTERN.sub(' ', stashed))
+    return len(html.unescape(stashed).split())
+
+
+def _flatten_headings(tokens: List[Dict[str, Any]], outline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    for token in tokens:
+        outline.append({'level': token['level'], 'id': token['id'], 'name': token['name']})
+        _flatten_headings(token['children'], outline)
+    return outline
+
+
+class DocumentAnalyzer:
+    """Collects the analysis of one document; reset between documents"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.words = 0
+        self.links = 0
+        self.images = 0
+        self.code_languages = []
+
+    def visit(self, element: Element) -> None:
+        """Called by the tree walk for every element"""
+        tag = element.tag
+        if tag == 'a':
+            self.links += 1
+        elif tag == 'img':
+            self.images += 1
+        self.words += _count_words(element.text) + _count_words(element.tail)
+
+    def fence(self, language: str) -> None:
+        """Called once per fenced code block with its language, '' if it has none"""
+        self.code_languages.append(language)
+
+    def result(self, md) -> Dict[str, Any]:
+        # Stashed blocks appear in the tree as placeholders, which count no words
+        words = self.words + sum(_count_stashed_words(stashed) for stashed in md.htmlStash.rawHtmlBlocks)
+        languages = []
+        for language in self.code_languages:
+            if language and language not in languages:
+                languages.append(language)
+        return {
+            'words': words,
+            'reading_time': reading_time(words),
+            # toc has already run, so reuse the outline it built
+            'headings': _flatten_headings(getattr(md, 'toc_tokens', []), []),
+            'links': self.links,
+            'images': self.images,
+            'code_blocks': len(self.code_languages),
+            'code_languages': languages,
+        }
+
+
+class FenceLanguagePreprocessor(Preprocessor):
+    """Report each fenced code block's language before fenced_code stashes it
+
+    Blocks are found the way fenced_code finds them, so an unclosed fence,
+    which renders as a paragraph, is not counted.
+    """
+
+    def __init__(self, md, analyzer: DocumentAnalyzer):
+        super().__init__(md)
+        self.analyzer = analyzer
+
+    def run(self, lines: List[str]) -> List[str]:
+        text = '\n'.join(lines)
+        index = 0
+        while True:
+            match = FencedBlockPreprocessor.FENCED_BLOCK_RE.search(text, index)
+            if not match:
+                return lines
+            language = match.group('lang') or ''
+            if match.group('attrs'):
+                attrs, remainder = get_attrs_and_remainder(match.group('attrs'))
+                if remainder:
+                    # Unbalanced braces: fenced_code skips past them, and so do we
+                    index = match.end('attrs')
+                    continue
+                classes = [value for key, value in attrs if key == '.']
+                language = classes[0] if classes else ''
+            self.analyzer.fence(language)
+            index = match.end()
@@ -1,7 +1,19 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_migrate
 
 
 class MeditorConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "meditor"
     verbose_name = "Markdown Editor"
+
+    def ready(self):
+        # Registers the system checks and the setting_changed receiver
+        from . import checks, warmup  # noqa: F401
+        from .search import restore_search_triggers
+
+        post_migrate.connect(restore_search_triggers, sender=self)
+
+        if getattr(settings, 'MEDITOR_WARM_UP', False):
+            warmup.warm_up()
@@ -0,0 +1,105 @@
+"""
+Editor scripts for django-meditor
+The editor is written as a small core script (static/meditor/js/editor/
+core.js) that imports its feature modules on first use. build_assets()
+minifies the core and modules into static/meditor/js/dist/ under content-
+hashed names, so they can be cached forever, and records them in a manifest
+that the widget reads to pick the core script it includes.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+from django.conf import settings
+
+
+logger = logging.getLogger('meditor')
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+SOURCE_PATH = 'meditor/js/editor'
+BUILD_PATH = 'meditor/js/dist'
+CORE_SCRIPT = 'core.js'
+MANIFEST_NAME = 'manifest.json'
+
+_manifest = None
+
+
+def minified_assets_enabled() -> bool:
+    return getattr(settings, 'MEDITOR_MINIFIED_ASSETS', not settings.DEBUG)
+
+
+def build_manifest() -> Dict[str, str]:
+    """Source file name -> built file name, read once per process"""
+    global _manifest
+    if _manifest is None:
+        path = os.path.join(STATIC_DIR, BUILD_PATH, MANIFEST_NAME)
+        try:
+            with open(path, encoding='utf-8') as f:
+                _manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read %s, serving unminified editor scripts: %s", path, e)
+            _manifest = {}
+    return _manifest
+
+
+def editor_script() -> str:
+    """Static path of the editor core script the widget should include"""
+    if minified_assets_enabled():
+        built = build_manifest().get(CORE_SCRIPT)
+        if built:
+            return f'{BUILD_PATH}/{built}'
+    return f'{SOURCE_PATH}/{CORE_SCRIPT}'
+
+
+def hashed_name(name: str, content: str) -> str:
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+    return f'{name[:-len(".js")]}.{digest}.min.js'
+
+
+def build_assets(source_dir: Optional[str] = None, output_dir: Optional[str] = None) -> Dict[str, str]:
+    """Minify the editor scripts into output_dir and write their manifest
+
+    Modules are built first so core.js can be rewritten to import them by
+    their hashed names. Builds no longer in the manifest are removed.
+    Needs rjsmin.
+    """
+    from rjsmin import jsmin
+
+    global _manifest
+    source_dir = source_dir or os.path.join(STATIC_DIR, SOURCE_PATH)
+    output_dir = output_dir or os.path.join(STATIC_DIR, BUILD_PATH)
+
+    def read(name):
+        with open(os.path.join(source_dir, name), encoding='utf-8') as f:
+            return f.read()
+
+    def write(name, content):
+        built = hashed_name(name, content)
+        with open(os.path.join(output_dir, built), 'w', encoding='utf-8') as f:
+            f.write(content)
+        return built
+
+    os.makedirs(output_dir, exist_ok=True)
+    modules = sorted(name for name in os.listdir(source_dir) if name.endswith('.js') and name != CORE_SCRIPT)
+    manifest = {name: write(name, jsmin(read(name))) for name in modules}
+
+    core = read(CORE_SCRIPT)
+    for name in modules:
+        literal = f"'{name}'"
+        if core.count(literal) != 1:
+            raise ValueError(f"{CORE_SCRIPT} must refer to {literal} exactly once")
+        core = core.replace(literal, f"'{manifest[name]}'")
+    manifest[CORE_SCRIPT] = write(CORE_SCRIPT, jsmin(core))
+
+    current = set(manifest.values())
+    for name in os.listdir(output_dir):
+        if name.endswith('.min.js') and name not in current:
+            os.remove(os.path.join(output_dir, name))
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+    _manifest = None
+    return manifest
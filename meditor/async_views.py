@@ -0,0 +1,399 @@
+"""
+Async versions of the django-meditor views for ASGI deployments
+Use them with include('meditor.async_urls') instead of meditor.urls
+"""
+import asyncio
+import inspect
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from .chunked import ChunkedUploadError, assemble_upload, discard_upload
+from .executor import run_in_executor
+from .models import MarkdownSnippet
+from .preview import diff_blocks, render_blocks
+from .views import (
+    batch_upload_response,
+    batch_upload_result,
+    chunked_chunk_request,
+    chunked_finalize_request,
+    chunked_start_request,
+    convert_paste_request,
+    get_upload_handler,
+    preview_response,
+    snippet_data,
+    snippet_page,
+    snippet_page_query,
+    snippet_search_request,
+    store_image,
+    store_preview_draft,
+    upload_batch_size,
+    validate_image,
+)
+
+
+logger = logging.getLogger('meditor')
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncHtmlToMarkdownView(View):
+    """Convert HTML to Markdown via AJAX without blocking the event loop"""
+    
+    async def post(self, request):
+        user = await request.auser()
+        payload, status = await run_in_executor(convert_paste_request, request, user)
+        return JsonResponse(payload, status=status)
+
+
+@staff_member_required
+async def upload_image(request):
+    """Handle image uploads for the markdown editor"""
+    if request.method == 'POST' and request.FILES.get('image'):
+        try:
+            image_file = request.FILES['image']
+            
+            # Pillow verification is CPU work
+            error = await run_in_executor(validate_image, image_file)
+            if error:
+                return JsonResponse({
+                    'success': False,
+                    'error': error
+                }, status=400)
+            
+            handler = get_upload_handler()
+            if handler:
+                if inspect.iscoroutinefunction(handler):
+                    return await handler(request, image_file)
+                return await sync_to_async(handler)(request, image_file)
+            
+            # Storage backends are synchronous; keep their I/O off the loop
+            url = await run_in_executor(store_image, image_file)
+            
+            return JsonResponse({
+                'success': True,
+                'url': url,
+                'filename': image_file.name
+            })
+            
+        except Exception as e:
+            logger.exception("Image upload failed")
+            return JsonResponse({
+                'success': False,
+                'error': f'Upload failed: {str(e)}'
+            }, status=500)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'No image file provided'
+    }, status=400)
+
+
+@staff_member_required
+async def upload_images(request):
+    """Handle several image uploads in one request"""
+    if request.method != 'POST':
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid request method'
+        }, status=405)
+    
+    image_files = request.FILES.getlist('images')
+    if not image_files:
+        return JsonResponse({
+            'success': False,
+            'error': 'No image files provided'
+        }, status=400)
+    if len(image_files) > upload_batch_size():
+        return JsonResponse({
+            'success': False,
+            'error': f'Too many files: at most {upload_batch_size()} per request'
+        }, status=400)
+    
+    handler = get_upload_handler()
+    if handler and inspect.iscoroutinefunction(handler):
+        results = await asyncio.gather(*(
+            async_batch_upload_result(handler, request, image_file) for image_file in image_files
+        ))
+    else:
+        results = await asyncio.gather(*(
+            run_in_executor(batch_upload_result, request, image_file) for image_file in image_files
+        ))
+    return batch_upload_response(list(results))
+
+
+async def async_batch_upload_result(handler, request, image_file):
+    """batch_upload_result for a coroutine MEDITOR_UPLOAD_HANDLER"""
+    try:
+        error = await run_in_executor(validate_image, image_file)
+        if error:
+            return {'success': False, 'filename': image_file.name, 'error': error}
+        result = json.loads((await handler(request, image_file)).content)
+        result.setdefault('filename', image_file.name)
+        return result
+    except Exception as e:
+        return {'success': False, 'filename': image_file.name, 'error': f'Upload failed: {str(e)}'}
+
+
+@staff_member_required
+async def chunked_upload_start(request):
+    """Begin a chunked, resumable image upload"""
+    if request.method == 'POST':
+        user = await request.auser()
+        payload, status = await run_in_executor(chunked_start_request, request, user)
+        return JsonResponse(payload, status=status)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+
+@staff_member_required
+async def chunked_upload(request, upload_id):
+    """Report, receive or abort the chunks of a chunked upload"""
+    user = await request.auser()
+    # Chunk bodies are spooled by the ASGI handler; copying them is file I/O
+    payload, status = await run_in_executor(chunked_chunk_request, request, user, upload_id)
+    return JsonResponse(payload, status=status)
+
+
+async def finalize_with_async_handler(handler, request, user, upload_id):
+    """Hand a completed chunked upload to a coroutine MEDITOR_UPLOAD_HANDLER"""
+    try:
+        image_file = await run_in_executor(assemble_upload, user, upload_id)
+    except ChunkedUploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+    
+    try:
+        error = await run_in_executor(validate_image, image_file)
+        if error:
+            return JsonResponse({'success': False, 'error': error}, status=400)
+        return await handler(request, image_file)
+    finally:
+        image_file.close()
+        discard_upload(upload_id)
+
+
+@staff_member_required
+async def chunked_upload_finalize(request, upload_id):
+    """Verify and store a completed chunked upload"""
+    if request.method == 'POST':
+        user = await request.auser()
+        handler = get_upload_handler()
+        if handler and inspect.iscoroutinefunction(handler):
+            return await finalize_with_async_handler(handler, request, user, upload_id)
+        payload, status = await run_in_executor(chunked_finalize_request, request, user, upload_id)
+        return JsonResponse(payload, status=status)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+
+@staff_member_required
+async def snippets_list(request):
+    """Get one page of the snippets available to the current user"""
+    if request.method == 'GET':
+        user = await request.auser()
+        try:
+            queries, limit = snippet_page_query(user, request.GET.get('cursor'), request.GET.get('limit'))
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid cursor or limit'
+            }, status=400)
+        
+        return JsonResponse(snippet_page([[row async for row in rows] for rows in queries], limit, user))
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+
+@staff_member_required
+async def snippet_search(request):
+    """Full-text search over snippet names, categories and content"""
+    if request.method == 'GET':
+        user = await request.auser()
+        # Raw full-text SQL has no async cursor
+        payload, status = await sync_to_async(snippet_search_request)(request, user)
+        return JsonResponse(payload, status=status)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+
+@staff_member_required
+async def snippet_detail(request, snippet_id):
+    """Get one snippet, including its full content"""
+    if request.method == 'GET':
+        user = await request.auser()
+        try:
+            snippet = await MarkdownSnippet.objects.visible_to(user).aget(id=snippet_id)
+        except MarkdownSnippet.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'error': 'Snippet not found'
+            }, status=404)
+        
+        return JsonResponse({
+            'success': True,
+            'snippet': snippet_data(snippet, is_owner=snippet.user_id == user.pk)
+        })
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+
+@staff_member_required
+async def save_snippet(request):
+    """Save a new snippet or update existing one"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            name = data.get('name')
+            content = data.get('content')
+            category = data.get('category', '')
+            is_public = data.get('is_public', False)
+            snippet_id = data.get('id')  # For updates
+            
+            if not name or not content:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Name and content are required'
+                }, status=400)
+            
+            user = await request.auser()
+            if snippet_id:
+                # Update existing snippet
+                try:
+                    snippet = await MarkdownSnippet.objects.aget(id=snippet_id, user=user)
+                    snippet.name = name
+                    snippet.content = content
+                    snippet.category = category
+                    snippet.is_public = is_public
+                    await snippet.asave()
+                except MarkdownSnippet.DoesNotExist:
+                    return JsonResponse({
+                        'success': False,
+                        'error': 'Snippet not found'
+                    }, status=404)
+            else:
+                # Create new snippet
+                snippet = await MarkdownSnippet.objects.acreate(
+                    user=user,
+                    name=name,
+                    content=content,
+                    category=category,
+                    is_public=is_public
+                )
+            
+            return JsonResponse({
+                'success': True,
+                'snippet': snippet_data(snippet, is_owner=True)
+            })
+            
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid JSON data'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+
+@staff_member_required
+async def delete_snippet(request, snippet_id):
+    """Delete a snippet"""
+    if request.method == 'DELETE':
+        try:
+            user = await request.auser()
+            snippet = await MarkdownSnippet.objects.aget(id=snippet_id, user=user)
+            await snippet.adelete()
+            
+            return JsonResponse({
+                'success': True,
+                'message': 'Snippet deleted successfully'
+            })
+            
+        except MarkdownSnippet.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'error': 'Snippet not found'
+            }, status=404)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+
+@staff_member_required
+async def block_preview(request):
+    """Render a draft block by block, returning HTML only for blocks the client lacks"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            content = data.get('content', '')
+            known = data.get('known', [])
+            
+            result = await run_in_executor(lambda: diff_blocks(render_blocks(content), known))
+            
+            return JsonResponse({
+                'success': True,
+                'revision': result['revision'],
+                'blocks': result['blocks']
+            })
+            
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid JSON data'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+
+@staff_member_required
+async def generic_preview(request, app_label, model_name, pk):
+    """Preview a saved object, a stored draft (?draft=<token>), or GET fields"""
+    user = await request.auser()
+    if request.method == 'POST':
+        payload, status = await sync_to_async(store_preview_draft)(request, user, app_label, model_name, pk)
+        return JsonResponse(payload, status=status)
+    
+    # Templates may touch lazy relations, which must run in a sync context
+    return await sync_to_async(preview_response)(request, user, app_label, model_name, pk)
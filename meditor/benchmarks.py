@@ -0,0 +1,443 @@
+"""
+Benchmarks for django-meditor
+Run them through the meditor_benchmark management command. Inputs come
+from a seeded synthetic corpus, so runs on the same machine are comparable
+and can be checked against a saved baseline.
+"""
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .extensions import AlertExtension, QuoteExtension
+
+
+CORPUS_SEED = 1729
+
+# Metrics compared against a baseline; higher is worse for all of them
+BASELINE_METRICS = ('p50_us', 'p90_us', 'peak_kb')
+
+_WORDS = (
+    'render markdown editor preview snippet gallery cache engine upload image table column '
+    'request response template block heading paragraph stream token server client draft '
+    'the a of and to in is it that for on with as was at by this be from or'
+).split()
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples) + 0.5) - 1))
+    return samples[index]
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Peak bytes allocated by Python during one call of func"""
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        return max(0, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+
+def measure(label: str, func: Callable[[], Any], iterations: int) -> Dict[str, Any]:
+    """Call func iterations times and report throughput, latency percentiles
+    and the peak memory of a single call"""
+    func()  # Warm up caches and compiled templates
+    gc.collect()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+
+    # Measured separately: tracing allocations slows every call down
+    return summarize(label, samples, peak_memory(func), elapsed)
+
+
+def summarize(label: str, samples: List[float], peak: int, elapsed: Optional[float] = None) -> Dict[str, Any]:
+    """Report per-call samples (in seconds) in the shape every suite returns
+
+    peak is in bytes. elapsed defaults to the sum of the samples.
+    """
+    samples = sorted(samples)
+    iterations = len(samples)
+    elapsed = sum(samples) if elapsed is None else elapsed
+    return {
+        'label': label,
+        'iterations': iterations,
+        'total_s': elapsed,
+        'per_call_us': elapsed / iterations * 1_000_000,
+        'ops_per_s': iterations / elapsed if elapsed else float('inf'),
+        'p50_us': _percentile(samples, 0.50) * 1_000_000,
+        'p90_us': _percentile(samples, 0.90) * 1_000_000,
+        'p99_us': _percentile(samples, 0.99) * 1_000_000,
+        'max_us': samples[-1] * 1_000_000,
+        'peak_kb': peak / 1024,
+    }
+
+
+# Synthetic corpus
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = ' '.join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def _paragraph(rng: random.Random) -> str:
+    sentences = [_sentence(rng, rng.randint(6, 18)) for _ in range(rng.randint(2, 5))]
+    # Sprinkle inline markup the way real documents do
+    index = rng.randrange(len(sentences))
+    sentences[index] += f" See [the {rng.choice(_WORDS)} docs](https://example.com/{rng.choice(_WORDS)})."
+    index = rng.randrange(len(sentences))
+    sentences[index] = f"**{sentences[index]}** Use `{rng.choice(_WORDS)}()` with *care*."
+    return ' '.join(sentences)
+
+
+def markdown_document(sections: int, seed: int = CORPUS_SEED) -> str:
+    """Plain markdown: headings, paragraphs, lists, tables and fenced code"""
+    rng = random.Random(seed)
+    parts = []
+    for section in range(sections):
+        parts.append(f"## {_sentence(rng, 4)[:-1]} {section}")
+        parts.append(_paragraph(rng))
+        kind = section % 4
+        if kind == 0:
+            parts.append('\n'.join(f"- {_sentence(rng, 6)}" for _ in range(rng.randint(3, 6))))
+        elif kind == 1:
+            rows = '\n'.join(f"| {rng.choice(_WORDS)} | {rng.randint(1, 999)} | {_sentence(rng, 4)} |" for _ in range(5))
+            parts.append(f"| Name | Count | Notes |\n|---|---|---|\n{rows}")
+        elif kind == 2:
+            body = '\n'.join(f"    result_{line} = render({rng.choice(_WORDS)!r})" for line in range(6))
+            parts.append(f"```python\ndef example():\n{body}\n    return result_0\n```")
+        else:
+            parts.append(f"> {_paragraph(rng)}\n>\n> {_sentence(rng)}")
+        parts.append(_paragraph(rng))
+    return '\n\n'.join(parts) + '\n'
+
+
+def extension_document(blocks: int, seed: int = CORPUS_SEED) -> str:
+    """Markdown dominated by {{...}} extension blocks"""
+    rng = random.Random(seed)
+    parts = []
+    for block in range(blocks):
+        kind = block % 4
+        if kind == 0:
+            parts.append(f"{{{{alert:{rng.choice(['info', 'warning', 'error', 'success'])}}}}}{_paragraph(rng)}{{{{/alert}}}}")
+        elif kind == 1:
+            parts.append(f"{{{{quote:{rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()}}}}}{_sentence(rng, 20)}{{{{/quote}}}}")
+        elif kind == 2:
+            images = ' '.join(f"![{rng.choice(_WORDS)}](/media/meditor/uploads/{block}-{image}.png)" for image in range(4))
+            parts.append(f"{{{{gallery}}}}{images}{{{{/gallery}}}}")
+        else:
+            code = '\n'.join(f"print({rng.choice(_WORDS)!r})" for _ in range(5))
+            parts.append(f"{{{{code:python}}}}\n{code}\n{{{{/code}}}}")
+        parts.append(_paragraph(rng))
+    return '\n\n'.join(parts) + '\n'
+
+
+def unclosed_extensions(blocks: int, seed: int = CORPUS_SEED) -> str:
+    """Extension openers that never close, the worst case for block scanning"""
+    rng = random.Random(seed)
+    parts = []
+    for block in range(blocks):
+        tag = ('alert:info', 'quote:Nobody', 'gallery', 'code:python')[block % 4]
+        parts.append(f"{{{{{tag}}}}} {_paragraph(rng)}")
+    # One closer at the very end makes every earlier opener look ahead to it
+    parts.append('{{/alert}}')
+    return '\n\n'.join(parts) + '\n'
+
+
+def office_html(paragraphs: int, seed: int = CORPUS_SEED) -> str:
+    """HTML as pasted from Word: conditional comments, namespaced tags, inline styles"""
+    rng = random.Random(seed)
+    parts = [
+        '<html xmlns:o="urn:schemas-microsoft-com:office:office"><head>'
+        '<!--[if gte mso 9]><xml><o:OfficeDocumentSettings><o:AllowPNG/></o:OfficeDocumentSettings></xml><![endif]-->'
+        '<style>p.MsoNormal{margin:0cm;font-size:11.0pt;font-family:"Calibri",sans-serif;}</style>'
+        '</head><body lang="EN-US" style="tab-interval:36.0pt">'
+    ]
+    for index in range(paragraphs):
+        words = [
+            f'<span style="font-size:12.0pt;mso-bidi-font-family:Calibri">{word}</span>'
+            if rng.random() < 0.3 else word
+            for word in _sentence(rng, 16).split()
+        ]
+        parts.append(f'<p class="MsoNormal" style="margin-bottom:8.0pt;line-height:107%">{" ".join(words)}<o:p></o:p></p>')
+        if index % 10 == 9:
+            cells = ''.join(
+                f'<td width="200" valign="top" style="border:solid windowtext 1.0pt;padding:0cm 5.4pt">'
+                f'<p class="MsoNormal"><span style="mso-ansi-language:EN-US">{rng.choice(_WORDS)}</span></p></td>'
+                for _ in range(3)
+            )
+            parts.append(f'<table class="MsoTableGrid" border="1" cellspacing="0" cellpadding="0"><tr>{cells}</tr><tr>{cells}</tr></table>')
+        if index % 25 == 24:
+            parts.append('<p class="MsoNormal"><img width="1" height="1" src="data:image/png;base64,'
+                         'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="></p>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+# Suites
+
+def extension_renderers(iterations: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compare the compiled-template path with the Python renderer path"""
+    iterations = iterations or 2000
+    samples = [
+        (AlertExtension(), "{{alert:warning}}Mind the gap.\n\nSecond paragraph.{{/alert}}"),
+        (QuoteExtension(), "{{quote:Ada Lovelace}}The Analytical Engine weaves algebraic patterns.{{/quote}}"),
+    ]
+    results = []
+    for extension, source in samples:
+        data = extension.extract_data(extension.pattern.search(source))
+        results.append(measure(f'{extension.name}: template', lambda: extension.render_template(data), iterations))
+        results.append(measure(f'{extension.name}: renderer', lambda: extension.renderer(data), iterations))
+    return results
+
+
+def render_pipeline(iterations: Optional[int] = None) -> List[Dict[str, Any]]:
+    """markdown_to_html on a cache miss (the full pipeline) and on a hit"""
+    from .templatetags.markdown_filters import markdown_to_html, render_markdown
+
+    documents = [
+        ('small', markdown_document(3), 500),
+        ('large', markdown_document(400), 10),
+        ('extension-heavy', extension_document(100), 20),
+        ('unclosed extensions', unclosed_extensions(200), 20),
+    ]
+    results = []
+    for name, source, default_iterations in documents:
+        results.append(measure(f'{name} ({len(source) // 1024}KB)', lambda: render_markdown(source), iterations or default_iterations))
+    large = documents[1][1]
+    results.append(measure('large, render cache hit', lambda: markdown_to_html(large), iterations or 2000))
+    return results
+
+
+def extension_processing(iterations: Optional[int] = None) -> List[Dict[str, Any]]:
+    """MarkdownProcessor.process alone, before Python-Markdown runs"""
+    from .extensions import markdown_processor
+
+    documents = [
+        ('plain large', markdown_document(400), 50),
+        ('extension-heavy', extension_document(100), 50),
+        ('unclosed extensions', unclosed_extensions(200), 50),
+    ]
+    return [
+        measure(f'{name} ({len(source) // 1024}KB)', lambda: markdown_processor.process(source), iterations or default_iterations)
+        for name, source, default_iterations in documents
+    ]
+
+
+def html_conversion(iterations: Optional[int] = None) -> List[Dict[str, Any]]:
+    """HtmlToMarkdownView end to end on Office-style pastes"""
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+
+    from .views import HtmlToMarkdownView
+
+    view = HtmlToMarkdownView.as_view()
+    factory = RequestFactory()
+
+    def convert(body):
+        request = factory.post('/html2md/', body, content_type='application/json')
+        # Anonymous users never have inline images stored
+        request.user = AnonymousUser()
+        response = view(request)
+        assert response.status_code == 200, response.content
+
+    results = []
+    for name, paragraphs, default_iterations in [('small paste', 10, 200), ('large paste', 1000, 5)]:
+        body = json.dumps({'html': office_html(paragraphs)})
+        results.append(measure(f'{name} ({len(body) // 1024}KB)', lambda: convert(body), iterations or default_iterations))
+    return results
+
+
+@contextmanager
+def _rolled_back():
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def snippet_listing(iterations: Optional[int] = None, rows: int = 20000) -> List[Dict[str, Any]]:
+    """snippets_list and snippet_search against a large snippet table
+
+    The rows are created in a transaction that is rolled back afterwards.
+    """
+    from django.contrib.auth import get_user_model
+    from django.test import RequestFactory
+
+    from .models import MarkdownSnippet
+    from .views import snippet_search, snippets_list
+
+    factory = RequestFactory()
+    rng = random.Random(CORPUS_SEED)
+    results = []
+
+    def call(view, path, **params):
+        request = factory.get(path, params)
+        request.user = user
+        response = view(request)
+        assert response.status_code == 200, response.content
+        return json.loads(response.content)
+
+    with _rolled_back():
+        user = get_user_model().objects.create(username=f'meditor-benchmark-{rng.getrandbits(32):08x}', is_staff=True)
+        other = get_user_model().objects.create(username=f'meditor-benchmark-{rng.getrandbits(32):08x}')
+        MarkdownSnippet.objects.bulk_create([
+            MarkdownSnippet(
+                user=user if index % 3 else other,
+                name=f'{_sentence(rng, 3)[:-1]} {index}',
+                category=rng.choice(_WORDS),
+                content=_paragraph(rng),
+                is_public=index % 6 == 0,
+            )
+            for index in range(rows)
+        ], batch_size=1000)
+
+        first = call(snippets_list, '/snippets/')
+        results.append(measure(f'first page ({rows} rows)', lambda: call(snippets_list, '/snippets/'), iterations or 200))
+        results.append(measure(
+            'second page', lambda: call(snippets_list, '/snippets/', cursor=first['next_cursor']), iterations or 200
+        ))
+        results.append(measure('search, common term', lambda: call(snippet_search, '/snippets/search/', q='render'), iterations or 100))
+        results.append(measure('search, prefix', lambda: call(snippet_search, '/snippets/search/', q='ga'), iterations or 100))
+    return results
+
+
+# Run in a fresh interpreter per sample; prints its timings as JSON
+_STARTUP_SCRIPT = '''
+import json, resource, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+timings = {'boot': time.perf_counter() - start}
+from meditor.benchmarks import markdown_document
+from meditor.templatetags.markdown_filters import render_markdown
+source = markdown_document(20)
+if sys.argv[1] == 'warm':
+    from meditor.warmup import warm_up
+    start = time.perf_counter()
+    warm_up()
+    timings['warm_up'] = time.perf_counter() - start
+start = time.perf_counter()
+render_markdown(source)
+timings['first_render'] = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+timings['rss_kb'] = rss / 1024 if sys.platform == 'darwin' else rss
+print(json.dumps(timings))
+'''
+
+
+def _start_worker(mode: str) -> Dict[str, float]:
+    from django.conf import settings
+
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run(
+        [sys.executable, '-c', _STARTUP_SCRIPT, mode], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def startup(iterations: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Worker boot and first-render latency, each sample a new process
+
+    Boot is django.setup(), which includes warm_up() when MEDITOR_WARM_UP is
+    on. Peak memory is the worker's peak resident set size.
+    """
+    iterations = iterations or 5
+    cold = [_start_worker('cold') for _ in range(iterations)]
+    warm = [_start_worker('warm') for _ in range(iterations)]
+
+    def rss(workers):
+        return max(worker['rss_kb'] for worker in workers) * 1024
+
+    return [
+        summarize('worker boot (django.setup)', [worker['boot'] for worker in cold], rss(cold)),
+        summarize('warm_up()', [worker['warm_up'] for worker in warm], rss(warm)),
+        summarize('first render, cold', [worker['first_render'] for worker in cold], rss(cold)),
+        summarize('first render, after warm_up()', [worker['first_render'] for worker in warm], rss(warm)),
+    ]
+
+
+SUITES = {
+    'extensions': extension_renderers,
+    'render': render_pipeline,
+    'process': extension_processing,
+    'html2md': html_conversion,
+    'snippets': snippet_listing,
+    'startup': startup,
+}
+
+
+# Baselines
+
+def environment() -> Dict[str, str]:
+    import django
+    import markdown
+
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'markdown': markdown.__version__,
+        'machine': platform.machine(),
+    }
+
+
+def save_baseline(path: str, results: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Write results, keyed by suite and label, to a JSON file"""
+    baseline = {
+        'environment': environment(),
+        'results': {
+            f'{suite}: {result["label"]}': {metric: round(result[metric], 1) for metric in BASELINE_METRICS}
+            for suite, suite_results in results.items()
+            for result in suite_results
+        },
+    }
+    with open(path, 'w') as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def compare(results: Dict[str, List[Dict[str, Any]]], baseline: Dict[str, Any],
+            tolerance: float = 0.25) -> Iterator[Dict[str, Any]]:
+    """Yield every metric more than tolerance worse than its baseline value
+
+    Measurements missing from the baseline are skipped.
+    """
+    saved = baseline.get('results', {})
+    for suite, suite_results in results.items():
+        for result in suite_results:
+            key = f'{suite}: {result["label"]}'
+            for metric in BASELINE_METRICS:
+                previous = saved.get(key, {}).get(metric)
+                if not previous:
+                    continue
+                if result[metric] > previous * (1 + tolerance):
+                    yield {
+                        'key': key,
+                        'metric': metric,
+                        'baseline': previous,
+                        'current': result[metric],
+                        'change': result[metric] / previous - 1,
+                    }
@@ -0,0 +1,144 @@
+"""
+Rendered HTML cache for django-meditor
+Two tiers: a bounded in-process LRU backed by an optional Django cache alias
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+
+
+def content_hash(text: str) -> str:
+    """Return a stable hex digest for a piece of source text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def config_fingerprint(*parts: Any) -> str:
+    """Return a short digest identifying a rendering configuration"""
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class RenderCache:
+    """Content-hash keyed cache for rendered HTML"""
+
+    def __init__(self, namespace: str, fingerprint_func: Callable[[], Iterable[Any]],
+                 size_setting: str = 'MEDITOR_RENDER_CACHE_SIZE', default_size: int = 512):
+        self.namespace = namespace
+        self.fingerprint_func = fingerprint_func
+        self.size_setting = size_setting
+        self.default_size = default_size
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+        self._fingerprint = None
+        self.reset_stats()
+
+    @property
+    def max_size(self) -> int:
+        return getattr(settings, self.size_setting, self.default_size)
+
+    @property
+    def timeout(self) -> Optional[int]:
+        return getattr(settings, 'MEDITOR_RENDER_CACHE_TIMEOUT', 60 * 60 * 24)
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint of the active extension/settings config, computed once"""
+        if self._fingerprint is None:
+            self._fingerprint = config_fingerprint(
+                getattr(settings, 'MEDITOR_RENDER_CACHE_VERSION', 1),
+                *self.fingerprint_func()
+            )
+        return self._fingerprint
+
+    def _shared_cache(self):
+        alias = getattr(settings, 'MEDITOR_CACHE_ALIAS', None)
+        if not alias:
+            return None
+        from django.core.cache import caches
+        return caches[alias]
+
+    def make_key(self, source: str) -> str:
+        return f"meditor:{self.namespace}:{self.fingerprint}:{content_hash(source)}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look a key up in the local tier, then the shared tier"""
+        with self._lock:
+            if key in self._local:
+                self._local.move_to_end(key)
+                self.hits += 1
+                self.local_hits += 1
+                return self._local[key]
+
+        shared = self._shared_cache()
+        if shared is not None:
+            try:
+                value = shared.get(key)
+            except Exception:
+                value = None
+            if value is not None:
+                self._store_local(key, value)
+                with self._lock:
+                    self.hits += 1
+                    self.shared_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        self._store_local(key, value)
+        shared = self._shared_cache()
+        if shared is not None:
+            try:
+                shared.set(key, value, self.timeout)
+            except Exception:
+                # A broken shared cache must never break rendering
+                pass
+
+    def _store_local(self, key: str, value: Any) -> None:
+        max_size = self.max_size
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > max_size:
+                self._local.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_render(self, source: str, render: Callable[[str], Any]) -> Any:
+        """Return the cached rendering of source, rendering it on a miss"""
+        key = self.make_key(source)
+        value = self.get(key)
+        if value is None:
+            value = render(source)
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop the local tier and recompute the config fingerprint"""
+        with self._lock:
+            self._local.clear()
+            self._fingerprint = None
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'local_hits': self.local_hits,
+                'shared_hits': self.shared_hits,
+                'evictions': self.evictions,
+                'size': len(self._local),
+                'max_size': self.max_size,
+            }
@@ -0,0 +1,19 @@
+"""
+System checks for django-meditor
+Report custom extensions and post-processors that fail to load, which
+would otherwise only show up as log warnings once rendering starts.
+"""
+from django.core.checks import Warning, register
+
+from .postprocessors import load_postprocessors
+
+
+@register()
+def check_render_pipeline(app_configs=None, **kwargs):
+    from .extensions import markdown_processor
+
+    messages = [Warning(error, id='meditor.W001') for error in markdown_processor.errors]
+    errors = []
+    load_postprocessors(errors=errors)
+    messages.extend(Warning(error, id='meditor.W002') for error in errors)
+    return messages
@@ -0,0 +1,225 @@
+"""
+Chunked, resumable uploads for django-meditor
+Chunks are written straight into a temp file on disk at their offset, so
+they can arrive in parallel, in any order, and be retried individually
+"""
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.files import File
+
+
+READ_BLOCK_SIZE = 64 * 1024
+
+_UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+_SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+_last_sweep = 0.0
+
+
+class ChunkedUploadError(Exception):
+    """Raised for a request the upload cannot accept; status is the HTTP status"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def upload_dir() -> str:
+    return getattr(settings, 'MEDITOR_CHUNKED_UPLOAD_DIR', None) or os.path.join(tempfile.gettempdir(), 'meditor-uploads')
+
+
+def chunk_size() -> int:
+    return getattr(settings, 'MEDITOR_UPLOAD_CHUNK_SIZE', 1024 * 1024)
+
+
+def upload_expiry() -> int:
+    return getattr(settings, 'MEDITOR_CHUNKED_UPLOAD_EXPIRY', 60 * 60 * 24)
+
+
+def _paths(upload_id: str) -> Dict[str, str]:
+    base = os.path.join(upload_dir(), upload_id)
+    return {'base': base, 'meta': os.path.join(base, 'meta.json'),
+            'data': os.path.join(base, 'data'), 'parts': os.path.join(base, 'parts')}
+
+
+def _load(user, upload_id: str) -> Dict[str, Any]:
+    if not _UPLOAD_ID_PATTERN.match(upload_id):
+        raise ChunkedUploadError('Upload not found', status=404)
+    paths = _paths(upload_id)
+    try:
+        with open(paths['meta']) as meta_file:
+            meta = json.load(meta_file)
+    except (OSError, ValueError):
+        raise ChunkedUploadError('Upload not found', status=404)
+    if meta['user'] != user.pk:
+        raise ChunkedUploadError('Upload not found', status=404)
+    return meta
+
+
+def _chunk_count(meta: Dict[str, Any]) -> int:
+    return max(1, -(-meta['size'] // meta['chunk_size']))
+
+
+def _received(upload_id: str) -> List[int]:
+    try:
+        return sorted(int(name) for name in os.listdir(_paths(upload_id)['parts']))
+    except OSError:
+        return []
+
+
+def _status(upload_id: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'success': True,
+        'upload_id': upload_id,
+        'size': meta['size'],
+        'chunk_size': meta['chunk_size'],
+        'received': [index * meta['chunk_size'] for index in _received(upload_id)],
+    }
+
+
+def start_upload(user, filename: str, size: int, sha256: str) -> Dict[str, Any]:
+    """Reserve a temp file for an upload and return its id and chunk size"""
+    max_size = getattr(settings, 'EDITOR_MAX_IMAGE_SIZE', 20 * 1024 * 1024)
+    if not isinstance(size, int) or size <= 0:
+        raise ChunkedUploadError('Invalid upload size')
+    if size > max_size:
+        raise ChunkedUploadError(
+            f'File too large: {size / (1024 * 1024):.1f}MB. Maximum size is {max_size / (1024 * 1024):.0f}MB.',
+            status=413
+        )
+    sha256 = (sha256 or '').lower()
+    if not _SHA256_PATTERN.match(sha256):
+        raise ChunkedUploadError('A SHA-256 hex digest of the file is required')
+
+    sweep_stale_uploads(throttle=True)
+
+    upload_id = secrets.token_hex(16)
+    paths = _paths(upload_id)
+    os.makedirs(paths['parts'])
+    # Sized up front so chunks can be written at any offset
+    with open(paths['data'], 'wb') as data_file:
+        data_file.truncate(size)
+
+    meta = {
+        'user': user.pk,
+        'filename': os.path.basename(filename or '') or 'upload',
+        'size': size,
+        'sha256': sha256,
+        'chunk_size': chunk_size(),
+        'created': time.time(),
+    }
+    with open(paths['meta'], 'w') as meta_file:
+        json.dump(meta, meta_file)
+    return _status(upload_id, meta)
+
+
+def upload_status(user, upload_id: str) -> Dict[str, Any]:
+    """Which chunks have arrived, so an interrupted client can resume"""
+    return _status(upload_id, _load(user, upload_id))
+
+
+def write_chunk(user, upload_id: str, offset: int, stream) -> Dict[str, Any]:
+    """Write one chunk read from stream at offset
+
+    offset must be a multiple of the upload's chunk size and the body must
+    be exactly one chunk long (shorter only for the last chunk). A chunk is
+    only marked as received once it is completely on disk.
+    """
+    meta = _load(user, upload_id)
+    if offset < 0 or offset >= meta['size'] or offset % meta['chunk_size']:
+        raise ChunkedUploadError('Invalid chunk offset')
+    expected = min(meta['chunk_size'], meta['size'] - offset)
+
+    paths = _paths(upload_id)
+    written = 0
+    descriptor = os.open(paths['data'], os.O_WRONLY)
+    try:
+        while written <= expected:
+            block = stream.read(min(READ_BLOCK_SIZE, expected - written + 1))
+            if not block:
+                break
+            if written + len(block) > expected:
+                raise ChunkedUploadError('Chunk is larger than expected')
+            os.pwrite(descriptor, block, offset + written)
+            written += len(block)
+    finally:
+        os.close(descriptor)
+    if written != expected:
+        raise ChunkedUploadError(f'Incomplete chunk: expected {expected} bytes, got {written}')
+
+    # The marker is the commit point; its name is the chunk index
+    open(os.path.join(paths['parts'], str(offset // meta['chunk_size'])), 'w').close()
+    return _status(upload_id, meta)
+
+
+def assemble_upload(user, upload_id: str) -> File:
+    """Check every chunk arrived and the content matches the declared hash
+
+    Returns the assembled file opened for reading, with a ``sha256``
+    attribute. The caller closes it and calls discard_upload when done.
+    """
+    meta = _load(user, upload_id)
+    missing = _chunk_count(meta) - len(_received(upload_id))
+    if missing:
+        raise ChunkedUploadError(f'{missing} chunk(s) have not been received', status=409)
+
+    uploaded_file = File(open(_paths(upload_id)['data'], 'rb'), name=meta['filename'])
+    digest = hashlib.sha256()
+    for block in uploaded_file.chunks():
+        digest.update(block)
+    uploaded_file.seek(0)
+
+    if digest.hexdigest() != meta['sha256']:
+        uploaded_file.close()
+        # Nothing to resume from; the client has to start over
+        discard_upload(upload_id)
+        raise ChunkedUploadError('Checksum mismatch, upload discarded', status=422)
+
+    uploaded_file.sha256 = meta['sha256']
+    return uploaded_file
+
+
+def discard_upload(upload_id: str) -> None:
+    if _UPLOAD_ID_PATTERN.match(upload_id):
+        shutil.rmtree(_paths(upload_id)['base'], ignore_errors=True)
+
+
+def sweep_stale_uploads(max_age: Optional[int] = None, throttle: bool = False) -> int:
+    """Delete partial uploads untouched for longer than max_age seconds
+
+    With throttle, runs at most once a minute per process so it can be
+    called on every new upload.
+    """
+    global _last_sweep
+    now = time.time()
+    if throttle and now - _last_sweep < 60:
+        return 0
+    _last_sweep = now
+
+    max_age = upload_expiry() if max_age is None else max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(upload_dir()))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not (entry.is_dir() and _UPLOAD_ID_PATTERN.match(entry.name)):
+            continue
+        try:
+            # Chunk markers touch the parts directory on every write
+            last_activity = max(entry.stat().st_mtime, os.stat(os.path.join(entry.path, 'parts')).st_mtime)
+        except OSError:
+            last_activity = 0
+        if now - last_activity > max_age:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
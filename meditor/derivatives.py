@@ -0,0 +1,263 @@
+"""
+Responsive image derivatives for django-meditor
+Uploaded images get resized WebP copies, produced by a bounded process pool
+so uploads return immediately. Rendered <img> tags gain srcset/sizes once
+the copies exist.
+"""
+import io
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.html import escape
+
+from .storage import upload_path
+
+
+_UPLOAD_NAME_PATTERN = re.compile(r'^([0-9a-f]{2})/([0-9a-f]{64})\.[A-Za-z0-9]+$')
+_IMG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+_SRC_PATTERN = re.compile(r'\ssrc="([^"]*)"')
+
+# How long a missing manifest is remembered before storage is asked again
+MISSING_TTL = 30
+
+_executor = None
+_lock = threading.Lock()
+_pending = set()
+# Least recently used first, bounded by MEDITOR_IMAGE_MANIFEST_CACHE_SIZE
+_widths = OrderedDict()
+_missing = OrderedDict()
+
+
+def derivatives_enabled() -> bool:
+    return getattr(settings, 'MEDITOR_IMAGE_DERIVATIVES', True)
+
+
+def derivative_widths_setting() -> List[int]:
+    return sorted(getattr(settings, 'MEDITOR_IMAGE_WIDTHS', [480, 960, 1600]))
+
+
+def image_sizes() -> str:
+    return getattr(settings, 'MEDITOR_IMAGE_SIZES', '(max-width: 960px) 100vw, 960px')
+
+
+def manifest_cache_size() -> int:
+    return getattr(settings, 'MEDITOR_IMAGE_MANIFEST_CACHE_SIZE', 4096)
+
+
+def _remember(store: OrderedDict, key: str, value) -> None:
+    """Store a value, evicting the least recently used beyond the cache size; hold _lock"""
+    store[key] = value
+    store.move_to_end(key)
+    while len(store) > manifest_cache_size():
+        store.popitem(last=False)
+
+
+def derivative_path(path: str, width: int) -> str:
+    root, _ = os.path.splitext(path)
+    return f"{root}-{width}w.webp"
+
+
+def manifest_path(path: str) -> str:
+    root, _ = os.path.splitext(path)
+    return f"{root}.json"
+
+
+def generate_derivatives(path: str) -> List[int]:
+    """Write WebP copies of a stored image at each configured width
+
+    Orientation from EXIF is applied and all metadata is dropped. The
+    manifest listing the widths is written last, so a manifest means every
+    copy exists. Returns the widths written.
+    """
+    from PIL import Image, ImageOps
+
+    with default_storage.open(path, 'rb') as source:
+        image = Image.open(source)
+        image.load()
+
+    widths = []
+    # Flattening an animation to one frame would change the image
+    if not getattr(image, 'is_animated', False):
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.mode else 'RGB')
+        quality = getattr(settings, 'MEDITOR_IMAGE_QUALITY', 80)
+
+        widths = sorted({min(width, image.width) for width in derivative_widths_setting()})
+        for width in widths:
+            target = derivative_path(path, width)
+            if default_storage.exists(target):
+                continue
+            if width == image.width:
+                resized = image
+            else:
+                resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, 'WEBP', quality=quality)
+            default_storage.save(target, ContentFile(buffer.getvalue()))
+
+    manifest = json.dumps({'widths': widths, 'width': image.width, 'height': image.height})
+    if default_storage.exists(manifest_path(path)):
+        default_storage.delete(manifest_path(path))
+    default_storage.save(manifest_path(path), ContentFile(manifest.encode('utf-8')))
+    return widths
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared worker pool, sized by MEDITOR_DERIVATIVE_WORKERS"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                # Spawn rather than fork: forking a threaded web server is unsafe
+                _executor = ProcessPoolExecutor(
+                    max_workers=getattr(settings, 'MEDITOR_DERIVATIVE_WORKERS', 2),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                )
+    return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def schedule_derivatives(path: str) -> bool:
+    """Queue derivative generation for a stored upload
+
+    Returns False when derivatives are disabled, already exist, are already
+    queued, or the queue (MEDITOR_DERIVATIVE_QUEUE_SIZE) is full.
+    """
+    if not derivatives_enabled():
+        return False
+    digest = _digest_for_path(path)
+    if digest and _manifest_widths(digest, path) is not None:
+        return False
+
+    with _lock:
+        if path in _pending or len(_pending) >= getattr(settings, 'MEDITOR_DERIVATIVE_QUEUE_SIZE', 256):
+            return False
+        _pending.add(path)
+
+    def done(future):
+        with _lock:
+            _pending.discard(path)
+            _missing.pop(digest, None)
+
+    try:
+        future = get_executor().submit(generate_derivatives, path)
+    except Exception:
+        done(None)
+        raise
+    future.add_done_callback(done)
+    return True
+
+
+def _digest_for_path(path: str) -> Optional[str]:
+    prefix = upload_path()
+    if not path.startswith(prefix):
+        return None
+    match = _UPLOAD_NAME_PATTERN.match(path[len(prefix):].lstrip('/'))
+    return match.group(2) if match else None
+
+
+def _manifest_widths(digest: str, path: str) -> Optional[Tuple[int, ...]]:
+    """Widths available for an upload, or None until its manifest exists"""
+    with _lock:
+        if digest in _widths:
+            _widths.move_to_end(digest)
+            return _widths[digest]
+        checked = _missing.get(digest)
+    if checked is not None and time.monotonic() - checked < MISSING_TTL:
+        return None
+
+    try:
+        with default_storage.open(manifest_path(path), 'rb') as manifest:
+            widths = tuple(json.loads(manifest.read())['widths'])
+    except Exception:
+        with _lock:
+            _remember(_missing, digest, time.monotonic())
+        return None
+
+    # Uploads are content-addressed, so a manifest never goes stale
+    with _lock:
+        _remember(_widths, digest, widths)
+        _missing.pop(digest, None)
+    return widths
+
+
+def _path_for_url(url: str) -> Optional[str]:
+    prefix = default_storage.url(upload_path())
+    if not url.startswith(prefix):
+        return None
+    name = url[len(prefix):].lstrip('/')
+    if not _UPLOAD_NAME_PATTERN.match(name):
+        return None
+    return os.path.join(upload_path(), name)
+
+
+def image_srcset(url: str) -> str:
+    """srcset for an uploaded image URL, or '' if it has no derivatives yet"""
+    if not derivatives_enabled():
+        return ''
+    path = _path_for_url(url)
+    if path is None:
+        return ''
+    widths = _manifest_widths(_digest_for_path(path), path)
+    if not widths:
+        return ''
+    return ', '.join(f"{default_storage.url(derivative_path(path, width))} {width}w" for width in widths)
+
+
+def responsive_images(html: str) -> str:
+    """Add srcset/sizes to <img> tags that point at uploads with derivatives
+
+    Runs on rendered (and cached) HTML, so derivatives finished after a
+    document was rendered still show up on the next request.
+    """
+    if '<img' not in html or not derivatives_enabled():
+        return html
+
+    def add_srcset(match):
+        tag = match.group(0)
+        if 'srcset=' in tag:
+            return tag
+        src = _SRC_PATTERN.search(tag)
+        srcset = image_srcset(src.group(1)) if src else ''
+        if not srcset:
+            return tag
+        attributes = f' srcset="{escape(srcset)}"'
+        if 'sizes=' not in tag:
+            # Gallery images carry their own sizes
+            attributes += f' sizes="{escape(image_sizes())}"'
+        return tag[:src.end()] + attributes + tag[src.end():]
+
+    return _IMG_PATTERN.sub(add_srcset, html)
+
+
+def stats() -> Dict[str, int]:
+    with _lock:
+        return {
+            'pending': len(_pending),
+            'known': len(_widths),
+            'missing': len(_missing),
+        }
@@ -0,0 +1,60 @@
+"""
+Server-side preview drafts for django-meditor
+Drafts are POSTed once and stored under a token, so previews of large
+unsaved content never travel in a URL and identical drafts share a token
+"""
+import json
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models
+from django.utils.crypto import salted_hmac
+
+from .cache import RenderCache
+from .templatetags.markdown_filters import render_fingerprint
+
+
+DRAFT_KEY_PREFIX = 'meditor:draft:'
+
+# Rendered preview pages, keyed on draft token or saved object version
+page_cache = RenderCache('page', render_fingerprint, 'MEDITOR_PREVIEW_PAGE_CACHE_SIZE', 64)
+
+
+def draft_store():
+    return caches[getattr(settings, 'MEDITOR_CACHE_ALIAS', None) or 'default']
+
+
+def draft_timeout() -> int:
+    return getattr(settings, 'MEDITOR_DRAFT_TIMEOUT', 60 * 60)
+
+
+def store_draft(user, app_label: str, model_name: str, pk: int, data: Dict[str, Any]) -> str:
+    """Store draft field values and return their token
+
+    The token is an HMAC of the draft, its owner and its target, so the
+    same draft always gets the same token and tokens cannot be guessed.
+    """
+    draft = {'user': user.pk, 'app_label': app_label, 'model_name': model_name, 'pk': pk, 'data': data}
+    token = salted_hmac('meditor.draft', json.dumps(draft, sort_keys=True, default=str)).hexdigest()
+    draft_store().set(DRAFT_KEY_PREFIX + token, draft, draft_timeout())
+    return token
+
+
+def load_draft(user, token: str, app_label: str, model_name: str, pk: int) -> Optional[Dict[str, Any]]:
+    """Return the field values of a stored draft, or None if it is unknown,
+    expired, or belongs to another user or object"""
+    draft = draft_store().get(DRAFT_KEY_PREFIX + token)
+    if not draft:
+        return None
+    if (draft['user'], draft['app_label'], draft['model_name'], draft['pk']) != (user.pk, app_label, model_name, pk):
+        return None
+    return draft['data']
+
+
+def last_modified_field(model) -> Optional[str]:
+    """Name of the model's auto_now timestamp, used to version saved objects"""
+    for field in model._meta.concrete_fields:
+        if isinstance(field, models.DateTimeField) and field.auto_now:
+            return field.name
+    return None
@@ -0,0 +1,152 @@
+"""
+Markdown engine pool for django-meditor
+Hands each conversion a clean markdown.Markdown instance without rebuilding one per call
+"""
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import markdown
+from django.conf import settings
+
+from .metrics import instrument_engine, instrumentation_enabled, timed
+
+
+MARKDOWN_EXTENSIONS = [
+    'markdown.extensions.toc',
+    'markdown.extensions.tables',
+    'markdown.extensions.fenced_code',
+    'markdown.extensions.codehilite',
+    'meditor.highlight',
+    'markdown.extensions.nl2br',
+    'markdown.extensions.sane_lists',
+    'meditor.postprocessors',
+]
+
+
+class MarkdownEnginePool:
+    """Bounded checkout/return pool of Markdown instances
+
+    Engines are reset when returned, so toc, references and any other
+    per-document state never leak from one conversion into the next.
+    Once max_size engines exist, callers wait for one to be returned.
+    Nothing is built until the first checkout.
+    """
+
+    def __init__(self, extensions: List[str], extension_configs: Optional[Dict] = None,
+                 max_size: Optional[int] = None):
+        self.extensions = extensions
+        self.extension_configs = extension_configs or {}
+        self._max_size = max_size
+        self._idle = []
+        self._created = 0
+        # Bumped by clear(); engines built before it are not taken back
+        self._generation = 0
+        self._condition = threading.Condition()
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, 'MEDITOR_ENGINE_POOL_SIZE', 16)
+
+    def build(self) -> markdown.Markdown:
+        """Construct a new engine with the pool's configuration"""
+        md = markdown.Markdown(
+            extensions=self.extensions,
+            extension_configs=self.extension_configs,
+        )
+        if instrumentation_enabled():
+            instrument_engine(md)
+        return md
+
+    def _checkout(self) -> markdown.Markdown:
+        with self._condition:
+            while True:
+                if self._idle:
+                    # LIFO keeps the hottest engines in use
+                    return self._idle.pop()
+                if self._created < self.max_size:
+                    self._created += 1
+                    generation = self._generation
+                    break
+                self._condition.wait()
+        try:
+            md = self.build()
+            md.meditor_pool_generation = generation
+            return md
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+
+    def _checkin(self, md: markdown.Markdown) -> None:
+        try:
+            md.reset()
+        except Exception:
+            # Never return an engine in an unknown state
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            return
+        with self._condition:
+            if md.meditor_pool_generation != self._generation:
+                # Built from settings that clear() has since discarded
+                self._created -= 1
+            else:
+                self._idle.append(md)
+            self._condition.notify()
+
+    @contextmanager
+    def engine(self) -> Iterator[markdown.Markdown]:
+        """Check out a clean engine for the duration of the block"""
+        md = self._checkout()
+        try:
+            yield md
+        finally:
+            self._checkin(md)
+
+    def convert(self, text: str) -> str:
+        """Convert text with a pooled engine"""
+        with self.engine() as md, timed('markdown', len(text)):
+            return md.convert(text)
+
+    def convert_document(self, text: str) -> Dict[str, Any]:
+        """Convert text and collect what the conversion learnt about the document
+
+        Returns {'html', 'toc', 'toc_tokens', 'analysis'}, read off the
+        engine before it is reset. analysis is None when the engine was
+        built without meditor.postprocessors.
+        """
+        with self.engine() as md, timed('markdown', len(text)):
+            html = md.convert(text)
+            return {
+                'html': html,
+                'toc': getattr(md, 'toc', ''),
+                'toc_tokens': getattr(md, 'toc_tokens', []),
+                'analysis': getattr(md, 'meditor_analysis', None),
+            }
+
+    def clear(self) -> None:
+        """Drop idle engines so the next checkout builds fresh ones
+
+        Engines checked out at the time are dropped when they are returned.
+        """
+        with self._condition:
+            self._generation += 1
+            self._created -= len(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                'created': self._created,
+                'idle': len(self._idle),
+                'max_size': self.max_size,
+            }
+
+
+# Global pool instance
+engine_pool = MarkdownEnginePool(MARKDOWN_EXTENSIONS)
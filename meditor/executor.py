@@ -0,0 +1,55 @@
+"""
+Bounded executor for CPU-bound work in django-meditor's async views
+Keeps html2text/markdown conversions off the event loop without borrowing
+the sync_to_async thread
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from django.conf import settings
+
+
+_executor = None
+_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    return min(8, (os.cpu_count() or 1) + 2)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared executor, sized by MEDITOR_ASYNC_WORKERS"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'MEDITOR_ASYNC_WORKERS', None) or default_workers(),
+                    thread_name_prefix='meditor',
+                )
+    return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Stop the shared executor; the next call to get_executor builds a new one"""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+async def run_in_executor(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable on the shared executor and await its result
+
+    The callable runs in a copy of the caller's context, so request-scoped
+    state such as the Server-Timing collector is visible in the worker.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(context.run, func, *args, **kwargs))
@@ -2,30 +2,139 @@
 Configurable markdown extensions for django-meditor
 Allows custom HTML generation for specific markdown patterns
 """
+import logging
+import os
 import re
-from django.template.loader import render_to_string
+import threading
+from django.template import loader
 from django.conf import settings
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.html import format_html, linebreaks
+from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
 
+from .metrics import timed
+
+
+logger = logging.getLogger('meditor')
+
+_PACKAGE_TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+
+# Block opener: {{name}} or {{name:argument}}. The argument may not contain
+# braces, which bounds how far a single opener can look ahead.
+OPENER_PATTERN = re.compile(r'\{\{([A-Za-z_][\w-]*)(?::[^{}]*)?\}\}')
+
+# Matches patterns written in the {{name...}}...{{/name}} block style
+_TAG_PATTERN = re.compile(r'^\\\{\\\{([A-Za-z_][\w-]*)')
+
+
+def derive_tag(pattern: str) -> Optional[str]:
+    """Return the block name of a {{name}}...{{/name}} style regex, if it is one"""
+    match = _TAG_PATTERN.match(pattern)
+    if not match:
+        return None
+    tag = match.group(1)
+    closer = '\\{\\{/' + tag + '\\}\\}'
+    return tag if pattern.endswith(closer) else None
+
+
+class CompiledTemplate:
+    """A template resolved once and held compiled
+    
+    In DEBUG the source file's mtime is checked on access so edits are
+    picked up without restarting the process.
+    """
+    
+    def __init__(self, template_name: str):
+        self.template_name = template_name
+        self._template = None
+        self._mtime = None
+        self._static = None
+        self._packaged = False
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _origin_mtime(template) -> Optional[float]:
+        try:
+            return os.path.getmtime(template.origin.name)
+        except (AttributeError, OSError, TypeError):
+            return None
+    
+    def get(self):
+        """Return the compiled template, reloading it in DEBUG if it changed"""
+        template = self._template
+        if template is not None and not (settings.DEBUG and self._origin_mtime(template) != self._mtime):
+            return template
+        with self._lock:
+            template = loader.get_template(self.template_name)
+            self._template = template
+            self._mtime = self._origin_mtime(template)
+            self._static = None
+            origin = getattr(template.origin, 'name', None) or ''
+            self._packaged = os.path.abspath(origin).startswith(_PACKAGE_TEMPLATES)
+        return template
+    
+    def render(self, context: Optional[Dict[str, Any]] = None) -> str:
+        return self.get().render(context)
+    
+    def render_static(self) -> str:
+        """Render a context-free template once and reuse the output"""
+        self.get()
+        static = self._static
+        if static is None:
+            static = self._static = self.render({})
+        return static
+    
+    @property
+    def is_packaged(self) -> bool:
+        """True when the template resolves to the copy shipped with meditor"""
+        self.get()
+        return self._packaged
+
 
 class MarkdownExtension:
     """Base class for markdown extensions"""
     
-    def __init__(self, pattern: str, template_name: str, name: str = None):
+    def __init__(self, pattern: str, template_name: str, name: str = None, tag: str = None,
+                 renderer: Optional[Callable[[Dict[str, Any]], str]] = None):
         self.pattern = re.compile(pattern, re.DOTALL)
         self.template_name = template_name
         self.name = name or template_name
+        # Block name used by the single-pass scanner; None means regex-only
+        self.tag = tag or derive_tag(pattern)
+        # Plain Python callable that renders extract_data() output without the template engine
+        self.renderer = renderer
+        self.template = CompiledTemplate(template_name)
     
     def extract_data(self, match) -> Dict[str, Any]:
         """Extract data from the markdown match. Override in subclasses."""
         return {'content': match.group(1)}
     
+    def use_renderer(self) -> bool:
+        """Whether render() may bypass the template engine
+        
+        Built-in renderers mirror the packaged templates, so they step aside
+        as soon as a project overrides the template.
+        """
+        if self.renderer is None:
+            return False
+        if not getattr(settings, 'MEDITOR_EXTENSION_RENDERERS', True):
+            return False
+        return self.template.is_packaged
+    
+    def render_template(self, data: Dict[str, Any]) -> str:
+        return self.template.render(data)
+    
     def render(self, match) -> str:
         """Render the extension to HTML"""
         try:
-            data = self.extract_data(match)
-            return render_to_string(self.template_name, data)
+            with timed(f'extension.{self.name}', match.end() - match.start()):
+                data = self.extract_data(match)
+                if self.use_renderer():
+                    return self.renderer(data)
+                return self.render_template(data)
         except Exception as e:
             # Fallback to simple div if template fails
             return f'<div class="markdown-extension {self.name}-extension" data-error="{str(e)}">{match.group(0)}</div>'
@@ -38,7 +147,8 @@ class GalleryExtension(MarkdownExtension):
         super().__init__(
             pattern=r'\{\{gallery\}\}(.*?)\{\{/gallery\}\}',
             template_name='meditor/extensions/gallery.html',
-            name='gallery'
+            name='gallery',
+            tag='gallery'
         )
     
     def extract_data(self, match) -> Dict[str, Any]:
@@ -48,13 +158,16 @@ class GalleryExtension(MarkdownExtension):
         # Extract image URLs from markdown image syntax ![alt](url)
         image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
         images = []
+        gallery_sizes = getattr(settings, 'MEDITOR_GALLERY_IMAGE_SIZES', '(max-width: 600px) 100vw, 33vw')
         
         for img_match in re.finditer(image_pattern, content):
             alt_text = img_match.group(1)
             image_url = img_match.group(2)
             images.append({
                 'url': image_url,
-                'alt': alt_text or 'Gallery image'
+                'alt': alt_text or 'Gallery image',
+                # srcset is added by responsive_images when the page is shown
+                'sizes': gallery_sizes
             })
         
         return {
@@ -71,7 +184,8 @@ class CodeBlockExtension(MarkdownExtension):
         super().__init__(
             pattern=r'\{\{code:([^}]+)\}\}(.*?)\{\{/code\}\}',
             template_name='meditor/extensions/code_block.html',
-            name='code_block'
+            name='code_block',
+            tag='code'
         )
     
     def extract_data(self, match) -> Dict[str, Any]:
@@ -93,8 +207,11 @@ class QuoteExtension(MarkdownExtension):
         super().__init__(
             pattern=r'\{\{quote:([^}]+)\}\}(.*?)\{\{/quote\}\}',
             template_name='meditor/extensions/quote.html',
-            name='quote'
+            name='quote',
+            tag='quote',
+            renderer=self.render_html
         )
+        self.style = CompiledTemplate('meditor/extensions/quote_style.html')
     
     def extract_data(self, match) -> Dict[str, Any]:
         """Extract quote content and attribution"""
@@ -105,6 +222,28 @@ class QuoteExtension(MarkdownExtension):
             'content': quote_content,
             'attribution': attribution
         }
+    
+    def render_html(self, data: Dict[str, Any]) -> str:
+        """Python equivalent of meditor/extensions/quote.html"""
+        attribution = ''
+        if data['attribution']:
+            attribution = format_html(
+                '\n        <footer class="quote-attribution">\n'
+                '            — {}\n'
+                '        </footer>\n    ',
+                data['attribution']
+            )
+        return format_html(
+            '\n\n<blockquote class="markdown-quote">\n'
+            '    <div class="quote-content">\n'
+            '        {}\n'
+            '    </div>\n'
+            '    {}\n'
+            '</blockquote>\n\n{}\n',
+            mark_safe(linebreaks(data['content'], autoescape=True)),
+            attribution,
+            mark_safe(self.style.render_static())
+        )
 
 
 class AlertExtension(MarkdownExtension):
@@ -114,8 +253,11 @@ class AlertExtension(MarkdownExtension):
         super().__init__(
             pattern=r'\{\{alert:([^}]+)\}\}(.*?)\{\{/alert\}\}',
             template_name='meditor/extensions/alert.html',
-            name='alert'
+            name='alert',
+            tag='alert',
+            renderer=self.render_html
         )
+        self.style = CompiledTemplate('meditor/extensions/alert_style.html')
     
     def extract_data(self, match) -> Dict[str, Any]:
         """Extract alert type and content"""
@@ -128,6 +270,21 @@ class AlertExtension(MarkdownExtension):
             'icon': self._get_icon(alert_type)
         }
     
+    def render_html(self, data: Dict[str, Any]) -> str:
+        """Python equivalent of meditor/extensions/alert.html"""
+        return format_html(
+            '\n\n<div class="markdown-alert markdown-alert-{}" role="alert">\n'
+            '    <div class="alert-icon">{}</div>\n'
+            '    <div class="alert-content">\n'
+            '        {}\n'
+            '    </div>\n'
+            '</div>\n\n{}\n',
+            data['type'],
+            data['icon'],
+            mark_safe(linebreaks(data['content'], autoescape=True)),
+            mark_safe(self.style.render_static())
+        )
+    
     def _get_icon(self, alert_type: str) -> str:
         """Get appropriate icon for alert type"""
         icons = {
@@ -144,7 +301,20 @@ class MarkdownProcessor:
     """Main processor for custom markdown extensions"""
     
     def __init__(self):
+        # Messages for custom extensions that could not be loaded
+        self.errors = []
         self.extensions = self._load_extensions()
+        self._index_extensions()
+    
+    def _index_extensions(self):
+        """Split extensions into scanner-handled blocks and regex-only ones"""
+        self.tagged_extensions = {}
+        self.regex_extensions = []
+        for extension in self.extensions:
+            if extension.tag:
+                self.tagged_extensions.setdefault(extension.tag, []).append(extension)
+            else:
+                self.regex_extensions.append(extension)
     
     def _load_extensions(self) -> List[MarkdownExtension]:
         """Load extensions from settings or use defaults"""
@@ -167,12 +337,11 @@ class MarkdownProcessor:
                     extensions.append(ext)
             elif isinstance(ext_config, str):
                 # Import custom extension class
-                from django.utils.module_loading import import_string
                 try:
                     ext_class = import_string(ext_config)
                     extensions.append(ext_class())
                 except (ImportError, AttributeError) as e:
-                    print(f"Failed to load extension {ext_config}: {e}")
+                    self._load_failed(f"Failed to load extension {ext_config}: {e}")
         
         return extensions
     
@@ -183,26 +352,99 @@ class MarkdownProcessor:
             template = config.get('template')
             name = config.get('name', template)
             
+            renderer = config.get('renderer')
+            
             if not pattern or not template:
                 return None
             
-            return MarkdownExtension(pattern, template, name)
+            if isinstance(renderer, str):
+                renderer = import_string(renderer)
+            
+            return MarkdownExtension(pattern, template, name, renderer=renderer)
         except Exception as e:
-            print(f"Failed to create extension from config {config}: {e}")
+            self._load_failed(f"Failed to create extension from config {config}: {e}")
             return None
     
+    def _load_failed(self, message: str) -> None:
+        self.errors.append(message)
+        logger.warning(message)
+    
     def process(self, markdown_content: str) -> str:
         """Process markdown content and replace custom extensions with HTML"""
         processed_content = markdown_content
         
-        for extension in self.extensions:
-            processed_content = extension.pattern.sub(extension.render, processed_content)
+        # Fast path: no block openers means nothing for the scanner to do
+        if self.tagged_extensions and '{{' in processed_content:
+            with timed('extensions.scan', len(processed_content)):
+                processed_content = self._scan(processed_content)
+        
+        # Regex-only custom extensions still need their own pass
+        for extension in self.regex_extensions:
+            with timed(f'extensions.regex.{extension.name}', len(processed_content)):
+                processed_content = extension.pattern.sub(extension.render, processed_content)
         
         return processed_content
+    
+    def _scan(self, content: str) -> str:
+        """Replace every {{name...}}...{{/name}} block in a single left-to-right pass
+        
+        Each block runs from its opener to the first matching closer, the same
+        span the non-greedy extension patterns select. Closer lookups are
+        memoized per name, so a document full of unclosed openers is still
+        scanned in linear time.
+        """
+        output = []
+        emitted = 0
+        closers = {}
+        position = content.find('{{')
+        
+        while position != -1:
+            opener = OPENER_PATTERN.match(content, position)
+            if opener and opener.group(1) in self.tagged_extensions:
+                tag = opener.group(1)
+                end = self._find_closer(content, tag, opener.end(), closers)
+                rendered = self._render_block(content, tag, position, end) if end != -1 else None
+                if rendered is not None:
+                    output.append(content[emitted:position])
+                    output.append(rendered)
+                    emitted = end
+                    position = content.find('{{', end)
+                    continue
+            position = content.find('{{', position + 1)
+        
+        if not emitted:
+            return content
+        output.append(content[emitted:])
+        return ''.join(output)
+    
+    def _render_block(self, content: str, tag: str, start: int, end: int) -> Optional[str]:
+        """Render content[start:end] with the first extension whose pattern matches it"""
+        for extension in self.tagged_extensions[tag]:
+            match = extension.pattern.fullmatch(content, start, end)
+            if match:
+                return extension.render(match)
+        return None
+    
+    @staticmethod
+    def _find_closer(content: str, tag: str, start: int, closers: Dict[str, tuple]) -> int:
+        """Return the end offset of the first {{/tag}} at or after start, or -1"""
+        closer = '{{/' + tag + '}}'
+        if tag in closers:
+            searched_from, found = closers[tag]
+            if searched_from <= start and (found == -1 or found >= start):
+                return found if found == -1 else found + len(closer)
+        found = content.find(closer, start)
+        closers[tag] = (start, found)
+        return found if found == -1 else found + len(closer)
+
+
+# Global processor instance, built from settings on first use
+markdown_processor = SimpleLazyObject(MarkdownProcessor)
 
 
-# Global processor instance
-markdown_processor = MarkdownProcessor()
+def reset_markdown_processor() -> None:
+    """Discard the global processor; the next use rebuilds it from settings"""
+    markdown_processor._wrapped = empty
 
 
 def process_markdown_extensions(content: str) -> str:
@@ -0,0 +1,89 @@
+"""
+Model fields for django-meditor
+MarkdownField stores the rendered HTML next to the markdown source
+"""
+from django.db import models
+from django.utils.safestring import mark_safe
+
+from .derivatives import responsive_images
+from .widgets import RichMarkdownWidget
+
+
+def rendered_field_name(name: str) -> str:
+    return f"{name}_rendered"
+
+
+def version_field_name(name: str) -> str:
+    return f"{name}_renderer_version"
+
+
+class RenderedHtmlDescriptor:
+    """Template accessor that serves the stored HTML without re-rendering"""
+
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        html = getattr(instance, rendered_field_name(self.field.name))
+        source = getattr(instance, self.field.attname)
+        if not html and source:
+            # Rows saved before the field existed have nothing stored yet
+            html = self.field.render(source)
+        return mark_safe(responsive_images(html or ''))
+
+
+class MarkdownField(models.TextField):
+    """TextField whose rendered HTML is kept in companion columns
+
+    For a field named ``body`` the model gets:
+    - ``body_rendered``: the HTML produced by render_markdown, as meditor_rerender stores it
+    - ``body_renderer_version``: the pipeline version that produced it
+    - ``body_html``: safe accessor for templates, e.g. ``{{ post.body_html }}``,
+      which adds responsive image srcsets on the way out
+
+    The HTML is refreshed on every save. When saving with ``update_fields``
+    include the two companion fields alongside the source field.
+    """
+
+    description = "Markdown text with pre-rendered HTML"
+
+    def __init__(self, *args, add_companion_fields=True, **kwargs):
+        # Migrations serialize the companion fields themselves, so the
+        # deconstructed field must not add them a second time
+        self.add_companion_fields = add_companion_fields
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['add_companion_fields'] = False
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        if self.add_companion_fields and not cls._meta.abstract:
+            # Built while the model class is created, so the companion fields
+            # get their own creation counters and sort after declared fields
+            cls.add_to_class(rendered_field_name(name), models.TextField(editable=False, blank=True, default=''))
+            cls.add_to_class(
+                version_field_name(name), models.CharField(max_length=32, editable=False, blank=True, default='')
+            )
+        super().contribute_to_class(cls, name, **kwargs)
+        setattr(cls, f"{name}_html", RenderedHtmlDescriptor(self))
+
+    def render(self, value: str) -> str:
+        # Same output as render_markdown, through the render cache. srcset is
+        # left to display time so derivative URLs never reach the database.
+        from .templatetags.markdown_filters import cached_document
+        return cached_document(value)['html'] if value else ''
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        from .templatetags.markdown_filters import renderer_version
+        setattr(model_instance, rendered_field_name(self.name), self.render(value))
+        setattr(model_instance, version_field_name(self.name), renderer_version() if value else '')
+        return value
+
+    def formfield(self, **kwargs):
+        kwargs.setdefault('widget', RichMarkdownWidget)
+        return super().formfield(**kwargs)
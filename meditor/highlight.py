@@ -0,0 +1,123 @@
+"""
+Highlighted code cache for django-meditor
+Replaces Python-Markdown's fenced_code preprocessor and codehilite
+treeprocessor with versions that look each code block up in a RenderCache
+first, keyed by the block's source (language and code) and the highlighter
+options. Snippets repeated across pages are run through Pygments once per
+process, or once per shared cache when MEDITOR_CACHE_ALIAS is set.
+"""
+import markdown
+from markdown.extensions import Extension
+from markdown.extensions.codehilite import CodeHilite, HiliteTreeprocessor
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+
+from .cache import RenderCache
+from .metrics import timed
+
+try:
+    import pygments
+except ImportError:
+    pygments = None
+
+
+def highlight_fingerprint():
+    return (markdown.__version__, getattr(pygments, '__version__', None))
+
+
+highlight_cache = RenderCache('highlight', highlight_fingerprint, 'MEDITOR_HIGHLIGHT_CACHE_SIZE', 1024)
+
+
+def options_key(*options) -> str:
+    """Prefix for cache sources, so blocks highlighted with other options never collide"""
+    return repr(tuple(sorted(option.items()) if isinstance(option, dict) else option for option in options)) + '\0'
+
+
+class CachedFencedBlockPreprocessor(FencedBlockPreprocessor):
+    """fenced_code, highlighting each distinct block once
+
+    Blocks are still converted by the parent class, one at a time, so
+    attributes, hl_lines and the non-Pygments output work unchanged.
+    """
+
+    def run(self, lines):
+        if not self.checked_for_deps:
+            # Let the parent find codehilite and attr_list before building the key
+            super().run([])
+        prefix = options_key(self.config, self.codehilite_conf, self.use_attr_list)
+        stash = self.md.htmlStash
+        text = '\n'.join(lines)
+        output = []
+        emitted = 0
+        index = 0
+        while True:
+            match = self.FENCED_BLOCK_RE.search(text, index)
+            if not match:
+                break
+            block = match.group(0)
+            key = highlight_cache.make_key(prefix + block)
+            html = highlight_cache.get(key)
+            if html is not None:
+                placeholder = stash.store(html)
+            else:
+                stored = stash.html_counter
+                with timed('highlight', len(block)):
+                    converted = super().run(block.split('\n'))
+                if stash.html_counter == stored:
+                    # Not a valid fenced block after all; resume inside it like the parent does
+                    index = match.end('attrs') if match.group('attrs') else match.end()
+                    continue
+                placeholder = converted[1]
+                highlight_cache.set(key, stash.rawHtmlBlocks[-1])
+            output.append(f'{text[emitted:match.start()]}\n{placeholder}\n')
+            emitted = index = match.end()
+        if not emitted:
+            return lines
+        output.append(text[emitted:])
+        return ''.join(output).split('\n')
+
+
+class CachedHiliteTreeprocessor(HiliteTreeprocessor):
+    """codehilite for indented code blocks, highlighting each distinct block once"""
+
+    def run(self, root):
+        prefix = options_key(self.config, self.md.tab_length)
+        for block in root.iter('pre'):
+            if len(block) != 1 or block[0].tag != 'code' or block[0].text is None:
+                continue
+            text = block[0].text
+            key = highlight_cache.make_key(prefix + text)
+            html = highlight_cache.get(key)
+            if html is None:
+                local_config = self.config.copy()
+                with timed('highlight', len(text)):
+                    html = CodeHilite(
+                        self.code_unescape(text),
+                        tab_length=self.md.tab_length,
+                        style=local_config.pop('pygments_style', 'default'),
+                        **local_config
+                    ).hilite()
+                highlight_cache.set(key, html)
+            placeholder = self.md.htmlStash.store(html)
+            block.clear()
+            block.tag = 'p'
+            block.text = placeholder
+
+
+class HighlightCacheExtension(Extension):
+    """Swap in the cached fenced_code and codehilite processors
+
+    List it after both extensions; whichever of them is missing stays missing.
+    """
+
+    def extendMarkdown(self, md):
+        if 'fenced_code_block' in md.preprocessors:
+            fenced = md.preprocessors['fenced_code_block']
+            md.preprocessors.register(CachedFencedBlockPreprocessor(md, fenced.config), 'fenced_code_block', 25)
+        if 'hilite' in md.treeprocessors:
+            hiliter = CachedHiliteTreeprocessor(md)
+            hiliter.config = md.treeprocessors['hilite'].config
+            md.treeprocessors.register(hiliter, 'hilite', 30)
+
+
+def makeExtension(**kwargs):
+    return HighlightCacheExtension(**kwargs)
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from meditor.benchmarks import SUITES, compare, load_baseline, save_baseline
+
+
+class Command(BaseCommand):
+    help = "Run django-meditor performance benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('suites', nargs='*', help=f"Suites to run (default: all). Available: {', '.join(SUITES)}")
+        parser.add_argument('--iterations', type=int, help="Calls per measurement (default: per measurement)")
+        parser.add_argument('--save-baseline', metavar='FILE', help="Write the results to FILE as the new baseline")
+        parser.add_argument('--baseline', metavar='FILE', help="Fail if any result is worse than the baseline in FILE")
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help="Allowed slowdown or memory growth against the baseline (default: 0.25 = 25%%)")
+
+    def handle(self, *args, **options):
+        names = options['suites'] or list(SUITES)
+        unknown = [name for name in names if name not in SUITES]
+        if unknown:
+            raise CommandError(f"Unknown suite(s): {', '.join(unknown)}")
+
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = load_baseline(options['baseline'])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read baseline {options['baseline']}: {e}")
+
+        results = {}
+        for name in names:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}:"))
+            self.stdout.write(
+                f"  {'':<40} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10} {'ops/s':>10} {'peak KB':>10}"
+            )
+            results[name] = SUITES[name](iterations=options['iterations'])
+            for result in results[name]:
+                self.stdout.write(
+                    f"  {result['label']:<40} {result['p50_us']:>10.1f} {result['p90_us']:>10.1f} "
+                    f"{result['p99_us']:>10.1f} {result['ops_per_s']:>10.1f} {result['peak_kb']:>10.1f}"
+                )
+
+        if options['save_baseline']:
+            save_baseline(options['save_baseline'], results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['save_baseline']}"))
+
+        if baseline is not None:
+            regressions = list(compare(results, baseline, options['tolerance']))
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(
+                    f"  {regression['key']} {regression['metric']}: {regression['baseline']:.1f} -> "
+                    f"{regression['current']:.1f} ({regression['change']:+.0%})"
+                ))
+            if regressions:
+                raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}"))
@@ -0,0 +1,31 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meditor.assets import BUILD_PATH, SOURCE_PATH, STATIC_DIR, build_assets
+
+
+class Command(BaseCommand):
+    help = "Minify the editor scripts into hashed files under static/meditor/js/dist"
+
+    def handle(self, *args, **options):
+        try:
+            import rjsmin  # noqa: F401
+        except ImportError:
+            raise CommandError("rjsmin is required to build the editor scripts: pip install rjsmin")
+
+        try:
+            manifest = build_assets()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        source_dir = os.path.join(STATIC_DIR, SOURCE_PATH)
+        output_dir = os.path.join(STATIC_DIR, BUILD_PATH)
+        source_total = built_total = 0
+        for name, built in sorted(manifest.items()):
+            source_size = os.path.getsize(os.path.join(source_dir, name))
+            built_size = os.path.getsize(os.path.join(output_dir, built))
+            source_total += source_size
+            built_total += built_size
+            self.stdout.write(f"{name:<16} {source_size:>8} -> {built_size:>8} bytes  {built}")
+        self.stdout.write(self.style.SUCCESS(f"Built {len(manifest)} scripts: {source_total} -> {built_total} bytes"))
@@ -0,0 +1,133 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from meditor.fields import MarkdownField, rendered_field_name, version_field_name
+
+
+def _init_worker():
+    # Spawned workers start without Django configured; forked ones already are
+    import django
+    django.setup()
+
+
+def _render_batch(rows):
+    """Render (pk, source) pairs with the markdown_to_html pipeline"""
+    from meditor.templatetags.markdown_filters import render_markdown
+    return [(pk, render_markdown(source) if source else '') for pk, source in rows]
+
+
+class Command(BaseCommand):
+    help = "Re-render the stored HTML of a model's MarkdownField(s)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help="Model as app_label.ModelName")
+        parser.add_argument('fields', nargs='*', help="MarkdownField names (default: all on the model)")
+        parser.add_argument('--chunk-size', type=int, default=500, help="Rows fetched and written per chunk")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Render processes (1 renders in-process)")
+        parser.add_argument('--resume-from', default=None, help="Only process rows with a primary key greater than this")
+        parser.add_argument('--stale-only', action='store_true', help="Skip rows already rendered by the current renderer version")
+        parser.add_argument('--dry-run', action='store_true', help="Render and report, but write nothing")
+
+    def handle(self, *args, **options):
+        model = self._get_model(options['model'])
+        fields = self._get_fields(model, options['fields'])
+        chunk_size = max(1, options['chunk_size'])
+        workers = max(1, options['workers'])
+
+        from meditor.templatetags.markdown_filters import renderer_version
+        version = renderer_version()
+
+        pool = None
+        if workers > 1:
+            # Never hand open database connections to forked children
+            connections.close_all()
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+        try:
+            for field in fields:
+                self._rerender_field(model, field, version, pool, workers, chunk_size, options)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _get_model(self, label):
+        try:
+            return apps.get_model(label)
+        except (LookupError, ValueError) as e:
+            raise CommandError(f"Unknown model {label}: {e}")
+
+    def _get_fields(self, model, names):
+        markdown_fields = [f for f in model._meta.concrete_fields if isinstance(f, MarkdownField)]
+        if not names:
+            if not markdown_fields:
+                raise CommandError(f"{model._meta.label} has no MarkdownField")
+            return markdown_fields
+        fields = []
+        for name in names:
+            field = next((f for f in markdown_fields if f.name == name), None)
+            if field is None:
+                raise CommandError(f"{model._meta.label}.{name} is not a MarkdownField")
+            fields.append(field)
+        return fields
+
+    def _rerender_field(self, model, field, version, pool, workers, chunk_size, options):
+        rendered_name = rendered_field_name(field.name)
+        version_name = version_field_name(field.name)
+
+        queryset = model._default_manager.order_by('pk')
+        if options['resume_from'] is not None:
+            queryset = queryset.filter(pk__gt=options['resume_from'])
+        if options['stale_only']:
+            queryset = queryset.exclude(**{version_name: version})
+
+        total = queryset.count()
+        label = f"{model._meta.label}.{field.name}"
+        self.stdout.write(f"{label}: {total} row(s) to render with {workers} worker(s)")
+
+        processed = changed = 0
+        last_pk = None
+        start = time.perf_counter()
+
+        while True:
+            # Keyset pagination keeps memory bounded and makes --resume-from exact
+            chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(chunk_queryset.values_list('pk', field.attname, rendered_name, version_name)[:chunk_size])
+            if not rows:
+                break
+
+            sources = [(pk, source) for pk, source, _, _ in rows]
+            if pool is None:
+                results = _render_batch(sources)
+            else:
+                size = -(-len(sources) // workers)
+                batches = [sources[i:i + size] for i in range(0, len(sources), size)]
+                results = [item for batch in pool.map(_render_batch, batches) for item in batch]
+
+            stored = {pk: (html, row_version) for pk, _, html, row_version in rows}
+            updates = []
+            for pk, html in results:
+                row_version = version if html else ''
+                if stored[pk] != (html, row_version):
+                    updates.append(model(**{'pk': pk, rendered_name: html, version_name: row_version}))
+
+            if updates and not options['dry_run']:
+                model._default_manager.bulk_update(updates, [rendered_name, version_name])
+
+            processed += len(rows)
+            changed += len(updates)
+            last_pk = rows[-1][0]
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"  {processed}/{total} rendered, {changed} changed, "
+                f"{processed / elapsed if elapsed else 0:.0f} rows/s, last pk {last_pk}"
+            )
+
+        verb = "would change" if options['dry_run'] else "updated"
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: {processed} row(s) rendered, {changed} {verb} in {time.perf_counter() - start:.1f}s"
+        ))
@@ -0,0 +1,216 @@
+"""
+Render pipeline instrumentation for django-meditor
+Stages of the pipeline are timed by name and reported, with call counts
+and input sizes, to the sink named by MEDITOR_METRICS_SINK. With no sink
+and no Server-Timing header nothing is timed at all.
+"""
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import Signal, receiver
+from django.utils.module_loading import import_string
+
+
+# Sent by SignalSink for every timed stage, with stage, seconds and size
+stage_timed = Signal()
+
+_UNLOADED = object()
+_sink = _UNLOADED
+_request_timings: ContextVar[Optional['TimingCollector']] = ContextVar('meditor_request_timings', default=None)
+
+# Server-Timing metric names are HTTP tokens
+_TOKEN_PATTERN = re.compile(r"[^!#$%&'*+\-.^_`|~0-9A-Za-z]")
+
+
+class MetricsSink:
+    """Receives one call per timed stage; the base class discards them"""
+
+    def record(self, stage: str, seconds: float, size: int = 0) -> None:
+        pass
+
+
+class TimingCollector(MetricsSink):
+    """Aggregates count, total/max time and total size per stage in memory"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, stage: str, seconds: float, size: int = 0) -> None:
+        with self._lock:
+            stats = self._stats.get(stage)
+            if stats is None:
+                self._stats[stage] = {'count': 1, 'total_s': seconds, 'max_s': seconds, 'size': size}
+            else:
+                stats['count'] += 1
+                stats['total_s'] += seconds
+                stats['max_s'] = max(stats['max_s'], seconds)
+                stats['size'] += size
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {stage: dict(stats) for stage, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def server_timing(self) -> str:
+        """The stats as a Server-Timing header value"""
+        return ', '.join(
+            f'meditor-{_TOKEN_PATTERN.sub("_", stage)};dur={stats["total_s"] * 1000:.2f};desc="x{stats["count"]}"'
+            for stage, stats in self.stats().items()
+        )
+
+
+class MemorySink(TimingCollector):
+    """Process-wide in-memory sink, e.g. for tests or a debug view"""
+
+
+class SignalSink(MetricsSink):
+    """Re-send every measurement as the stage_timed signal"""
+
+    def record(self, stage: str, seconds: float, size: int = 0) -> None:
+        stage_timed.send(sender=self.__class__, stage=stage, seconds=seconds, size=size)
+
+
+def get_sink() -> Optional[MetricsSink]:
+    """The configured sink, or None when MEDITOR_METRICS_SINK is unset"""
+    global _sink
+    if _sink is _UNLOADED:
+        path = getattr(settings, 'MEDITOR_METRICS_SINK', None)
+        _sink = import_string(path)() if path else None
+    return _sink
+
+
+def server_timing_enabled() -> bool:
+    return getattr(settings, 'MEDITOR_SERVER_TIMING', settings.DEBUG)
+
+
+def instrumentation_enabled() -> bool:
+    """Whether anything can consume timings; decides if engines are instrumented"""
+    return get_sink() is not None or server_timing_enabled()
+
+
+@receiver(setting_changed)
+def _reset_sink(setting, **kwargs):
+    global _sink
+    if setting == 'MEDITOR_METRICS_SINK':
+        _sink = _UNLOADED
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('stage', 'size', 'sink', 'collector', 'start')
+
+    def __init__(self, stage, size, sink, collector):
+        self.stage = stage
+        self.size = size
+        self.sink = sink
+        self.collector = collector
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        if self.sink is not None:
+            self.sink.record(self.stage, elapsed, self.size)
+        if self.collector is not None:
+            self.collector.record(self.stage, elapsed, self.size)
+        return False
+
+
+def timed(stage: str, size: int = 0):
+    """Context manager timing one stage
+
+    size is the length of the stage's input. When nothing consumes timings
+    this returns a shared no-op context manager.
+    """
+    sink = _sink if _sink is not _UNLOADED else get_sink()
+    collector = _request_timings.get()
+    if sink is None and collector is None:
+        return _NULL_TIMER
+    return _Timer(stage, size, sink, collector)
+
+
+def instrument_engine(md) -> None:
+    """Time each of a Markdown instance's treeprocessors as markdown.<class name>
+
+    This covers codehilite, toc, inline patterns and meditor.postprocessors.
+    """
+    for processor in md.treeprocessors:
+        processor.run = _timed_run(processor.run, f'markdown.{type(processor).__name__}')
+
+
+def _timed_run(run, stage):
+    def timed_run(root):
+        with timed(stage):
+            return run(root)
+    return timed_run
+
+
+class ServerTimingMiddleware:
+    """Add the request's pipeline timings as a Server-Timing header
+
+    On while MEDITOR_SERVER_TIMING is true (default: DEBUG). Streaming
+    responses only include the stages run before the response was returned.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not server_timing_enabled():
+            return self.get_response(request)
+        collector = TimingCollector()
+        token = _request_timings.set(collector)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timings.reset(token)
+        return self.add_header(response, collector)
+
+    async def __acall__(self, request):
+        if not server_timing_enabled():
+            return await self.get_response(request)
+        collector = TimingCollector()
+        token = _request_timings.set(collector)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timings.reset(token)
+        return self.add_header(response, collector)
+
+    @staticmethod
+    def add_header(response, collector):
+        value = collector.server_timing()
+        if value:
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = f'{existing}, {value}' if existing else value
+        return response
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meditor", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="markdownsnippet",
+            index=models.Index(
+                fields=["user", "-updated_at", "-id"], name="meditor_snippet_user_recent"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="markdownsnippet",
+            index=models.Index(
+                fields=["is_public", "-updated_at", "-id"],
+                name="meditor_snippet_public_recent",
+            ),
+        ),
+    ]
@@ -0,0 +1,96 @@
+from django.db import migrations
+
+
+FTS_TABLE = "meditor_snippet_fts"
+SNIPPET_TABLE = "meditor_markdownsnippet"
+
+# Stored so ranking reads the vector instead of re-parsing content
+PG_CREATE = [
+    f"""ALTER TABLE {SNIPPET_TABLE} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', name), 'A') ||
+        setweight(to_tsvector('simple', category), 'B') ||
+        setweight(to_tsvector('simple', content), 'C')
+    ) STORED""",
+    f"CREATE INDEX meditor_snippet_search ON {SNIPPET_TABLE} USING GIN (search_vector)",
+]
+
+PG_DROP = [
+    "DROP INDEX IF EXISTS meditor_snippet_search",
+    f"ALTER TABLE {SNIPPET_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, category, content,
+        content='{SNIPPET_TABLE}', content_rowid='id', prefix='2 3'
+    )""",
+    # Triggers keep the index in sync with every write, including bulk and raw SQL
+    f"""CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {SNIPPET_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, category, content)
+        VALUES (new.id, new.name, new.category, new.content);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {SNIPPET_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, category, content)
+        VALUES ('delete', old.id, old.name, old.category, old.content);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF name, category, content ON {SNIPPET_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, category, content)
+        VALUES ('delete', old.id, old.name, old.category, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, name, category, content)
+        VALUES (new.id, new.name, new.category, new.content);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if cursor.fetchone()[0]:
+            return True
+    # Builds can ship FTS5 as a loadable default without the compile option
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE VIRTUAL TABLE temp.meditor_fts5_probe USING fts5(x)")
+            cursor.execute("DROP TABLE temp.meditor_fts5_probe")
+        return True
+    except Exception:
+        return False
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        for statement in PG_CREATE:
+            schema_editor.execute(statement)
+    elif connection.vendor == "sqlite" and sqlite_has_fts5(connection):
+        for statement in SQLITE_CREATE:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        for statement in PG_DROP:
+            schema_editor.execute(statement)
+    elif connection.vendor == "sqlite":
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meditor", "0002_snippet_recent_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
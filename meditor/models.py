@@ -1,8 +1,30 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Substr
 from django.contrib.auth.models import User
 
 # Create your models here.
 
+# Characters of content shown in snippet previews
+PREVIEW_LENGTH = 100
+
+
+class MarkdownSnippetQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """The user's own snippets and everyone's public ones, in one query"""
+        return self.filter(Q(user=user) | Q(is_public=True))
+    
+    def summaries(self):
+        """Listing columns only; the preview is cut in the database so
+        full content never leaves it"""
+        return self.values(
+            'id', 'name', 'category', 'user_id', 'created_at', 'updated_at'
+        ).annotate(
+            # One extra character tells whether the preview was truncated
+            preview_source=Substr('content', 1, PREVIEW_LENGTH + 1)
+        )
+
+
 class MarkdownSnippet(models.Model):
     """Model for storing reusable markdown snippets"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='markdown_snippets')
@@ -13,14 +35,25 @@ class MarkdownSnippet(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = MarkdownSnippetQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-updated_at']
         unique_together = ['user', 'name']
+        indexes = [
+            # Keyset pagination of own and public snippets by recency
+            models.Index(fields=['user', '-updated_at', '-id'], name='meditor_snippet_user_recent'),
+            models.Index(fields=['is_public', '-updated_at', '-id'], name='meditor_snippet_public_recent'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.user.username})"
     
     @property
     def preview(self):
-        """Return a preview of the content (first 100 characters)"""
-        return self.content[:100] + "..." if len(self.content) > 100 else self.content
+        """Return a preview of the content (first PREVIEW_LENGTH characters)"""
+        return truncate_preview(self.content)
+
+
+def truncate_preview(text):
+    return text[:PREVIEW_LENGTH] + "..." if len(text) > PREVIEW_LENGTH else text
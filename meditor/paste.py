@@ -0,0 +1,173 @@
+"""
+Pasted HTML pre-processing for django-meditor
+Strips Word/Google Docs bloat and moves inline base64 images to storage
+before html2text sees the document
+"""
+import base64
+import binascii
+import hashlib
+import re
+import time
+from typing import Any, Callable, Dict, Optional
+
+import html2text
+from html2text.utils import pad_tables_in_text
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+
+# html2text is fed in slices this size so the time budget can be enforced
+FEED_CHUNK_SIZE = 64 * 1024
+
+
+class PasteBudgetExceeded(Exception):
+    """Raised when a paste exceeds the configured size or time budget"""
+
+
+# One alternation so the whole document is cleaned in a single scan.
+# Comments cover Office conditional comments (<!--[if gte mso 9]>...<![endif]-->).
+# An unclosed comment or style/script block runs to the end of the document,
+# as it does in a browser, and tags may not contain "<", so a failed match
+# never rescans the rest of the document and the scan stays linear.
+_CLEANUP_PATTERN = re.compile(
+    r'(?P<comment><!--.*?(?:-->|\Z))'
+    r'|(?P<block><(?P<block_tag>style|script|xml)\b[^<>]*>.*?(?:</(?P=block_tag)\s*>|\Z))'
+    r'|(?P<downlevel><!\[(?:if\b[^\]<>]*|endif)\]>)'
+    r'|(?P<namespaced></?[A-Za-z]+:[A-Za-z][^<>]*>)'
+    r'|(?P<inline></?(?:span|font)\b[^<>]*>)'
+    r'|(?P<tag><(?P<tag_name>[A-Za-z][A-Za-z0-9]*)\b(?P<attrs>[^<>]*)>)',
+    re.DOTALL | re.IGNORECASE
+)
+
+# Presentation attributes html2text never reads
+_ATTRIBUTE_PATTERN = re.compile(
+    r'\s(?:style|class|lang|align|valign|width|height|border|cellspacing|cellpadding)\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)',
+    re.IGNORECASE
+)
+_DATA_IMAGE_PATTERN = re.compile(
+    r'(\ssrc\s*=\s*)(["\'])data:image/([A-Za-z0-9.+-]+);base64,([^"\']*)\2',
+    re.IGNORECASE
+)
+
+
+class PastedHtmlCleaner:
+    """Single-pass cleaner for pasted HTML
+
+    save_image receives a ContentFile and returns its public URL, or None to
+    drop the image. Without it every inline base64 image is dropped.
+    """
+
+    def __init__(self, save_image: Optional[Callable[[ContentFile], Optional[str]]] = None,
+                 deadline: Optional[float] = None):
+        self.save_image = save_image
+        self.deadline = deadline
+        self.images_extracted = 0
+        self.images_dropped = 0
+        self._saved = {}
+
+    def check_deadline(self) -> None:
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise PasteBudgetExceeded('Conversion exceeded the time budget')
+
+    def clean(self, html: str) -> str:
+        return _CLEANUP_PATTERN.sub(self._replace, html)
+
+    def _replace(self, match) -> str:
+        if match.group('tag') is None:
+            # Comments, style/script/xml blocks, Office markers and inline wrappers
+            return ''
+
+        attrs = match.group('attrs')
+        if not attrs.strip() or attrs.strip() == '/':
+            return match.group(0)
+
+        attrs = _ATTRIBUTE_PATTERN.sub('', attrs)
+        if match.group('tag_name').lower() == 'img' and 'data:' in attrs:
+            self.check_deadline()
+            attrs = _DATA_IMAGE_PATTERN.sub(self._replace_image, attrs, count=1)
+            if 'data:image/' in attrs:
+                self.images_dropped += 1
+                return ''
+        return f"<{match.group('tag_name')}{attrs}>"
+
+    def _replace_image(self, match) -> str:
+        url = self._store(match.group(3).lower(), match.group(4))
+        if not url:
+            return match.group(0)
+        return f'{match.group(1)}{match.group(2)}{url}{match.group(2)}'
+
+    def _store(self, subtype: str, payload: str) -> Optional[str]:
+        if self.save_image is None:
+            return None
+        try:
+            data = base64.b64decode(payload, validate=False)
+        except (binascii.Error, ValueError):
+            return None
+
+        # The same image is often pasted several times in one document
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in self._saved:
+            return self._saved[digest]
+
+        extension = {'jpeg': 'jpg', 'svg+xml': 'svg'}.get(subtype, subtype)
+        url = self.save_image(ContentFile(data, name=f"pasted-{digest[:12]}.{extension}"))
+        if url:
+            self.images_extracted += 1
+            self._saved[digest] = url
+        return url
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'images_extracted': self.images_extracted,
+            'images_dropped': self.images_dropped,
+        }
+
+
+def paste_max_size() -> int:
+    return getattr(settings, 'MEDITOR_PASTE_MAX_SIZE', 10 * 1024 * 1024)
+
+
+def paste_deadline() -> Optional[float]:
+    budget = getattr(settings, 'MEDITOR_PASTE_TIME_BUDGET', 10)
+    return time.monotonic() + budget if budget else None
+
+
+def html_to_markdown(html_content: str, deadline: Optional[float] = None) -> str:
+    """Convert HTML to Markdown with the editor's html2text configuration"""
+    # Configure html2text
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    h.ignore_images = False
+    h.body_width = 0  # No line wrapping
+    
+    if deadline is None:
+        return h.handle(html_content)
+    
+    # Same steps as HTML2Text.handle, checking the deadline between slices
+    h.start = True
+    for start in range(0, len(html_content), FEED_CHUNK_SIZE):
+        if time.monotonic() > deadline:
+            raise PasteBudgetExceeded('Conversion exceeded the time budget')
+        h.feed(html_content[start:start + FEED_CHUNK_SIZE])
+    h.feed('')
+    markdown = h.optwrap(h.finish())
+    if h.pad_tables:
+        markdown = pad_tables_in_text(markdown)
+    return markdown
+
+
+def convert_pasted_html(html_content: str, save_image: Optional[Callable[[ContentFile], Optional[str]]] = None,
+                        deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Clean pasted HTML, externalize inline images and convert it to Markdown"""
+    cleaner = PastedHtmlCleaner(save_image=save_image, deadline=deadline)
+    cleaned = cleaner.clean(html_content)
+    cleaner.check_deadline()
+    markdown = html_to_markdown(cleaned, deadline=deadline)
+    return {
+        'markdown': markdown,
+        'stats': {
+            'input_bytes': len(html_content),
+            'cleaned_bytes': len(cleaned),
+            **cleaner.stats(),
+        },
+    }
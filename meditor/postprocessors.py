@@ -0,0 +1,195 @@
+"""
+Element tree post-processors for django-meditor
+Run on Python-Markdown's element tree before it is serialized, so rendered
+HTML never has to be scanned again. Every enabled processor, and the
+document analysis, share a single walk of the tree.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from xml.etree.ElementTree import Element, SubElement
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+
+from .analysis import DocumentAnalyzer, FenceLanguagePreprocessor
+
+
+logger = logging.getLogger('meditor')
+
+DEFAULT_POSTPROCESSORS = ['external_links', 'lazy_images']
+
+# After toc (5), so headings already have their ids, and after inline (20),
+# so links and images are elements
+TREEPROCESSOR_PRIORITY = 4
+
+# Before fenced_code (25) stashes code blocks away
+FENCE_PREPROCESSOR_PRIORITY = 26
+
+
+class Postprocessor:
+    """Base class for post-processors
+
+    run() is called once for every element whose tag is listed in tags.
+    """
+    name = None
+    tags = ()
+
+    def run(self, element: Element) -> None:
+        raise NotImplementedError
+
+
+class ExternalLinks(Postprocessor):
+    """Open links to other sites in a new tab
+
+    Hosts in MEDITOR_INTERNAL_HOSTS (a leading dot matches subdomains) and
+    relative links are left alone.
+    """
+    name = 'external_links'
+    tags = ('a',)
+    rel = ('noopener', 'noreferrer')
+
+    def __init__(self):
+        self.internal_hosts = [host.lower() for host in getattr(settings, 'MEDITOR_INTERNAL_HOSTS', [])]
+
+    def is_external(self, href: str) -> bool:
+        # Most internal links are relative; skip parsing them
+        if not href or (href[0] in '/#?.' and not href.startswith('//')):
+            return False
+        try:
+            parts = urlsplit(href)
+        except ValueError:
+            return False
+        host = (parts.hostname or '').lower()
+        # Relative links have no host; mailto: and friends are not web pages
+        if not host or parts.scheme.lower() not in ('http', 'https', ''):
+            return False
+        for internal in self.internal_hosts:
+            if host == internal or (internal.startswith('.') and (host.endswith(internal) or host == internal[1:])):
+                return False
+        return True
+
+    def run(self, element: Element) -> None:
+        if not self.is_external(element.get('href', '')):
+            return
+        element.set('target', '_blank')
+        rel = element.get('rel', '').split()
+        element.set('rel', ' '.join(rel + [value for value in self.rel if value not in rel]))
+
+
+class LazyImages(Postprocessor):
+    """Let the browser defer loading and decoding images"""
+    name = 'lazy_images'
+    tags = ('img',)
+
+    def run(self, element: Element) -> None:
+        if 'loading' not in element.attrib:
+            element.set('loading', 'lazy')
+        if 'decoding' not in element.attrib:
+            element.set('decoding', 'async')
+
+
+class HeadingAnchors(Postprocessor):
+    """Append a permalink to every heading with an id"""
+    name = 'heading_anchors'
+    tags = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+    def __init__(self):
+        self.text = getattr(settings, 'MEDITOR_HEADING_ANCHOR_TEXT', '¶')
+
+    def run(self, element: Element) -> None:
+        heading_id = element.get('id')
+        if not heading_id:
+            return
+        anchor = SubElement(element, 'a', {'class': 'headerlink', 'href': f'#{heading_id}', 'title': 'Permanent link'})
+        anchor.text = self.text
+
+
+BUILTIN_POSTPROCESSORS = {
+    processor.name: processor
+    for processor in (ExternalLinks, LazyImages, HeadingAnchors)
+}
+
+
+def postprocessors_setting() -> List[str]:
+    return getattr(settings, 'MEDITOR_POSTPROCESSORS', DEFAULT_POSTPROCESSORS)
+
+
+def load_postprocessors(names: Optional[List[str]] = None,
+                        errors: Optional[List[str]] = None) -> List[Postprocessor]:
+    """Instantiate post-processors from built-in names or dotted class paths
+
+    Processors that fail to load are logged and skipped; pass a list as
+    errors to collect their messages as well.
+    """
+    processors = []
+    for name in postprocessors_setting() if names is None else names:
+        try:
+            processor_class = BUILTIN_POSTPROCESSORS.get(name) or import_string(name)
+            processors.append(processor_class())
+        except (ImportError, AttributeError) as e:
+            message = f"Failed to load post-processor {name}: {e}"
+            logger.warning(message)
+            if errors is not None:
+                errors.append(message)
+    return processors
+
+
+class PostprocessorTreeprocessor(Treeprocessor):
+    """Dispatch each element to the processors registered for its tag
+
+    The analyzer sees every element in the same walk; its result is left
+    on the Markdown instance as meditor_analysis.
+    """
+
+    def __init__(self, md, processors: List[Postprocessor], analyzer: DocumentAnalyzer):
+        super().__init__(md)
+        self.analyzer = analyzer
+        self.dispatch: Dict[str, Tuple[Postprocessor, ...]] = {}
+        for processor in processors:
+            for tag in processor.tags:
+                self.dispatch[tag] = self.dispatch.get(tag, ()) + (processor,)
+
+    def run(self, root: Element) -> None:
+        dispatch = self.dispatch
+        visit = self.analyzer.visit
+        # Snapshot the walk so processors can add children as they go
+        for element in list(root.iter()):
+            visit(element)
+            processors = dispatch.get(element.tag)
+            if processors:
+                for processor in processors:
+                    processor.run(element)
+        self.md.meditor_analysis = self.analyzer.result(self.md)
+
+
+class PostprocessorExtension(Extension):
+    """Registers the configured post-processors and the document analyzer"""
+
+    def __init__(self, processors: Optional[List[str]] = None, **kwargs):
+        # Names or dotted paths; None reads MEDITOR_POSTPROCESSORS
+        self.processors = processors
+        self.analyzer = DocumentAnalyzer()
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md):
+        md.registerExtension(self)
+        self.md = md
+        md.meditor_analysis = None
+        md.preprocessors.register(
+            FenceLanguagePreprocessor(md, self.analyzer), 'meditor_fence_languages', FENCE_PREPROCESSOR_PRIORITY
+        )
+        md.treeprocessors.register(
+            PostprocessorTreeprocessor(md, load_postprocessors(self.processors), self.analyzer),
+            'meditor_postprocessors', TREEPROCESSOR_PRIORITY
+        )
+
+    def reset(self):
+        self.analyzer.reset()
+        self.md.meditor_analysis = None
+
+
+def makeExtension(**kwargs):
+    return PostprocessorExtension(**kwargs)
@@ -0,0 +1,354 @@
+"""
+Block-level incremental preview for django-meditor
+Splits a document into top-level blocks and renders each one through the
+production pipeline, caching the HTML per block
+"""
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from markdown.blockprocessors import ReferenceProcessor
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+from markdown.extensions.toc import unique
+from markdown.util import BLOCK_LEVEL_ELEMENTS
+
+from .cache import RenderCache, content_hash
+from .engine import engine_pool
+from .extensions import OPENER_PATTERN, MarkdownProcessor, markdown_processor
+from .templatetags.markdown_filters import cached_document, render_document, render_fingerprint, render_markdown
+
+
+_FENCE_PATTERN = FencedBlockPreprocessor.FENCED_BLOCK_RE
+# A raw HTML block starts with a block-level tag or a comment at the start of a line
+_RAW_START_PATTERN = re.compile(r' {0,3}<(!--|[A-Za-z][^\s/>]*)')
+_HTML_TAG_PATTERN = re.compile(r'<(?:(!--)|(/?)([A-Za-z][^\s/>]*)[^>]*?(/?)>)')
+_COMMENT = '!--'
+# sane_lists only continues a list with items of the same kind
+_ORDERED_PATTERN = re.compile(r'^ {0,3}\d+\.[ ]+')
+_UNORDERED_PATTERN = re.compile(r'^ {0,3}[*+-][ ]+')
+_QUOTE_PATTERN = re.compile(r'^ {0,3}>')
+_RULE_PATTERN = re.compile(r'^ {0,3}(?:(?:-+ {0,2}){3,}|(?:_+ {0,2}){3,}|(?:\*+ {0,2}){3,}) *$')
+_SETEXT_PATTERN = re.compile(r'^[=-]+ *$')
+_REFERENCE_PATTERN = re.compile(ReferenceProcessor.RE.pattern, re.MULTILINE)
+_HEADING_ID_PATTERN = re.compile(r'(<h([1-6])[^>]*? id=")([^"]*)(".*?</h\2>)', re.DOTALL)
+
+# Paragraph appended to each block to capture the separator that follows it
+_BLOCK_END = 'MEDITORBLOCKEND'
+
+block_cache = RenderCache('block', render_fingerprint, 'MEDITOR_PREVIEW_CACHE_SIZE', 4096)
+
+
+def _extension_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """Yield the (start, end) offsets of every extension block
+
+    Follows the extension scanner exactly: a block runs to the first
+    matching closer and only counts if one of the tag's patterns matches
+    that whole span. Extensions are replaced before the markdown is
+    parsed, so these spans win over fences and raw HTML.
+    """
+    closers = {}
+    position = text.find('{{')
+    while position != -1:
+        opener = OPENER_PATTERN.match(text, position)
+        extensions = markdown_processor.tagged_extensions.get(opener.group(1)) if opener else None
+        if extensions:
+            end = MarkdownProcessor._find_closer(text, opener.group(1), opener.end(), closers)
+            if end != -1 and any(extension.pattern.fullmatch(text, position, end) for extension in extensions):
+                yield position, end
+                position = text.find('{{', end)
+                continue
+        position = text.find('{{', position + 1)
+
+
+def _raw_html_stack(line: str, stack: List[str]) -> List[str]:
+    """Tags of a raw HTML block still open after this line
+
+    Mirrors Python-Markdown's HTMLExtractor: every start tag is pushed, an
+    end tag pops back to its match, a comment hides the tags inside it,
+    and the block ends once nothing is open.
+    """
+    position = 0
+    while True:
+        if stack and stack[-1] == _COMMENT:
+            end = line.find('-->', position)
+            if end == -1:
+                return stack
+            stack.pop()
+            if not stack:
+                return []
+            position = end + 3
+        tag = _HTML_TAG_PATTERN.search(line, position)
+        if not tag:
+            return stack
+        position = tag.end()
+        comment, closing, name, self_closing = tag.groups()
+        if comment:
+            stack.append(_COMMENT)
+            continue
+        name = name.lower()
+        if closing:
+            if name in stack:
+                while stack.pop() != name:
+                    pass
+            if not stack:
+                return []
+        elif not self_closing and name != 'hr':
+            stack.append(name)
+
+
+def _starts_raw_html(line: str, offset: int, text: str) -> bool:
+    """Whether a raw HTML block starts on this line"""
+    match = _RAW_START_PATTERN.match(line)
+    if not match:
+        return False
+    name = match.group(1)
+    if name == _COMMENT:
+        # An unclosed comment is plain text, not a raw block
+        return text.find('-->', offset + match.end()) != -1
+    return name.lower() in BLOCK_LEVEL_ELEMENTS
+
+
+def _open_raw_html(line: str, offset: int, text: str) -> List[str]:
+    """Start a raw HTML block on this line, returning its open tags, if it continues past the line"""
+    if not _starts_raw_html(line, offset, text):
+        return []
+    match = _RAW_START_PATTERN.match(line)
+    name = match.group(1)
+    if name == _COMMENT:
+        return [] if '-->' in line[match.end():] else [_COMMENT]
+    if name.lower() == 'hr':
+        return []
+    return _raw_html_stack(line[match.start(1) - 1:], [])
+
+
+def _iter_lines(text: str) -> Iterator[Tuple[int, str]]:
+    """Yield (offset, line) pairs without building a list of every line"""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield start, text[start:]
+            return
+        yield start, text[start:end]
+        start = end + 1
+
+
+def _line_state(state: str, line: str, part_lines: int, after_blank: bool) -> Tuple[str, int]:
+    """What the block's last line belongs to, and how many lines that construct has
+
+    The state is 'ol', 'ul', 'quote', 'code' or 'text', or '' once a
+    heading or rule has ended the construct, since the parser starts
+    afresh on the lines after one.
+    """
+    indented = line.startswith(('    ', '\t'))
+    if after_blank and state not in ('ol', 'ul'):
+        # Only a list takes in what follows a blank line; anything else starts afresh
+        state, part_lines = '', 0
+    elif state == 'code' and not indented:
+        state, part_lines = '', 0
+    if indented and not state:
+        return 'code', 1
+    if line.startswith('#') or _RULE_PATTERN.match(line) or (part_lines == 1 and _SETEXT_PATTERN.match(line)):
+        return '', 0
+    if not state:
+        if _ORDERED_PATTERN.match(line):
+            state = 'ol'
+        elif _UNORDERED_PATTERN.match(line):
+            state = 'ul'
+        else:
+            state = 'quote' if _QUOTE_PATTERN.match(line) else 'text'
+    elif state == 'text' and _QUOTE_PATTERN.match(line):
+        # A quote line splits a paragraph; the lines after it are quoted
+        state = 'quote'
+    return state, part_lines + 1
+
+
+def _continues(state: str, following: str) -> bool:
+    """Whether a line after blank lines still belongs to a block whose last line is in state"""
+    if following[0] in ' \t':
+        return True
+    if state == 'ol':
+        return bool(_ORDERED_PATTERN.match(following))
+    if state == 'ul':
+        return bool(_UNORDERED_PATTERN.match(following))
+    return state == 'quote' and bool(_QUOTE_PATTERN.match(following))
+
+
+def iter_source_blocks(text: str) -> Iterator[str]:
+    """Split markdown into top-level blocks at blank lines
+
+    Fenced code, raw HTML, extension blocks, indented continuations, loose
+    lists and consecutive blockquotes are kept whole so every block renders
+    the same way it would in place.
+    """
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    spans = _extension_spans(text) if '{{' in text else iter(())
+    span = next(spans, None)
+    current = []
+    blanks = []
+    # Offset where the open fenced code block ends
+    fence_end = -1
+    raw = []
+    # Offset where the open extension block ends
+    extension_end = -1
+    # Construct of the last line, and how many lines it has run for
+    state = ''
+    part_lines = 0
+
+    for offset, line in _iter_lines(text):
+        if offset < extension_end:
+            current.append(line)
+            continue
+
+        extension = False
+        while span and span[0] <= offset + len(line):
+            extension_end = span[1]
+            extension = True
+            span = next(spans, None)
+
+        if offset < fence_end:
+            current.append(line)
+            continue
+
+        if raw:
+            current.append(line)
+            # fenced_code runs before raw HTML is extracted, so fences inside it still count
+            match = _FENCE_PATTERN.match(text, offset) if line[:1] in '`~' else None
+            if match:
+                fence_end = match.end()
+            else:
+                raw = _raw_html_stack(line, raw)
+            continue
+
+        if not line.strip():
+            if current:
+                blanks.append(line)
+            continue
+
+        after_blank = bool(blanks)
+        if blanks:
+            if _continues(state, line):
+                current.extend(blanks)
+            else:
+                yield '\n'.join(current)
+                current = []
+                state = ''
+                part_lines = 0
+            blanks = []
+
+        current.append(line)
+        match = _FENCE_PATTERN.match(text, offset) if line[:1] in '`~' else None
+        if match:
+            fence_end = match.end()
+        elif '<' in line:
+            raw = _open_raw_html(line, offset, text)
+        if match or raw or extension or ('<' in line and _starts_raw_html(line, offset, text)):
+            # Fenced code, raw HTML and extension blocks are stashed as blocks of their own
+            state = ''
+            part_lines = 0
+        else:
+            state, part_lines = _line_state(state, line, part_lines, after_blank)
+
+    if current:
+        yield '\n'.join(current)
+
+
+def split_blocks(text: str) -> List[str]:
+    return list(iter_source_blocks(text))
+
+
+def _render_block(source: str) -> str:
+    """Render one block together with the separator a full render puts after it"""
+    html = render_markdown(f"{source}\n\n{_BLOCK_END}")
+    marker = f"<p>{_BLOCK_END}</p>"
+    if html.endswith(marker):
+        return html[:-len(marker)]
+    # The block swallowed the marker (e.g. an unclosed fence); render it alone
+    return render_markdown(source)
+
+
+def _toc_marker() -> str:
+    return engine_pool.extension_configs.get('markdown.extensions.toc', {}).get('marker', '[TOC]')
+
+
+def _render_toc_block(source: str, toc: str) -> str:
+    """Render a block holding the toc marker, with the whole document's table of contents"""
+    marker = f"<p>{_BLOCK_END}</p>"
+    document = render_document(f"{source}\n\n{_BLOCK_END}")
+    html = document['html']
+    if html.endswith(marker):
+        html = html[:-len(marker)]
+    else:
+        # The block swallowed the marker (e.g. unclosed raw HTML); render it alone
+        document = render_document(source)
+        html = document['html']
+    if document['toc'] and document['toc'] in html:
+        html = html.replace(document['toc'], toc)
+    return html
+
+
+def _reference_definitions(text: str) -> str:
+    """Collect every reference definition so blocks can resolve links defined elsewhere"""
+    return '\n'.join(match.group(0) for match in _REFERENCE_PATTERN.finditer(text))
+
+
+def _unique_heading(match: re.Match, heading_ids: set) -> str:
+    heading_id = match.group(3)
+    new_id = unique(heading_id, heading_ids)
+    rest = match.group(4)
+    if new_id != heading_id:
+        # Keep a heading anchor pointing at the renamed heading
+        rest = rest.replace(f'href="#{heading_id}"', f'href="#{new_id}"')
+    return match.group(1) + new_id + rest
+
+
+def iter_rendered_blocks(text: str) -> Iterator[str]:
+    """Render a document block by block through the production pipeline
+
+    Each item is the block's HTML followed by the separator a full render
+    places after it. Heading ids are de-duplicated across the whole
+    document the same way the toc extension does in a full render. A
+    block with the toc marker needs the table of contents of the whole
+    document, so it waits for (or reuses) a cached full render.
+    """
+    references = _reference_definitions(text)
+    heading_ids = set()
+    marker = _toc_marker()
+    toc = None
+
+    for block in iter_source_blocks(text):
+        source = block
+        if references and '[' in block:
+            source = f"{references}\n\n{block}"
+        if marker and marker in block:
+            if toc is None:
+                toc = cached_document(text)['toc']
+            html = _render_toc_block(source, toc)
+        else:
+            html = block_cache.get_or_render(source, _render_block)
+
+        if '<h' in html:
+            html = _HEADING_ID_PATTERN.sub(lambda m: _unique_heading(m, heading_ids), html)
+
+        yield html
+
+
+def render_blocks(text: str) -> List[Dict[str, str]]:
+    """Render a document into {'id', 'html'} blocks, id being a digest of the HTML"""
+    return [
+        {'id': content_hash(html)[:16], 'html': html}
+        for html in iter_rendered_blocks(text)
+    ]
+
+
+def diff_blocks(blocks: List[Dict[str, str]], known: Iterable[str]) -> Dict[str, Any]:
+    """Drop the HTML of blocks the client already has"""
+    known = set(known)
+    ids = [block['id'] for block in blocks]
+    return {
+        'revision': content_hash(''.join(ids))[:16],
+        'blocks': [
+            {'id': block['id']} if block['id'] in known else block
+            for block in blocks
+        ],
+    }
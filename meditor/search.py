@@ -0,0 +1,177 @@
+"""
+Full-text snippet search for django-meditor
+PostgreSQL uses a GIN-indexed, generated tsvector column and SQLite an FTS5
+table kept in sync by triggers, both created by migration 0003. Other
+databases fall back to unindexed icontains matching.
+
+Ranking is limited to the newest MEDITOR_SNIPPET_SEARCH_WINDOW matches, so
+a one-letter typeahead query costs about the same on a table of a thousand
+snippets as on one of a million. Paging past them continues with the older
+matches, newest first, so every match can still be reached.
+"""
+import re
+from importlib import import_module
+from typing import List, Tuple
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Q
+
+from .models import MarkdownSnippet
+
+
+FTS_TABLE = 'meditor_snippet_fts'
+
+# Generated column added on PostgreSQL only, so it is not a model field
+PG_VECTOR_COLUMN = 'search_vector'
+
+_TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+_TRIGGER_PATTERN = re.compile(r'CREATE TRIGGER (\w+)')
+
+# Queries longer than this are cut; typeahead never needs more
+MAX_TERMS = 8
+
+_fts_available = {}
+
+
+def search_terms(text: str) -> List[str]:
+    return _TERM_PATTERN.findall(text or '')[:MAX_TERMS]
+
+
+def _sqlite_match(terms: List[str]) -> str:
+    # Each term is quoted so FTS5 operators in user input are plain text,
+    # and every term is a prefix so partially typed words match
+    return ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+
+
+def _pg_tsquery(terms: List[str]) -> str:
+    # Terms are word characters only, so they need no quoting
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def backend(connection) -> str:
+    """'postgresql', 'sqlite' or 'fallback' for the given connection"""
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        if connection.alias not in _fts_available:
+            _fts_available[connection.alias] = FTS_TABLE in connection.introspection.table_names()
+        if _fts_available[connection.alias]:
+            return 'sqlite'
+    return 'fallback'
+
+
+def restore_search_triggers(using: str = 'default', **kwargs) -> List[str]:
+    """Recreate SQLite FTS triggers that a table rebuild dropped; a post_migrate receiver
+
+    Django's SQLite backend rebuilds the table for most AlterField
+    operations, which drops its triggers without a word. The index is
+    rebuilt as well, since writes made meanwhile were not indexed. Returns
+    the names of the triggers recreated.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or FTS_TABLE not in connection.introspection.table_names():
+        return []
+    # The migration that created them holds their definitions
+    migration = import_module('meditor.migrations.0003_snippet_search')
+    triggers = {}
+    for statement in migration.SQLITE_CREATE:
+        match = _TRIGGER_PATTERN.search(statement)
+        if match:
+            triggers[match.group(1)] = statement
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        missing = sorted(set(triggers) - {row[0] for row in cursor.fetchall()})
+        for name in missing:
+            cursor.execute(triggers[name])
+        if missing:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return missing
+
+
+def search_window() -> int:
+    return getattr(settings, 'MEDITOR_SNIPPET_SEARCH_WINDOW', 1000)
+
+
+def search_snippet_ids(user, text: str, limit: int, offset: int = 0) -> Tuple[List[int], bool]:
+    """Ids of snippets visible to user matching text, best match first
+
+    Returns (ids, has_more). Every term must match as a word prefix in the
+    name, category or content; name matches rank above category matches,
+    which rank above content matches.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return [], False
+
+    table = MarkdownSnippet._meta.db_table
+    connection = connections[router.db_for_read(MarkdownSnippet)]
+    kind = backend(connection)
+    window = search_window()
+
+    # ranked: the requested page of the newest `window` matches, by rank.
+    # newest: the size and oldest id of that window. older: matches older
+    # than the window, newest first, for pages that run past it.
+    if kind == 'postgresql':
+        # MATERIALIZED keeps the planner on the GIN index instead of walking
+        # the primary key backwards looking for rare terms
+        matches = (
+            f"WITH matches AS MATERIALIZED ("
+            f"SELECT id FROM {table} WHERE {PG_VECTOR_COLUMN} @@ to_tsquery('simple', %s) "
+            f"AND (user_id = %s OR is_public)) "
+        )
+        ranked = (
+            f"{matches}, newest AS (SELECT id FROM matches ORDER BY id DESC LIMIT %s) "
+            f"SELECT s.id FROM {table} s JOIN newest ON newest.id = s.id "
+            f"ORDER BY ts_rank(s.{PG_VECTOR_COLUMN}, to_tsquery('simple', %s)) DESC, s.updated_at DESC, s.id DESC "
+            f"LIMIT %s OFFSET %s"
+        )
+        newest = f"{matches}SELECT COUNT(*), MIN(id) FROM (SELECT id FROM matches ORDER BY id DESC LIMIT %s) newest"
+        older = f"{matches}SELECT id FROM matches WHERE id < %s ORDER BY id DESC LIMIT %s OFFSET %s"
+        query = _pg_tsquery(terms)
+        match_params = [query, user.pk]
+        ranked_params = match_params + [window, query, limit + 1, offset]
+    elif kind == 'sqlite':
+        matches = (
+            f"FROM {FTS_TABLE} JOIN {table} s ON s.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND (s.user_id = %s OR s.is_public) "
+        )
+        ranked = (
+            f"SELECT id FROM ("
+            f"SELECT s.id AS id, s.updated_at AS updated_at, bm25({FTS_TABLE}, 10.0, 5.0, 1.0) AS score "
+            f"{matches}ORDER BY {FTS_TABLE}.rowid DESC LIMIT %s"
+            f") ORDER BY score, updated_at DESC, id DESC LIMIT %s OFFSET %s"
+        )
+        newest = f"SELECT COUNT(*), MIN(id) FROM (SELECT s.id AS id {matches}ORDER BY {FTS_TABLE}.rowid DESC LIMIT %s)"
+        older = f"SELECT s.id {matches}AND {FTS_TABLE}.rowid < %s ORDER BY {FTS_TABLE}.rowid DESC LIMIT %s OFFSET %s"
+        match_params = [_sqlite_match(terms), user.pk]
+        ranked_params = match_params + [window, limit + 1, offset]
+    else:
+        matches = Q()
+        for term in terms:
+            matches &= Q(name__icontains=term) | Q(category__icontains=term) | Q(content__icontains=term)
+        ids = list(
+            MarkdownSnippet.objects.visible_to(user).filter(matches)
+            .order_by('-updated_at', '-id').values_list('id', flat=True)[offset:offset + limit + 1]
+        )
+        return ids[:limit], len(ids) > limit
+
+    with connection.cursor() as cursor:
+        cursor.execute(ranked, ranked_params)
+        ids = [row[0] for row in cursor.fetchall()]
+        if len(ids) <= limit:
+            # The page reaches the end of the ranked window
+            cursor.execute(newest, match_params + [window])
+            count, oldest = cursor.fetchone()
+            if count >= window and oldest is not None:
+                cursor.execute(older, match_params + [oldest, limit + 1 - len(ids), max(0, offset - count)])
+                ids += [row[0] for row in cursor.fetchall()]
+    return ids[:limit], len(ids) > limit
+
+
+def search_snippets(user, text: str, limit: int, offset: int = 0) -> Tuple[List[dict], bool]:
+    """Listing rows (MarkdownSnippet.objects.summaries()) for a search, in rank order"""
+    ids, has_more = search_snippet_ids(user, text, limit, offset)
+    rows = {row['id']: row for row in MarkdownSnippet.objects.filter(id__in=ids).summaries()}
+    return [rows[snippet_id] for snippet_id in ids if snippet_id in rows], has_more
@@ -0,0 +1,52 @@
+export default{updateContentAnalysis(){const content=this.textarea.value;const analysis=this.analyzeContent(content);let analysisPanel=document.querySelector('.content-analysis-panel');if(!analysisPanel){analysisPanel=this.createAnalysisPanel();}
+this.updateAnalysisDisplay(analysisPanel,analysis);},createAnalysisPanel(){const panel=document.createElement('div');panel.className='content-analysis-panel';panel.innerHTML=`
+            <div class="analysis-header">
+                <h4>📊 Content Analysis</h4>
+                <button class="analysis-toggle" onclick="this.closest('.content-analysis-panel').classList.toggle('collapsed')">−</button>
+            </div>
+            <div class="analysis-content">
+                <div class="analysis-grid">
+                    <div class="analysis-item">
+                        <span class="analysis-label">Words:</span>
+                        <span class="analysis-value" id="word-count">0</span>
+                    </div>
+                    <div class="analysis-item">
+                        <span class="analysis-label">Reading Time:</span>
+                        <span class="analysis-value" id="reading-time">0 min</span>
+                    </div>
+                    <div class="analysis-item">
+                        <span class="analysis-label">Characters:</span>
+                        <span class="analysis-value" id="char-count">0</span>
+                    </div>
+                    <div class="analysis-item">
+                        <span class="analysis-label">Paragraphs:</span>
+                        <span class="analysis-value" id="paragraph-count">0</span>
+                    </div>
+                    <div class="analysis-item">
+                        <span class="analysis-label">Headings:</span>
+                        <span class="analysis-value" id="heading-count">0</span>
+                    </div>
+                    <div class="analysis-item">
+                        <span class="analysis-label">Links:</span>
+                        <span class="analysis-value" id="link-count">0</span>
+                    </div>
+                </div>
+                <div class="analysis-insights" id="content-insights"></div>
+            </div>
+        `;this.textarea.parentNode.parentNode.appendChild(panel);return panel;},analyzeContent(content){const words=content.trim().split(/\s+/).filter(word=>word.length>0);const characters=content.length;const charactersNoSpaces=content.replace(/\s/g,'').length;const paragraphs=content.split(/\n\s*\n/).filter(p=>p.trim().length>0);const headings=(content.match(/^#{1,6}\s+/gm)||[]).length;const links=(content.match(/\[([^\]]+)\]\(([^)]+)\)/g)||[]).length;const images=(content.match(/!\[([^\]]*)\]\(([^)]+)\)/g)||[]).length;const readingTimeMinutes=Math.ceil(words.length/200);const readingTimeSeconds=Math.ceil((words.length/200)*60);const sentences=content.split(/[.!?]+/).filter(s=>s.trim().length>0);const avgWordsPerSentence=words.length/Math.max(sentences.length,1);const avgSyllablesPerWord=this.estimateSyllables(words);const fleschScore=206.835-(1.015*avgWordsPerSentence)-(84.6*avgSyllablesPerWord);const insights=this.generateInsights({words:words.length,characters,paragraphs:paragraphs.length,headings,links,images,avgWordsPerSentence,fleschScore});return{words:words.length,characters,charactersNoSpaces,paragraphs:paragraphs.length,headings,links,images,readingTimeMinutes,readingTimeSeconds,avgWordsPerSentence,fleschScore,insights};},estimateSyllables(words){let totalSyllables=0;words.forEach(word=>{const cleanWord=word.toLowerCase().replace(/[^a-z]/g,'');if(cleanWord.length<=3){totalSyllables+=1;}else{const syllables=cleanWord.match(/[aeiouy]+/g)||[];totalSyllables+=Math.max(syllables.length,1);}});return totalSyllables/Math.max(words.length,1);},generateInsights(stats){const insights=[];if(stats.words<100){insights.push('📝 Consider adding more content for better engagement');}else if(stats.words>2000){insights.push('📖 This is a comprehensive piece - consider breaking it into sections');}
+if(stats.fleschScore>80){insights.push('✅ Very easy to read - great for general audiences');}else if(stats.fleschScore>60){insights.push('👍 Good readability - suitable for most readers');}else if(stats.fleschScore>30){insights.push('⚠️ Consider simplifying language for better accessibility');}else{insights.push('🔍 Complex content - may need simplification');}
+if(stats.headings===0&&stats.words>300){insights.push('📋 Add headings to improve content structure');}
+if(stats.links===0&&stats.words>500){insights.push('🔗 Consider adding relevant links for better SEO');}
+if(stats.images===0&&stats.words>800){insights.push('🖼️ Images can make your content more engaging');}
+return insights;},updateAnalysisDisplay(panel,analysis){panel.querySelector('#word-count').textContent=analysis.words.toLocaleString();panel.querySelector('#reading-time').textContent=analysis.readingTimeMinutes>0?`${analysis.readingTimeMinutes} min`:'< 1 min';panel.querySelector('#char-count').textContent=analysis.characters.toLocaleString();panel.querySelector('#paragraph-count').textContent=analysis.paragraphs;panel.querySelector('#heading-count').textContent=analysis.headings;panel.querySelector('#link-count').textContent=analysis.links;const insightsContainer=panel.querySelector('#content-insights');if(analysis.insights.length>0){insightsContainer.innerHTML=analysis.insights.map(insight=>`<div class="insight-item">${insight}</div>`).join('');}else{insightsContainer.innerHTML='<div class="insight-item">✨ Great content structure!</div>';}},analyzeContentForSuggestions(){const content=this.textarea.value;const suggestions=[];if(content.length>0){const lines=content.split('\n');const headings=lines.filter(line=>line.startsWith('#'));if(headings.length>3&&content.length>1000){suggestions.push({type:'info',message:'💡 Consider adding a table of contents for better navigation',action:()=>this.insertTableOfContents(headings)});}
+if(content.length>500&&!content.includes('![')){suggestions.push({type:'info',message:'🖼️ Consider adding images to make your content more engaging',action:null});}
+if(content.length>800&&!content.includes('[')){suggestions.push({type:'info',message:'🔗 Consider adding relevant links to enhance your content',action:null});}
+if(suggestions.length>0){this.showSmartSuggestions(suggestions);}}},showSmartSuggestions(suggestions){const existing=document.querySelector('.smart-suggestions');if(existing)existing.remove();const container=document.createElement('div');container.className='smart-suggestions';container.innerHTML=`
+            <div class="suggestions-header">
+                <h4>💡 Smart Suggestions</h4>
+                <button class="close-suggestions" onclick="this.closest('.smart-suggestions').remove()">×</button>
+            </div>
+            <div class="suggestions-list">
+                ${suggestions.map(suggestion => `<div class="suggestion-item"><span class="suggestion-message">${suggestion.message}</span>${suggestion.action?`<button class="suggestion-action" onclick="this.closest('.smart-suggestions').querySelector('.suggestion-action').dispatchEvent(new CustomEvent('applySuggestion', {detail: ${JSON.stringify(suggestion)}}))">Apply</button>`:''}</div>`).join('')}
+            </div>
+        `;container.addEventListener('applySuggestion',(e)=>{e.detail.action();container.remove();});this.textarea.parentNode.parentNode.appendChild(container);setTimeout(()=>{if(container.parentNode){container.remove();}},10000);},insertTableOfContents(headings){let toc='\n## Table of Contents\n\n';headings.forEach(heading=>{const level=heading.match(/^#+/)[0].length;const text=heading.replace(/^#+\s*/,'');const indent='  '.repeat(level-1);const link=text.toLowerCase().replace(/[^a-z0-9]+/g,'-');toc+=`${indent}- [${text}](#${link})\n`;});toc+='\n---\n\n';const textarea=this.textarea;const content=textarea.value;const firstHeadingIndex=content.indexOf('# ');if(firstHeadingIndex!==-1){const endOfFirstHeading=content.indexOf('\n',firstHeadingIndex);const before=content.substring(0,endOfFirstHeading+1);const after=content.substring(endOfFirstHeading+1);textarea.value=before+toc+after;textarea.focus();textarea.dispatchEvent(new Event('input'));}}};
\ No newline at end of file
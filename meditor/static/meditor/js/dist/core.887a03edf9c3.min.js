@@ -0,0 +1,92 @@
+(function(){'use strict';if(window.RichMarkdownEditor){return;}
+const EDITOR_MODULES={analysis:{file:'analysis.e7716c26e238.min.js',methods:['updateContentAnalysis','analyzeContentForSuggestions']},upload:{file:'upload.083dfb3d5828.min.js',methods:['uploadImage','uploadImages']},paste:{file:'paste.8b32d796f8f3.min.js',methods:['convertHtmlToMarkdown']},snippets:{file:'snippets.f1cc52195006.min.js',methods:['showSnippetsLibrary','showSaveSnippetModal']},preview:{file:'preview.cdf48f5260c1.min.js',methods:['updatePreview','showFullscreenPreview','openSitePreview']},table:{file:'table.1e136bf7ccc7.min.js',methods:['showTableBuilder','insertTable']},templates:{file:'templates.926eee6f6a8b.min.js',methods:['showTemplateSelector']},export:{file:'export.e854b148bdfc.min.js',methods:['showExportImportMenu']},};const scriptUrl=document.currentScript?document.currentScript.src:document.baseURI;const loadedModules=new Map();class RichMarkdownEditor{constructor(fieldName){this.fieldName=fieldName;this.textarea=document.querySelector(`textarea[name="${fieldName}"]`);this.toolbar=document.querySelector(`.markdown-toolbar[data-field="${fieldName}"]`);this.previewDiv=document.getElementById(`preview-${fieldName}`);this.previewContent=this.previewDiv.querySelector('.preview-content');this.livePreviewEnabled=false;this.autoSaveTimeout=null;this.analysisTimeout=null;this.chunkedUploadThreshold=4*1024*1024;this.uploadConcurrency=3;this.uploadRetries=4;this.uploadBatchSize=8;this.init();}
+init(){this.bindToolbarEvents();this.bindKeyboardShortcuts();this.bindPasteEvents();this.setupLivePreview();this.setupImageUpload();this.setupAutoSave();this.setupSnippets();this.setupSmartFeatures();this.setupExportImport();}
+bindToolbarEvents(){this.toolbar.addEventListener('click',(e)=>{if(e.target.classList.contains('toolbar-btn')){e.preventDefault();const action=e.target.dataset.action;this.handleToolbarAction(action);}});}
+bindKeyboardShortcuts(){this.textarea.addEventListener('keydown',(e)=>{if(e.key==='Tab'){e.preventDefault();this.insertAtCursor('    ');}
+if(e.ctrlKey||e.metaKey){switch(e.key.toLowerCase()){case'b':e.preventDefault();this.wrapSelection('**','**');break;case'i':e.preventDefault();this.wrapSelection('*','*');break;case'k':e.preventDefault();this.showLinkModal();break;case's':e.preventDefault();this.autoSave();break;}}});}
+bindPasteEvents(){this.textarea.addEventListener('paste',(e)=>{const pasteFormattingDisabled=localStorage.getItem(`meditor_paste_formatting_${this.fieldName}`)==='disabled';if(pasteFormattingDisabled){return;}
+const clipboardData=e.clipboardData||window.clipboardData;const pastedData=clipboardData.getData('text/html');const pastedText=clipboardData.getData('text/plain');const autoConvertHtml=this.toolbar.dataset.autoConvertHtml!=='false';if(pastedData&&pastedData.includes('<')&&autoConvertHtml){e.preventDefault();this.convertHtmlToMarkdown(pastedData);}else if(pastedText&&this.isMarkdownImage(pastedText.trim())){e.preventDefault();this.insertAtCursor(pastedText.trim());this.showNotification('Markdown image preserved','success');}else if(pastedText&&this.isUrl(pastedText.trim())){e.preventDefault();this.handleUrlPaste(pastedText.trim());}});}
+handleUrlPaste(url){const selection=this.getSelection();if(selection.text){this.insertAtCursor(`[${selection.text}](${url})`);this.showNotification('Selected text converted to link','success');}else{this.autoLinkUrl(url);}}
+isUrl(text){const urlPatterns=[/^https?:\/\/[^\s]+$/i,/^www\.[^\s]+\.[^\s]+$/i,/^[^\s]+\.[^\s]+\.[^\s]+$/i,];return urlPatterns.some(pattern=>pattern.test(text));}
+isMarkdownImage(text){const markdownImagePattern=/^!\[([^\]]*)\]\(([^)]+)\)$/;return markdownImagePattern.test(text);}
+autoLinkUrl(url){let fullUrl=url;if(!url.match(/^https?:\/\//i)){fullUrl='https://'+url;}
+let linkText=url;try{const urlObj=new URL(fullUrl);linkText=urlObj.hostname+urlObj.pathname;if(urlObj.pathname==='/'){linkText=urlObj.hostname;}}catch(e){linkText=url;}
+const markdownLink=`[${linkText}](${fullUrl})`;this.insertAtCursor(markdownLink);this.showNotification('URL converted to link','success');}
+setupLivePreview(){const livePreviewBtn=document.createElement('button');livePreviewBtn.type='button';livePreviewBtn.className='toolbar-btn live-preview-btn';livePreviewBtn.dataset.action='live_preview';livePreviewBtn.title='Toggle Live Preview';livePreviewBtn.innerHTML='⚡';const previewBtn=this.toolbar.querySelector('[data-action="preview"]');if(previewBtn){previewBtn.parentNode.insertBefore(livePreviewBtn,previewBtn.nextSibling);}
+this.textarea.addEventListener('input',()=>{if(this.livePreviewEnabled){this.updateLivePreview();}});this.setupPasteFormattingToggle();}
+setupImageUpload(){const uploadBtn=document.createElement('button');uploadBtn.type='button';uploadBtn.className='toolbar-btn upload-btn';uploadBtn.dataset.action='upload_image';uploadBtn.title='Upload Image';uploadBtn.innerHTML='📤';const imageBtn=this.toolbar.querySelector('[data-action="image"]');if(imageBtn){imageBtn.parentNode.insertBefore(uploadBtn,imageBtn.nextSibling);}
+const fileInput=document.createElement('input');fileInput.type='file';fileInput.accept='image/*';fileInput.multiple=true;fileInput.style.display='none';fileInput.id=`image-upload-${this.fieldName}`;document.body.appendChild(fileInput);fileInput.addEventListener('change',(e)=>{const files=Array.from(e.target.files);if(files.length===1){this.uploadImage(files[0]);}else if(files.length>1){this.uploadImages(files);}
+e.target.value='';});this.setupDragAndDrop();}
+setupPasteFormattingToggle(){const pasteToggleBtn=document.createElement('button');pasteToggleBtn.type='button';pasteToggleBtn.className='toolbar-btn paste-toggle-btn';pasteToggleBtn.dataset.action='toggle_paste_formatting';pasteToggleBtn.title='Toggle Paste Formatting';this.updatePasteToggleButton(pasteToggleBtn);let insertAfter=this.toolbar.querySelector('[data-action="upload_image"]')||this.toolbar.querySelector('[data-action="image"]')||this.toolbar.lastElementChild;if(insertAfter){insertAfter.parentNode.insertBefore(pasteToggleBtn,insertAfter.nextSibling);}else{this.toolbar.appendChild(pasteToggleBtn);}
+console.log('Paste toggle button added to toolbar:',pasteToggleBtn);pasteToggleBtn.addEventListener('click',()=>{this.togglePasteFormatting(pasteToggleBtn);});}
+updatePasteToggleButton(button){const isDisabled=localStorage.getItem(`meditor_paste_formatting_${this.fieldName}`)==='disabled';if(isDisabled){button.innerHTML='📋❌';button.title='Paste Formatting: OFF (Click to enable)';button.classList.add('paste-disabled');}else{button.innerHTML='📋✅';button.title='Paste Formatting: ON (Click to disable)';button.classList.remove('paste-disabled');}}
+togglePasteFormatting(button){const currentState=localStorage.getItem(`meditor_paste_formatting_${this.fieldName}`);const newState=currentState==='disabled'?'enabled':'disabled';localStorage.setItem(`meditor_paste_formatting_${this.fieldName}`,newState);this.updatePasteToggleButton(button);const message=newState==='disabled'?'Paste formatting disabled - raw paste mode':'Paste formatting enabled - smart paste mode';this.showNotification(message,'info');}
+setupDragAndDrop(){this.textarea.addEventListener('dragover',(e)=>{e.preventDefault();this.textarea.classList.add('drag-over');});this.textarea.addEventListener('dragleave',(e)=>{e.preventDefault();this.textarea.classList.remove('drag-over');});this.textarea.addEventListener('drop',(e)=>{e.preventDefault();this.textarea.classList.remove('drag-over');const files=Array.from(e.dataTransfer.files).filter(file=>file.type.startsWith('image/'));if(files.length===1){this.uploadImage(files[0]);}else if(files.length>1){this.uploadImages(files);}});}
+setupAutoSave(){this.textarea.addEventListener('input',()=>{clearTimeout(this.autoSaveTimeout);this.autoSaveTimeout=setTimeout(()=>{this.autoSave();},2000);clearTimeout(this.analysisTimeout);this.analysisTimeout=setTimeout(()=>{this.updateContentAnalysis();},300);});}
+setupSnippets(){const snippetsBtn=document.createElement('button');snippetsBtn.type='button';snippetsBtn.className='toolbar-btn snippets-btn';snippetsBtn.dataset.action='snippets';snippetsBtn.title='Snippets Library';snippetsBtn.innerHTML='📚';const uploadBtn=this.toolbar.querySelector('[data-action="upload_image"]');if(uploadBtn){uploadBtn.parentNode.insertBefore(snippetsBtn,uploadBtn.nextSibling);}
+const saveSnippetBtn=document.createElement('button');saveSnippetBtn.type='button';saveSnippetBtn.className='toolbar-btn save-snippet-btn';saveSnippetBtn.dataset.action='save_snippet';saveSnippetBtn.title='Save as Snippet';saveSnippetBtn.innerHTML='💾';snippetsBtn.parentNode.insertBefore(saveSnippetBtn,snippetsBtn.nextSibling);}
+handleToolbarAction(action){switch(action){case'bold':this.wrapSelection('**','**');break;case'italic':this.wrapSelection('*','*');break;case'strikethrough':this.wrapSelection('~~','~~');break;case'h1':this.insertAtLineStart('# ');break;case'h2':this.insertAtLineStart('## ');break;case'h3':this.insertAtLineStart('### ');break;case'link':this.showLinkModal();break;case'image':this.showImageModal();break;case'upload_image':this.triggerImageUpload();break;case'snippets':this.showSnippetsLibrary();break;case'save_snippet':this.showSaveSnippetModal();break;case'code':this.wrapSelection('`','`');break;case'codeblock':this.wrapSelection('```\n','\n```');break;case'ul':this.insertAtLineStart('- ');break;case'ol':this.insertAtLineStart('1. ');break;case'blockquote':this.insertAtLineStart('> ');break;case'table':this.showTableBuilder();break;case'hr':this.insertAtCursor('\n---\n');break;case'html2md':this.showHtmlToMarkdownModal();break;case'preview':this.togglePreview();break;case'live_preview':this.toggleLivePreview();break;case'site_preview':this.openSitePreview(this.openPreviewWindow());break;case'fullscreen':this.showFullscreenPreview(this.openPreviewWindow());break;}}
+toggleLivePreview(){this.livePreviewEnabled=!this.livePreviewEnabled;const btn=this.toolbar.querySelector('[data-action="live_preview"]');if(this.livePreviewEnabled){btn.innerHTML='⚡';btn.classList.add('active');this.updateLivePreview();this.previewDiv.style.display='block';}else{btn.innerHTML='⚡';btn.classList.remove('active');this.previewDiv.style.display='none';}}
+updateLivePreview(){clearTimeout(this.livePreviewTimeout);this.livePreviewTimeout=setTimeout(()=>this.updatePreview(),150);}
+triggerImageUpload(){const fileInput=document.getElementById(`image-upload-${this.fieldName}`);fileInput.click();}
+getCsrfToken(){return document.querySelector('[name=csrfmiddlewaretoken]')?.value||document.cookie.match(/csrftoken=([^;]+)/)?.[1]||'';}
+autoSave(){const content=this.textarea.value;localStorage.setItem(`meditor_autosave_${this.fieldName}`,content);const saveIndicator=document.createElement('div');saveIndicator.className='save-indicator';saveIndicator.textContent='Saved';saveIndicator.style.cssText=`
+            position: fixed;
+            top: 20px;
+            right: 20px;
+            background: #28a745;
+            color: white;
+            padding: 8px 16px;
+            border-radius: 4px;
+            z-index: 1000;
+            font-size: 14px;
+        `;document.body.appendChild(saveIndicator);setTimeout(()=>{saveIndicator.remove();},2000);}
+getSelection(){return{start:this.textarea.selectionStart,end:this.textarea.selectionEnd,text:this.textarea.value.substring(this.textarea.selectionStart,this.textarea.selectionEnd)};}
+setSelection(start,end){this.textarea.setSelectionRange(start,end);this.textarea.focus();}
+insertAtCursor(text){const selection=this.getSelection();const beforeText=this.textarea.value.substring(0,selection.start);const afterText=this.textarea.value.substring(selection.end);this.textarea.value=beforeText+text+afterText;this.setSelection(selection.start+text.length,selection.start+text.length);this.textarea.dispatchEvent(new Event('input'));}
+wrapSelection(before,after){const selection=this.getSelection();const replacement=before+selection.text+after;this.textarea.value=this.textarea.value.substring(0,selection.start)+
+replacement+
+this.textarea.value.substring(selection.end);this.setSelection(selection.start+before.length,selection.start+replacement.length-after.length);this.textarea.dispatchEvent(new Event('input'));}
+insertAtLineStart(text){const selection=this.getSelection();const lines=this.textarea.value.split('\n');const currentLine=this.getCurrentLineNumber();if(lines[currentLine]){lines[currentLine]=text+lines[currentLine];this.textarea.value=lines.join('\n');this.setSelection(selection.start+text.length,selection.end+text.length);}}
+getCurrentLineNumber(){const value=this.textarea.value;const cursorPos=this.textarea.selectionStart;return value.substring(0,cursorPos).split('\n').length-1;}
+setupSmartFeatures(){this.setupAutoCompletion();this.setupContentTemplates();this.setupSmartSuggestions();}
+setupAutoCompletion(){const textarea=this.textarea;let autocompleteBox=null;textarea.addEventListener('input',(e)=>{const cursorPos=textarea.selectionStart;const textBeforeCursor=textarea.value.substring(0,cursorPos);const currentWord=this.getCurrentWord(textBeforeCursor);if(autocompleteBox){autocompleteBox.remove();autocompleteBox=null;}
+const suggestions=this.getAutocompleteSuggestions(currentWord,textBeforeCursor);if(suggestions.length>0){autocompleteBox=this.createAutocompleteBox(suggestions,textarea,currentWord);}});textarea.addEventListener('keydown',(e)=>{if(autocompleteBox){const activeItem=autocompleteBox.querySelector('.autocomplete-item.active');if(e.key==='ArrowDown'){e.preventDefault();this.navigateAutocomplete(autocompleteBox,1);}else if(e.key==='ArrowUp'){e.preventDefault();this.navigateAutocomplete(autocompleteBox,-1);}else if(e.key==='Enter'&&activeItem){e.preventDefault();this.selectAutocomplete(activeItem,textarea);autocompleteBox.remove();autocompleteBox=null;}else if(e.key==='Escape'){autocompleteBox.remove();autocompleteBox=null;}}});textarea.addEventListener('blur',()=>{setTimeout(()=>{if(autocompleteBox){autocompleteBox.remove();autocompleteBox=null;}},200);});}
+getCurrentWord(text){const words=text.split(/\s/);return words[words.length-1]||'';}
+getAutocompleteSuggestions(word,context){const suggestions=[];if(word.startsWith('#')){suggestions.push({text:'# Heading 1',replacement:'# Heading 1'},{text:'## Heading 2',replacement:'## Heading 2'},{text:'### Heading 3',replacement:'### Heading 3'});}
+if(word.startsWith('[')){suggestions.push({text:'[Link Text](URL)',replacement:'[Link Text](URL)'},{text:'[Image Alt](image.jpg)',replacement:'![Image Alt](image.jpg)'});}
+if(word.startsWith('-')||word.startsWith('*')){suggestions.push({text:'- List item',replacement:'- List item'},{text:'* Another item',replacement:'* Another item'});}
+if(word.startsWith('`')){suggestions.push({text:'`inline code`',replacement:'`inline code`'},{text:'```\ncode block\n```',replacement:'```\ncode block\n```'});}
+const lines=context.split('\n');const currentLine=lines[lines.length-1];return suggestions.slice(0,5);}
+createAutocompleteBox(suggestions,textarea,currentWord){const box=document.createElement('div');box.className='autocomplete-box';const rect=this.getCaretCoordinates(textarea,textarea.selectionStart);box.style.position='absolute';box.style.left=rect.x+'px';box.style.top=(rect.y+20)+'px';box.style.zIndex='1000';box.innerHTML=suggestions.map((suggestion,index)=>`
+            <div class="autocomplete-item ${index === 0 ? 'active' : ''}" data-replacement="${suggestion.replacement}">
+                <span class="suggestion-text">${suggestion.text}</span>
+            </div>
+        `).join('');box.querySelectorAll('.autocomplete-item').forEach(item=>{item.addEventListener('click',()=>{this.selectAutocomplete(item,textarea);box.remove();});});textarea.parentNode.appendChild(box);return box;}
+navigateAutocomplete(box,direction){const items=box.querySelectorAll('.autocomplete-item');const activeItem=box.querySelector('.autocomplete-item.active');const currentIndex=Array.from(items).indexOf(activeItem);activeItem.classList.remove('active');let newIndex=currentIndex+direction;if(newIndex<0)newIndex=items.length-1;if(newIndex>=items.length)newIndex=0;items[newIndex].classList.add('active');}
+selectAutocomplete(item,textarea){const replacement=item.dataset.replacement;const cursorPos=textarea.selectionStart;const textBeforeCursor=textarea.value.substring(0,cursorPos);const currentWord=this.getCurrentWord(textBeforeCursor);const newText=textBeforeCursor.replace(new RegExp(currentWord+'$'),replacement)+
+textarea.value.substring(cursorPos);textarea.value=newText;textarea.focus();const newCursorPos=cursorPos-currentWord.length+replacement.length;textarea.setSelectionRange(newCursorPos,newCursorPos);textarea.dispatchEvent(new Event('input'));}
+getCaretCoordinates(element,position){const div=document.createElement('div');const styles=getComputedStyle(element);const properties=['direction','boxSizing','width','height','overflowX','overflowY','borderTopWidth','borderRightWidth','borderBottomWidth','borderLeftWidth','paddingTop','paddingRight','paddingBottom','paddingLeft','fontStyle','fontVariant','fontWeight','fontStretch','fontSize','fontSizeAdjust','lineHeight','fontFamily','textAlign','textTransform','textIndent','textDecoration','letterSpacing','wordSpacing'];div.style.position='absolute';div.style.visibility='hidden';div.style.whiteSpace='pre-wrap';properties.forEach(prop=>{div.style[prop]=styles[prop];});div.textContent=element.value.substring(0,position);const span=document.createElement('span');span.textContent=element.value.substring(position)||'.';div.appendChild(span);document.body.appendChild(div);const coordinates={top:span.offsetTop+parseInt(styles.borderTopWidth)+parseInt(styles.paddingTop),left:span.offsetLeft+parseInt(styles.borderLeftWidth)+parseInt(styles.paddingLeft)};document.body.removeChild(div);return coordinates;}
+setupContentTemplates(){const templateButton=document.createElement('button');templateButton.className='toolbar-btn template-btn';templateButton.innerHTML='📋';templateButton.title='Content Templates';templateButton.onclick=()=>this.showTemplateSelector();const tableButton=this.toolbar.querySelector('.table-btn');if(tableButton){tableButton.parentNode.insertBefore(templateButton,tableButton.nextSibling);}}
+setupSmartSuggestions(){this.textarea.addEventListener('input',()=>{setTimeout(()=>{this.analyzeContentForSuggestions();},1000);});}
+setupExportImport(){const exportButton=document.createElement('button');exportButton.className='toolbar-btn export-btn';exportButton.innerHTML='📤';exportButton.title='Export/Import';exportButton.onclick=()=>this.showExportImportMenu();const templateButton=this.toolbar.querySelector('.template-btn');if(templateButton){templateButton.parentNode.insertBefore(exportButton,templateButton.nextSibling);}}
+showLinkModal(){const selection=this.getSelection();let linkText='';if(selection.text){linkText=selection.text;}else{linkText=prompt('Link text:');if(!linkText)return;}
+const linkUrl=prompt('URL:');if(linkUrl){this.insertAtCursor(`[${linkText}](${linkUrl})`);this.showNotification('Link created successfully','success');}}
+showImageModal(){const altText=prompt('Alt text:');if(altText){const imageUrl=prompt('Image URL:');if(imageUrl){this.insertAtCursor(`![${altText}](${imageUrl})`);}}}
+showHtmlToMarkdownModal(){const htmlContent=prompt('Paste HTML content:');if(htmlContent){this.convertHtmlToMarkdown(htmlContent);}}
+togglePreview(){if(this.previewDiv.style.display==='none'||!this.previewDiv.style.display){this.previewDiv.style.display='block';this.updatePreview();}else{this.previewDiv.style.display='none';}}
+openPreviewWindow(){return window.open('','_blank','width=1200,height=800,scrollbars=yes,resizable=yes');}
+static loadModule(name){if(!loadedModules.has(name)){const url=new URL(EDITOR_MODULES[name].file,scriptUrl).href;loadedModules.set(name,import(url).then(module=>{Object.assign(RichMarkdownEditor.prototype,module.default);}).catch(error=>{loadedModules.delete(name);throw error;}));}
+return loadedModules.get(name);}
+static initAll(root=document){root.querySelectorAll('.markdown-editor-container').forEach(container=>{if(container.dataset.meditorReady){return;}
+container.dataset.meditorReady='true';const fieldName=container.querySelector('.markdown-toolbar').dataset.field;new RichMarkdownEditor(fieldName);});}
+showNotification(message,type='info'){const notification=document.createElement('div');notification.className=`meditor-notification meditor-notification-${type}`;notification.innerHTML=`
+            <div class="notification-content">
+                <span class="notification-message">${message}</span>
+                <button class="notification-close" onclick="this.parentElement.parentElement.remove()">×</button>
+            </div>
+        `;document.body.appendChild(notification);setTimeout(()=>{if(notification.parentElement){notification.remove();}},3000);}}
+Object.entries(EDITOR_MODULES).forEach(([name,module])=>{module.methods.forEach(method=>{const stub=async function(...args){try{await RichMarkdownEditor.loadModule(name);}catch(error){console.error(`Could not load editor module ${name}:`,error);this.showNotification('This tool could not be loaded, please try again','error');return undefined;}
+if(this[method]===stub){throw new Error(`Editor module ${name} does not define ${method}`);}
+return this[method](...args);};RichMarkdownEditor.prototype[method]=stub;});});window.RichMarkdownEditor=RichMarkdownEditor;if(document.readyState==='loading'){document.addEventListener('DOMContentLoaded',()=>RichMarkdownEditor.initAll());}else{RichMarkdownEditor.initAll();}
+document.addEventListener('formset:added',(event)=>RichMarkdownEditor.initAll(event.target));})();
\ No newline at end of file
@@ -0,0 +1,172 @@
+export default{showExportImportMenu(){const modal=document.createElement('div');modal.className='export-import-modal';modal.innerHTML=`
+            <div class="export-import-content">
+                <div class="export-import-header">
+                    <h3>📤 Export / Import</h3>
+                    <button class="close-modal" onclick="this.closest('.export-import-modal').remove()">×</button>
+                </div>
+                
+                <div class="export-import-tabs">
+                    <button class="tab-btn active" data-tab="export">Export</button>
+                    <button class="tab-btn" data-tab="import">Import</button>
+                </div>
+                
+                <div class="tab-content active" id="export-tab">
+                    <div class="export-options">
+                        <h4>Export Format</h4>
+                        <div class="format-options">
+                            <label class="format-option">
+                                <input type="radio" name="export-format" value="markdown" checked>
+                                <div class="format-card">
+                                    <div class="format-icon">📝</div>
+                                    <h5>Markdown</h5>
+                                    <p>Plain markdown file</p>
+                                </div>
+                            </label>
+                            <label class="format-option">
+                                <input type="radio" name="export-format" value="html">
+                                <div class="format-card">
+                                    <div class="format-icon">🌐</div>
+                                    <h5>HTML</h5>
+                                    <p>Rendered HTML file</p>
+                                </div>
+                            </label>
+                            <label class="format-option">
+                                <input type="radio" name="export-format" value="pdf">
+                                <div class="format-card">
+                                    <div class="format-icon">📄</div>
+                                    <h5>PDF</h5>
+                                    <p>Printable PDF document</p>
+                                </div>
+                            </label>
+                            <label class="format-option">
+                                <input type="radio" name="export-format" value="docx">
+                                <div class="format-card">
+                                    <div class="format-icon">📋</div>
+                                    <h5>Word</h5>
+                                    <p>Microsoft Word document</p>
+                                </div>
+                            </label>
+                        </div>
+                        
+                        <div class="export-settings">
+                            <label class="checkbox-label">
+                                <input type="checkbox" id="include-metadata" checked> Include metadata
+                            </label>
+                            <label class="checkbox-label">
+                                <input type="checkbox" id="include-styles"> Include custom styles
+                            </label>
+                        </div>
+                        
+                        <button class="btn btn-primary" onclick="this.closest('.export-import-modal').querySelector('.export-options').exportContent()">Export Content</button>
+                    </div>
+                </div>
+                
+                <div class="tab-content" id="import-tab">
+                    <div class="import-options">
+                        <h4>Import Content</h4>
+                        
+                        <div class="import-methods">
+                            <div class="import-method">
+                                <h5>📁 Upload File</h5>
+                                <input type="file" id="import-file" accept=".md,.txt,.html,.docx,.pdf" style="display: none;">
+                                <button class="btn btn-secondary" onclick="document.getElementById('import-file').click()">Choose File</button>
+                                <p>Supported: Markdown, HTML, Word, PDF</p>
+                            </div>
+                            
+                            <div class="import-method">
+                                <h5>📋 Paste Content</h5>
+                                <textarea id="import-text" placeholder="Paste your content here..." rows="6"></textarea>
+                                <button class="btn btn-secondary" onclick="this.closest('.export-import-modal').querySelector('.import-options').importFromText()">Import Text</button>
+                            </div>
+                            
+                            <div class="import-method">
+                                <h5>🔗 Import from URL</h5>
+                                <input type="url" id="import-url" placeholder="https://example.com/content" class="url-input">
+                                <button class="btn btn-secondary" onclick="this.closest('.export-import-modal').querySelector('.import-options').importFromURL()">Import from URL</button>
+                            </div>
+                        </div>
+                        
+                        <div class="import-settings">
+                            <label class="checkbox-label">
+                                <input type="checkbox" id="replace-content"> Replace current content
+                            </label>
+                            <label class="checkbox-label">
+                                <input type="checkbox" id="preserve-formatting" checked> Preserve formatting
+                            </label>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        `;document.body.appendChild(modal);this.setupExportImportTabs(modal);this.setupFileImport(modal);modal.addEventListener('click',(e)=>{if(e.target===modal){modal.remove();}});},setupExportImportTabs(modal){const tabs=modal.querySelectorAll('.tab-btn');const contents=modal.querySelectorAll('.tab-content');tabs.forEach(tab=>{tab.addEventListener('click',()=>{const targetTab=tab.dataset.tab;tabs.forEach(t=>t.classList.remove('active'));tab.classList.add('active');contents.forEach(content=>{content.classList.remove('active');if(content.id===`${targetTab}-tab`){content.classList.add('active');}});});});},setupFileImport(modal){const fileInput=modal.querySelector('#import-file');fileInput.addEventListener('change',(e)=>{const file=e.target.files[0];if(file){this.handleFileImport(file);}});},exportContent(){const format=document.querySelector('input[name="export-format"]:checked').value;const includeMetadata=document.getElementById('include-metadata').checked;const includeStyles=document.getElementById('include-styles').checked;const content=this.textarea.value;let exportData='';let filename='content';let mimeType='text/plain';switch(format){case'markdown':exportData=this.exportAsMarkdown(content,includeMetadata);filename+='.md';break;case'html':exportData=this.exportAsHTML(content,includeStyles);filename+='.html';mimeType='text/html';break;case'pdf':this.exportAsPDF(content,includeStyles);return;case'docx':this.exportAsDOCX(content,includeStyles);return;}
+const blob=new Blob([exportData],{type:mimeType});const url=URL.createObjectURL(blob);const a=document.createElement('a');a.href=url;a.download=filename;document.body.appendChild(a);a.click();document.body.removeChild(a);URL.revokeObjectURL(url);this.showNotification('Content exported successfully!','success');},exportAsMarkdown(content,includeMetadata){let markdown=content;if(includeMetadata){const metadata=`---
+title: Exported Content
+date: ${new Date().toISOString()}
+exported_from: Meditor
+---
+
+`;markdown=metadata+markdown;}
+return markdown;},exportAsHTML(content,includeStyles){const htmlContent=this.markdownToHTML(content);const styles=includeStyles?this.getCustomStyles():'';return`<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Exported Content</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            line-height: 1.6;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            color: #333;
+        }
+        ${styles}
+    </style>
+</head>
+<body>
+    ${htmlContent}
+</body>
+</html>`;},getCustomStyles(){return`
+        h1, h2, h3, h4, h5, h6 {
+            margin-top: 1.5em;
+            margin-bottom: 0.5em;
+            font-weight: 600;
+        }
+        h1 { font-size: 2.5em; }
+        h2 { font-size: 2em; }
+        h3 { font-size: 1.5em; }
+        p { margin-bottom: 1em; }
+        code { 
+            background: #f4f4f4;
+            padding: 2px 4px;
+            border-radius: 3px;
+            font-family: 'Courier New', monospace;
+        }
+        pre { 
+            background: #f8f8f8;
+            padding: 15px;
+            border-radius: 5px;
+            overflow-x: auto;
+            border-left: 4px solid #007acc;
+        }
+        blockquote {
+            border-left: 4px solid #ddd;
+            margin: 0;
+            padding-left: 20px;
+            color: #666;
+        }
+        ul, ol { padding-left: 20px; }
+        img { max-width: 100%; height: auto; }
+        table {
+            border-collapse: collapse;
+            width: 100%;
+            margin: 1em 0;
+        }
+        th, td {
+            border: 1px solid #ddd;
+            padding: 8px 12px;
+            text-align: left;
+        }
+        th { background: #f8f8f8; }
+        `;},exportAsPDF(content,includeStyles){const htmlContent=this.exportAsHTML(content,includeStyles);const printWindow=window.open('','_blank');printWindow.document.write(htmlContent);printWindow.document.close();printWindow.onload=()=>{printWindow.print();printWindow.close();};this.showNotification('PDF export opened in print dialog','info');},exportAsDOCX(content,includeStyles){const htmlContent=this.exportAsHTML(content,includeStyles);const blob=new Blob([htmlContent],{type:'text/html'});const url=URL.createObjectURL(blob);const a=document.createElement('a');a.href=url;a.download='content.html';document.body.appendChild(a);a.click();document.body.removeChild(a);URL.revokeObjectURL(url);this.showNotification('HTML file created - open in Word to convert to DOCX','info');},handleFileImport(file){const reader=new FileReader();reader.onload=(e)=>{const content=e.target.result;this.importContent(content,file.name);};reader.readAsText(file);},importFromText(){const text=document.getElementById('import-text').value;if(text.trim()){this.importContent(text,'pasted content');}},importFromURL(){const url=document.getElementById('import-url').value;if(url){this.showNotification('Importing from URL...','info');this.showNotification('URL import requires backend implementation','warning');}},importContent(content,source){const replaceContent=document.getElementById('replace-content').checked;const preserveFormatting=document.getElementById('preserve-formatting').checked;if(replaceContent){this.textarea.value=content;}else{const currentContent=this.textarea.value;const separator=currentContent&&currentContent.trim()?'\n\n':'';this.textarea.value=currentContent+separator+content;}
+this.textarea.dispatchEvent(new Event('input'));this.showNotification(`Content imported from ${source}`,'success');document.querySelector('.export-import-modal').remove();}};
\ No newline at end of file
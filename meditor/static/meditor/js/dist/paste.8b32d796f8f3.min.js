@@ -0,0 +1,3 @@
+export default{async convertHtmlToMarkdown(htmlContent){try{const response=await fetch('/meditor/html2md/',{method:'POST',headers:{'Content-Type':'application/json','X-CSRFToken':this.getCsrfToken()},body:JSON.stringify({html:htmlContent})});const data=await response.json();if(data.success){this.insertAtCursor(data.markdown.trim());this.showNotification(`HTML converted to Markdown in ${Math.round(data.conversion_ms)}ms`,'success');return;}
+console.warn('Server HTML conversion failed, converting locally:',data.error);}catch(error){console.warn('Server HTML conversion failed, converting locally:',error);}
+this.convertHtmlToMarkdownLocally(htmlContent);},convertHtmlToMarkdownLocally(htmlContent){try{let markdown=htmlContent.replace(/<h1[^>]*>(.*?)<\/h1>/gi,'# $1\n').replace(/<h2[^>]*>(.*?)<\/h2>/gi,'## $1\n').replace(/<h3[^>]*>(.*?)<\/h3>/gi,'### $1\n').replace(/<strong[^>]*>(.*?)<\/strong>/gi,'**$1**').replace(/<b[^>]*>(.*?)<\/b>/gi,'**$1**').replace(/<em[^>]*>(.*?)<\/em>/gi,'*$1*').replace(/<i[^>]*>(.*?)<\/i>/gi,'*$1*').replace(/<p[^>]*>(.*?)<\/p>/gi,'$1\n\n').replace(/<br\s*\/?>/gi,'\n').replace(/<ul[^>]*>(.*?)<\/ul>/gis,(match,content)=>{return content.replace(/<li[^>]*>(.*?)<\/li>/gi,'- $1\n');}).replace(/<ol[^>]*>(.*?)<\/ol>/gis,(match,content)=>{let counter=1;return content.replace(/<li[^>]*>(.*?)<\/li>/gi,()=>`${counter++}. $1\n`);}).replace(/<a[^>]*href="([^"]*)"[^>]*>(.*?)<\/a>/gi,'[$2]($1)').replace(/<img[^>]*src="([^"]*)"[^>]*alt="([^"]*)"[^>]*>/gi,'![$2]($1)').replace(/<code[^>]*>(.*?)<\/code>/gi,'`$1`').replace(/<pre[^>]*>(.*?)<\/pre>/gis,'```\n$1\n```').replace(/<blockquote[^>]*>(.*?)<\/blockquote>/gis,'> $1\n').replace(/<[^>]*>/g,'').trim();this.insertAtCursor(markdown);this.showNotification('HTML converted to Markdown!','success');}catch(error){this.showNotification('Error converting HTML: '+error.message,'error');}}};
\ No newline at end of file
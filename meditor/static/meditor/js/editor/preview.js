@@ -0,0 +1,397 @@
+// Rich Markdown Editor: Rendered previews: inline, fullscreen and site-styled
+// Loaded on first use; these methods are added to RichMarkdownEditor.prototype
+export default {
+    updatePreview() {
+        this.renderServerPreview(this.previewContent).catch(error => {
+            console.error('Server preview failed, using local preview:', error);
+            this.previewContent.innerHTML = this.convertMarkdownToHtml(this.textarea.value);
+            this.highlightCode(this.previewContent);
+        });
+    },
+    
+    highlightCode(container) {
+        if (typeof hljs !== 'undefined') {
+            container.querySelectorAll('pre code').forEach(block => {
+                hljs.highlightElement(block);
+            });
+        }
+    },
+    
+    async renderServerPreview(container) {
+        // Render through the server pipeline, fetching HTML only for changed blocks
+        const sequence = (Number(container.dataset.previewSequence) || 0) + 1;
+        container.dataset.previewSequence = sequence;
+        
+        const known = Array.from(container.querySelectorAll(':scope > .preview-block'))
+            .map(el => el.dataset.blockId);
+        
+        const response = await fetch('/meditor/preview/blocks/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': this.getCsrfToken()
+            },
+            body: JSON.stringify({
+                content: this.textarea.value,
+                known: known
+            })
+        });
+        
+        if (!response.ok) {
+            throw new Error('HTTP ' + response.status);
+        }
+        
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error);
+        }
+        
+        // A newer request was sent while this one was in flight
+        if (String(sequence) !== container.dataset.previewSequence) {
+            return;
+        }
+        
+        this.applyPreviewBlocks(container, data.blocks);
+    },
+    
+    applyPreviewBlocks(container, blocks) {
+        const existing = new Map();
+        container.querySelectorAll(':scope > .preview-block').forEach(el => {
+            if (!existing.has(el.dataset.blockId)) {
+                existing.set(el.dataset.blockId, []);
+            }
+            existing.get(el.dataset.blockId).push(el);
+        });
+        
+        // First element placed for each id, to copy when a block repeats
+        const placed = new Map();
+        const nodes = blocks.map(block => {
+            const reusable = existing.get(block.id);
+            if (reusable && reusable.length) {
+                const el = reusable.shift();
+                if (!placed.has(block.id)) {
+                    placed.set(block.id, el);
+                }
+                return el;
+            }
+            if (block.html === undefined && placed.has(block.id)) {
+                // The server sends a known block's id only, even when it repeats
+                return placed.get(block.id).cloneNode(true);
+            }
+            const el = document.createElement('div');
+            el.className = 'preview-block';
+            el.dataset.blockId = block.id;
+            el.innerHTML = block.html || '';
+            this.highlightCode(el);
+            if (!placed.has(block.id)) {
+                placed.set(block.id, el);
+            }
+            return el;
+        });
+        
+        container.replaceChildren(...nodes);
+    },
+    
+    async getPreviewHtml() {
+        // Detached container so full-page previews also reuse unchanged blocks
+        if (!this.previewBlocks) {
+            this.previewBlocks = document.createElement('div');
+        }
+        try {
+            await this.renderServerPreview(this.previewBlocks);
+            return Array.from(this.previewBlocks.children).map(el => el.innerHTML).join('\n');
+        } catch (error) {
+            console.error('Server preview failed, using local preview:', error);
+            return this.convertMarkdownToHtml(this.textarea.value);
+        }
+    },
+    
+    async showFullscreenPreview(fullscreenWindow = this.openPreviewWindow()) {
+        const htmlContent = await this.getPreviewHtml();
+        
+        fullscreenWindow.document.write(`
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <meta charset="UTF-8">
+                <meta name="viewport" content="width=device-width, initial-scale=1.0">
+                <title>Fullscreen Preview</title>
+                <style>
+                    body { 
+                        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                        line-height: 1.6;
+                        color: #333;
+                        margin: 0;
+                        padding: 40px;
+                        background: #fff;
+                    }
+                    h1, h2, h3, h4, h5, h6 { 
+                        margin-top: 1.5em;
+                        margin-bottom: 0.5em;
+                        font-weight: 600;
+                    }
+                    h1 { font-size: 2.5em; }
+                    h2 { font-size: 2em; }
+                    h3 { font-size: 1.5em; }
+                    p { margin-bottom: 1em; }
+                    code { 
+                        background: #f4f4f4;
+                        padding: 2px 4px;
+                        border-radius: 3px;
+                        font-family: 'Courier New', monospace;
+                    }
+                    pre { 
+                        background: #f8f8f8;
+                        padding: 15px;
+                        border-radius: 5px;
+                        overflow-x: auto;
+                        border-left: 4px solid #007acc;
+                    }
+                    blockquote {
+                        border-left: 4px solid #ddd;
+                        margin: 0;
+                        padding-left: 20px;
+                        color: #666;
+                    }
+                    ul, ol { padding-left: 20px; }
+                    img { max-width: 100%; height: auto; }
+                    table {
+                        border-collapse: collapse;
+                        width: 100%;
+                        margin: 1em 0;
+                    }
+                    th, td {
+                        border: 1px solid #ddd;
+                        padding: 8px 12px;
+                        text-align: left;
+                    }
+                    th { background: #f8f8f8; }
+                </style>
+            </head>
+            <body>
+                ${htmlContent}
+            </body>
+            </html>
+        `);
+        fullscreenWindow.document.close();
+    },
+    
+    async openSitePreview(previewWindow = this.openPreviewWindow()) {
+        // For unsaved content, create a simple HTML preview
+        const title = this.getTitleFromContent();
+        
+        // The window shows the content styled like the site
+        const htmlContent = await this.getPreviewHtml();
+        previewWindow.document.write(`
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <meta charset="UTF-8">
+                <meta name="viewport" content="width=device-width, initial-scale=1.0">
+                <title>${title} - Preview</title>
+                <style>
+                    body { 
+                        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                        line-height: 1.6;
+                        color: #333;
+                        margin: 0;
+                        padding: 0;
+                        background: #fff;
+                    }
+                    .preview-header {
+                        background: #f8f9fa;
+                        border-bottom: 1px solid #dee2e6;
+                        padding: 20px;
+                        text-align: center;
+                    }
+                    .preview-header h1 {
+                        margin: 0;
+                        color: #495057;
+                        font-size: 1.5em;
+                    }
+                    .preview-content {
+                        max-width: 800px;
+                        margin: 0 auto;
+                        padding: 40px 20px;
+                    }
+                    h1, h2, h3, h4, h5, h6 { 
+                        margin-top: 1.5em;
+                        margin-bottom: 0.5em;
+                        font-weight: 600;
+                        color: #212529;
+                    }
+                    h1 { font-size: 2.5em; }
+                    h2 { font-size: 2em; }
+                    h3 { font-size: 1.5em; }
+                    p { margin-bottom: 1em; }
+                    code { 
+                        background: #f4f4f4;
+                        padding: 2px 4px;
+                        border-radius: 3px;
+                        font-family: 'Courier New', monospace;
+                        font-size: 0.9em;
+                    }
+                    pre { 
+                        background: #f8f8f8;
+                        padding: 15px;
+                        border-radius: 5px;
+                        overflow-x: auto;
+                        border-left: 4px solid #007acc;
+                        margin: 1em 0;
+                    }
+                    pre code {
+                        background: none;
+                        padding: 0;
+                        border-radius: 0;
+                    }
+                    blockquote {
+                        border-left: 4px solid #ddd;
+                        margin: 1em 0;
+                        padding-left: 20px;
+                        color: #666;
+                        font-style: italic;
+                    }
+                    ul, ol { 
+                        padding-left: 20px;
+                        margin: 1em 0;
+                    }
+                    li {
+                        margin-bottom: 0.5em;
+                    }
+                    img { 
+                        max-width: 100%; 
+                        height: auto;
+                        border-radius: 4px;
+                        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+                    }
+                    table {
+                        border-collapse: collapse;
+                        width: 100%;
+                        margin: 1em 0;
+                        border: 1px solid #dee2e6;
+                    }
+                    th, td {
+                        border: 1px solid #dee2e6;
+                        padding: 8px 12px;
+                        text-align: left;
+                    }
+                    th { 
+                        background: #f8f8f8;
+                        font-weight: 600;
+                    }
+                    a {
+                        color: #007bff;
+                        text-decoration: none;
+                    }
+                    a:hover {
+                        text-decoration: underline;
+                    }
+                    hr {
+                        border: none;
+                        border-top: 1px solid #dee2e6;
+                        margin: 2em 0;
+                    }
+                    .preview-notice {
+                        background: #fff3cd;
+                        border: 1px solid #ffeaa7;
+                        color: #856404;
+                        padding: 10px;
+                        border-radius: 4px;
+                        margin-bottom: 20px;
+                        text-align: center;
+                    }
+                </style>
+            </head>
+            <body>
+                <div class="preview-header">
+                    <h1>${title}</h1>
+                    <div class="preview-notice">📝 This is a preview of unsaved content</div>
+                </div>
+                <div class="preview-content">
+                    ${htmlContent}
+                </div>
+            </body>
+            </html>
+        `);
+        previewWindow.document.close();
+        
+        this.showNotification('Preview opened in new tab', 'success');
+    },
+    
+    getTitleFromContent() {
+        const lines = this.textarea.value.split('\n');
+        for (let line of lines) {
+            line = line.trim();
+            if (line.startsWith('# ')) {
+                return line.substring(2);
+            }
+        }
+        return 'Untitled';
+    },
+    
+    getPreviewUrl() {
+        // For saved posts, we could return the actual preview URL
+        // For now, we'll use the form submission approach
+        return null;
+    },
+    
+    convertMarkdownToHtml(markdownText) {
+        // Simple markdown to HTML conversion
+        let html = markdownText
+            // Headers
+            .replace(/^### (.*$)/gim, '<h3>$1</h3>')
+            .replace(/^## (.*$)/gim, '<h2>$1</h2>')
+            .replace(/^# (.*$)/gim, '<h1>$1</h1>')
+            
+            // Bold and italic
+            .replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>')
+            .replace(/\*(.*?)\*/g, '<em>$1</em>')
+            .replace(/__(.*?)__/g, '<strong>$1</strong>')
+            .replace(/_(.*?)_/g, '<em>$1</em>')
+            
+            // Strikethrough
+            .replace(/~~(.*?)~~/g, '<del>$1</del>')
+            
+            // Code
+            .replace(/`(.*?)`/g, '<code>$1</code>')
+            
+            // Code blocks
+            .replace(/```([\s\S]*?)```/g, '<pre><code>$1</code></pre>')
+            
+            // Links (with target="_blank")
+            .replace(/\[([^\]]+)\]\(([^)]+)\)/g, '<a href="$2" target="_blank" rel="noopener noreferrer">$1</a>')
+            
+            // Images
+            .replace(/!\[([^\]]*)\]\(([^)]+)\)/g, '<img src="$2" alt="$1">')
+            
+            // Lists
+            .replace(/^\* (.*$)/gim, '<li>$1</li>')
+            .replace(/^- (.*$)/gim, '<li>$1</li>')
+            .replace(/^(\d+)\. (.*$)/gim, '<li>$2</li>')
+            
+            // Wrap lists
+            .replace(/(<li>.*<\/li>)/gs, '<ul>$1</ul>')
+            
+            // Blockquotes
+            .replace(/^> (.*$)/gim, '<blockquote>$1</blockquote>')
+            
+            // Horizontal rules
+            .replace(/^---$/gim, '<hr>')
+            .replace(/^\*\*\*$/gim, '<hr>')
+            
+            // Paragraphs
+            .replace(/\n\n/g, '</p><p>')
+            .replace(/^(.+)$/gm, '<p>$1</p>')
+            
+            // Clean up empty paragraphs
+            .replace(/<p><\/p>/g, '')
+            .replace(/<p>(<h[1-6]>.*<\/h[1-6]>)<\/p>/g, '$1')
+            .replace(/<p>(<ul>.*<\/ul>)<\/p>/g, '$1')
+            .replace(/<p>(<ol>.*<\/ol>)<\/p>/g, '$1')
+            .replace(/<p>(<blockquote>.*<\/blockquote>)<\/p>/g, '$1')
+            .replace(/<p>(<hr>)<\/p>/g, '$1')
+            .replace(/<p>(<pre>.*<\/pre>)<\/p>/g, '$1');
+        
+        return html;
+    }
+};
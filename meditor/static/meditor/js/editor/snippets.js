@@ -0,0 +1,313 @@
+// Rich Markdown Editor: Snippet library: browsing, searching and saving snippets
+// Loaded on first use; these methods are added to RichMarkdownEditor.prototype
+export default {
+    async showSnippetsLibrary() {
+        const modal = document.createElement('div');
+        modal.className = 'meditor-modal';
+        modal.innerHTML = `
+            <div class="modal-content">
+                <div class="modal-header">
+                    <h3>📚 Snippets Library</h3>
+                    <button class="close-btn" onclick="this.closest('.meditor-modal').remove()">×</button>
+                </div>
+                <div class="modal-body">
+                    <input type="search" class="form-control snippet-search" placeholder="Search snippets...">
+                    <div class="snippets-container">
+                        <div class="snippets-list">
+                            <div class="loading">Loading snippets...</div>
+                        </div>
+                        <div class="snippet-preview">
+                            <h4>Preview</h4>
+                            <div class="preview-content"></div>
+                        </div>
+                    </div>
+                </div>
+                <div class="modal-footer">
+                    <button class="btn btn-secondary" onclick="this.closest('.meditor-modal').remove()">Cancel</button>
+                    <button class="btn btn-primary insert-snippet-btn" disabled>Insert Snippet</button>
+                </div>
+            </div>
+        `;
+        
+        document.body.appendChild(modal);
+        
+        // Load snippets
+        const snippetsList = modal.querySelector('.snippets-list');
+        const previewContent = modal.querySelector('.preview-content');
+        const insertBtn = modal.querySelector('.insert-snippet-btn');
+        let selectedSnippet = null;
+        
+        try {
+            const snippetsHtml = await this.getSnippetsList();
+            snippetsList.innerHTML = snippetsHtml;
+        } catch (error) {
+            snippetsList.innerHTML = '<div class="error">Error loading snippets</div>';
+        }
+        
+        // Search on the server as the user types
+        const searchInput = modal.querySelector('.snippet-search');
+        let searchTimeout = null;
+        let searchSequence = 0;
+        searchInput.addEventListener('input', () => {
+            clearTimeout(searchTimeout);
+            searchTimeout = setTimeout(async () => {
+                const sequence = ++searchSequence;
+                const resultsHtml = await this.getSnippetsList(null, searchInput.value.trim());
+                // Ignore responses that arrive after a newer search
+                if (sequence === searchSequence) {
+                    snippetsList.innerHTML = resultsHtml;
+                }
+            }, 200);
+        });
+        
+        // Handle snippet selection
+        snippetsList.addEventListener('click', async (e) => {
+            const loadMore = e.target.closest('.load-more-snippets');
+            if (loadMore) {
+                loadMore.disabled = true;
+                const moreHtml = await this.getSnippetsList(loadMore.dataset.cursor, loadMore.dataset.query);
+                loadMore.remove();
+                snippetsList.insertAdjacentHTML('beforeend', moreHtml);
+                return;
+            }
+            
+            const snippetItem = e.target.closest('.snippet-item');
+            if (snippetItem) {
+                // Remove previous selection
+                snippetsList.querySelectorAll('.snippet-item').forEach(item => {
+                    item.classList.remove('selected');
+                });
+                
+                // Select current item
+                snippetItem.classList.add('selected');
+                insertBtn.disabled = true;
+                selectedSnippet = snippetItem.dataset.snippet;
+                if (selectedSnippet === undefined) {
+                    // Server snippets are listed without content; fetch it on demand
+                    previewContent.textContent = 'Loading...';
+                    selectedSnippet = await this.getSnippetContent(snippetItem.dataset.id);
+                    if (!snippetItem.classList.contains('selected')) {
+                        return;
+                    }
+                }
+                
+                // Show preview
+                previewContent.textContent = selectedSnippet || 'Could not load snippet';
+                insertBtn.disabled = !selectedSnippet;
+            }
+        });
+        
+        // Handle insert
+        insertBtn.addEventListener('click', () => {
+            if (selectedSnippet) {
+                this.insertAtCursor(selectedSnippet);
+                modal.remove();
+                this.showNotification('Snippet inserted!', 'success');
+            }
+        });
+    },
+    
+    async getSnippetsList(cursor = null, query = '') {
+        try {
+            // Fetch one page of snippets (or search results) from Django backend
+            const params = new URLSearchParams();
+            if (query) {
+                params.set('q', query);
+            }
+            if (cursor) {
+                params.set('cursor', cursor);
+            }
+            const url = `/meditor/snippets/${query ? 'search/' : ''}?${params}`;
+            const response = await fetch(url, {
+                method: 'GET',
+                headers: {
+                    'X-Requested-With': 'XMLHttpRequest',
+                    'X-CSRFToken': this.getCsrfToken()
+                }
+            });
+            
+            if (response.ok) {
+                const data = await response.json();
+                if (data.success && data.snippets) {
+                    return this.renderSnippetsList(data.snippets, data.next_cursor, Boolean(cursor), query);
+                }
+            }
+            
+            // Fallback to default snippets if API fails
+            this.showNotification('Could not load snippets from server, using defaults', 'warning');
+            return this.getDefaultSnippetsList();
+            
+        } catch (error) {
+            console.error('Error loading snippets:', error);
+            this.showNotification('Could not load snippets from server, using defaults', 'warning');
+            return this.getDefaultSnippetsList();
+        }
+    },
+    
+    async getSnippetContent(snippetId) {
+        this.snippetContentCache = this.snippetContentCache || new Map();
+        if (this.snippetContentCache.has(snippetId)) {
+            return this.snippetContentCache.get(snippetId);
+        }
+        try {
+            const response = await fetch(`/meditor/snippets/${snippetId}/`, {
+                headers: { 'X-Requested-With': 'XMLHttpRequest' }
+            });
+            const data = await response.json();
+            if (data.success) {
+                this.snippetContentCache.set(snippetId, data.snippet.content);
+                return data.snippet.content;
+            }
+        } catch (error) {
+            console.error('Error loading snippet:', error);
+        }
+        return null;
+    },
+    
+    renderSnippetsList(snippets, nextCursor = null, isNextPage = false, query = '') {
+        const loadMore = nextCursor
+            ? `<button type="button" class="btn btn-secondary load-more-snippets" data-cursor="${nextCursor}" data-query="${query.replace(/"/g, '&quot;')}">Load more</button>`
+            : '';
+        if (snippets.length === 0 && query && !isNextPage) {
+            return '<div class="no-snippets"><p>No snippets match your search.</p></div>';
+        }
+        if (snippets.length === 0 && !isNextPage) {
+            return `
+                <div class="no-snippets">
+                    <p>No snippets found. Create your first snippet!</p>
+                </div>
+            `;
+        }
+        
+        return snippets.map(snippet => `
+            <div class="snippet-item" data-id="${snippet.id}">
+                <div class="snippet-header">
+                    <div class="snippet-name">${snippet.name}</div>
+                    <div class="snippet-category">${snippet.category || 'General'}</div>
+                </div>
+                <div class="snippet-preview-text">${snippet.preview}</div>
+                <div class="snippet-meta">
+                    <small>${snippet.is_owner ? 'Your snippet' : 'Public snippet'}</small>
+                </div>
+            </div>
+        `).join('') + loadMore;
+    },
+    
+    getDefaultSnippetsList() {
+        const snippets = [
+            { name: 'Code Block', content: '```\n// Your code here\n```' },
+            { name: 'Link', content: '[Link Text](https://example.com)' },
+            { name: 'Image', content: '![Alt Text](image-url.jpg)' },
+            { name: 'Blockquote', content: '> This is a blockquote' },
+            { name: 'Table', content: '| Header 1 | Header 2 |\n|----------|----------|\n| Cell 1   | Cell 2   |' },
+            { name: 'Horizontal Rule', content: '---' },
+            { name: 'Task List', content: '- [ ] Task 1\n- [x] Task 2' },
+            { name: 'Footnote', content: 'Here is a sentence with a footnote[^1].\n\n[^1]: This is the footnote.' }
+        ];
+        
+        return snippets.map(snippet => `
+            <div class="snippet-item" data-snippet="${snippet.content.replace(/"/g, '&quot;')}">
+                <div class="snippet-name">${snippet.name}</div>
+                <div class="snippet-preview-text">${snippet.content.substring(0, 50)}${snippet.content.length > 50 ? '...' : ''}</div>
+            </div>
+        `).join('');
+    },
+    
+    showSaveSnippetModal() {
+        const modal = document.createElement('div');
+        modal.className = 'meditor-modal';
+        modal.innerHTML = `
+            <div class="modal-content">
+                <div class="modal-header">
+                    <h3>💾 Save as Snippet</h3>
+                    <button class="close-btn" onclick="this.closest('.meditor-modal').remove()">×</button>
+                </div>
+                <div class="modal-body">
+                    <div class="form-group">
+                        <label for="snippet-name">Snippet Name:</label>
+                        <input type="text" id="snippet-name" class="form-control" placeholder="Enter snippet name">
+                    </div>
+                    <div class="form-group">
+                        <label for="snippet-category">Category (optional):</label>
+                        <input type="text" id="snippet-category" class="form-control" placeholder="e.g., Code, Templates, etc.">
+                    </div>
+                    <div class="form-group">
+                        <label>
+                            <input type="checkbox" id="snippet-public"> Make this snippet public (available to all users)
+                        </label>
+                    </div>
+                    <div class="form-group">
+                        <label for="snippet-content">Content:</label>
+                        <textarea id="snippet-content" class="form-control" rows="6" readonly>${this.textarea.value}</textarea>
+                    </div>
+                </div>
+                <div class="modal-footer">
+                    <button class="btn btn-secondary" onclick="this.closest('.meditor-modal').remove()">Cancel</button>
+                    <button class="btn btn-primary save-snippet-btn">Save Snippet</button>
+                </div>
+            </div>
+        `;
+        
+        document.body.appendChild(modal);
+        
+        // Handle save
+        const saveBtn = modal.querySelector('.save-snippet-btn');
+        const nameInput = modal.querySelector('#snippet-name');
+        const categoryInput = modal.querySelector('#snippet-category');
+        const publicCheckbox = modal.querySelector('#snippet-public');
+        
+        saveBtn.addEventListener('click', async () => {
+            const name = nameInput.value.trim();
+            const content = this.textarea.value;
+            const category = categoryInput.value.trim();
+            const isPublic = publicCheckbox.checked;
+            
+            if (name && content) {
+                saveBtn.disabled = true;
+                saveBtn.textContent = 'Saving...';
+                
+                await this.saveSnippet(name, content, category, isPublic);
+                
+                saveBtn.disabled = false;
+                saveBtn.textContent = 'Save Snippet';
+                modal.remove();
+            } else {
+                this.showNotification('Please enter a name for the snippet', 'error');
+            }
+        });
+    },
+    
+    async saveSnippet(name, content, category = '', isPublic = false) {
+        try {
+            const response = await fetch('/meditor/snippets/save/', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-Requested-With': 'XMLHttpRequest',
+                    'X-CSRFToken': this.getCsrfToken()
+                },
+                body: JSON.stringify({
+                    name: name,
+                    content: content,
+                    category: category,
+                    is_public: isPublic
+                })
+            });
+            
+            if (response.ok) {
+                const data = await response.json();
+                if (data.success) {
+                    this.showNotification('Snippet saved successfully!', 'success');
+                    return data.snippet;
+                } else {
+                    this.showNotification('Failed to save snippet: ' + data.error, 'error');
+                }
+            } else {
+                this.showNotification('Failed to save snippet: HTTP ' + response.status, 'error');
+            }
+        } catch (error) {
+            console.error('Error saving snippet:', error);
+            this.showNotification('Failed to save snippet: ' + error.message, 'error');
+        }
+    }
+};
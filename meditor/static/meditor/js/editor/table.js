@@ -0,0 +1,293 @@
+// Rich Markdown Editor: Table builder
+// Loaded on first use; these methods are added to RichMarkdownEditor.prototype
+export default {
+    insertTable() {
+        this.showTableBuilder();
+    },
+    
+    showTableBuilder() {
+        // Remove any existing modal
+        document.querySelectorAll('.table-builder-modal').forEach(m => m.remove());
+
+        const modal = document.createElement('div');
+        modal.className = 'table-builder-modal';
+        modal.innerHTML = `
+            <div class="table-builder-content" style="max-width:400px;">
+                <div class="table-builder-header">
+                    <h3>Insert Table</h3>
+                    <button class="close-modal" onclick="this.closest('.table-builder-modal').remove()">×</button>
+                </div>
+                <div class="table-controls" style="margin-bottom:16px;">
+                    <label>Rows: <input type="number" id="table-rows" value="3" min="2" max="20" style="width:60px;"></label>
+                    <label style="margin-left:12px;">Columns: <input type="number" id="table-cols" value="3" min="2" max="10" style="width:60px;"></label>
+                    <button class="btn btn-primary" id="update-table-btn" style="margin-left:12px;">Update</button>
+                </div>
+                <div class="table-editor">
+                    <div class="table-container" id="table-container"></div>
+                </div>
+                <div style="text-align:right;margin-top:18px;">
+                    <button class="btn btn-secondary" onclick="this.closest('.table-builder-modal').remove()">Cancel</button>
+                    <button class="btn btn-primary" id="insert-table-btn">Insert Table</button>
+                </div>
+            </div>
+        `;
+        document.body.appendChild(modal);
+
+        // Minimal table editor logic
+        const container = modal.querySelector('#table-container');
+        let rows = 3, cols = 3;
+        let data = [];
+
+        function renderTable() {
+            let html = '<table class="editable-table"><tbody>';
+            for (let i = 0; i < rows; i++) {
+                html += '<tr>';
+                for (let j = 0; j < cols; j++) {
+                    const tag = i === 0 ? 'th' : 'td';
+                    const val = (data[i] && data[i][j]) || (i === 0 ? `Header ${j+1}` : '');
+                    html += `<${tag} contenteditable="true" data-row="${i}" data-col="${j}">${val}</${tag}>`;
+                }
+                html += '</tr>';
+            }
+            html += '</tbody></table>';
+            container.innerHTML = html;
+            // Save edits
+            container.querySelectorAll('[contenteditable]').forEach(cell => {
+                cell.addEventListener('input', e => {
+                    const r = parseInt(cell.dataset.row);
+                    const c = parseInt(cell.dataset.col);
+                    if (!data[r]) data[r] = [];
+                    data[r][c] = cell.textContent;
+                });
+            });
+        }
+
+        function getMarkdown() {
+            let md = '';
+            // Header row
+            const header = [];
+            for (let j = 0; j < cols; j++) header.push((data[0] && data[0][j]) || `Header ${j+1}`);
+            md += '| ' + header.join(' | ') + ' |\n';
+            // Separator
+            md += '| ' + Array(cols).fill('---').join(' | ') + ' |\n';
+            // Data rows
+            for (let i = 1; i < rows; i++) {
+                const row = [];
+                for (let j = 0; j < cols; j++) row.push((data[i] && data[i][j]) || '');
+                md += '| ' + row.join(' | ') + ' |\n';
+            }
+            return md;
+        }
+
+        // Initial render
+        renderTable();
+
+        // Update table on input
+        modal.querySelector('#update-table-btn').onclick = () => {
+            rows = Math.max(2, Math.min(20, parseInt(modal.querySelector('#table-rows').value)));
+            cols = Math.max(2, Math.min(10, parseInt(modal.querySelector('#table-cols').value)));
+            // Resize data array
+            data = data.slice(0, rows);
+            for (let i = 0; i < rows; i++) {
+                if (!data[i]) data[i] = [];
+                data[i] = data[i].slice(0, cols);
+            }
+            renderTable();
+        };
+
+        // Insert table
+        modal.querySelector('#insert-table-btn').onclick = () => {
+            const md = getMarkdown();
+            this.insertAtCursor(md + '\n');
+            modal.remove();
+            this.showNotification('Table inserted!', 'success');
+        };
+    }
+};
+
+export class TableEditor {
+    constructor(modal) {
+        this.modal = modal;
+        this.container = modal.querySelector('#table-container');
+        this.rows = 3;
+        this.cols = 3;
+        this.data = [];
+        this.style = 'default';
+        this.color = 'blue';
+        this.features = {
+            sortable: false,
+            filterable: false,
+            paginated: false,
+            searchable: false
+        };
+    }
+    
+    init() {
+        this.updateTable();
+        this.updateColumnSettings();
+    }
+    
+    updateTable() {
+        this.rows = parseInt(this.modal.querySelector('#table-rows').value);
+        this.cols = parseInt(this.modal.querySelector('#table-cols').value);
+        
+        // Initialize data if empty
+        if (this.data.length === 0) {
+            this.data = [];
+            for (let i = 0; i < this.rows; i++) {
+                this.data[i] = [];
+                for (let j = 0; j < this.cols; j++) {
+                    this.data[i][j] = i === 0 ? `Header ${j + 1}` : `Cell ${i}-${j}`;
+                }
+            }
+        }
+        
+        this.renderTable();
+    }
+    
+    renderTable() {
+        let html = '<table class="editable-table">';
+        
+        for (let i = 0; i < this.rows; i++) {
+            html += '<tr>';
+            for (let j = 0; j < this.cols; j++) {
+                const isHeader = i === 0;
+                const tag = isHeader ? 'th' : 'td';
+                const content = this.data[i] && this.data[i][j] ? this.data[i][j] : '';
+                
+                html += `<${tag} contenteditable="true" data-row="${i}" data-col="${j}">${content}</${tag}>`;
+            }
+            html += '</tr>';
+        }
+        
+        html += '</table>';
+        this.container.innerHTML = html;
+        
+        // Add event listeners
+        this.container.querySelectorAll('[contenteditable]').forEach(cell => {
+            cell.addEventListener('input', (e) => {
+                const row = parseInt(e.target.dataset.row);
+                const col = parseInt(e.target.dataset.col);
+                if (!this.data[row]) this.data[row] = [];
+                this.data[row][col] = e.target.textContent;
+            });
+        });
+    }
+    
+    updateColumnSettings() {
+        const container = this.modal.querySelector('#column-settings');
+        let html = '';
+        
+        for (let i = 0; i < this.cols; i++) {
+            html += `
+                <div class="column-setting">
+                    <label>Column ${i + 1}:</label>
+                    <select class="column-type" data-col="${i}">
+                        <option value="text">Text</option>
+                        <option value="number">Number</option>
+                        <option value="date">Date</option>
+                        <option value="email">Email</option>
+                        <option value="url">URL</option>
+                    </select>
+                    <label class="checkbox-label">
+                        <input type="checkbox" class="column-sortable" data-col="${i}"> Sortable
+                    </label>
+                    <label class="checkbox-label">
+                        <input type="checkbox" class="column-filterable" data-col="${i}"> Filterable
+                    </label>
+                </div>
+            `;
+        }
+        
+        container.innerHTML = html;
+    }
+    
+    importCSV() {
+        const csvData = this.modal.querySelector('#csv-data').value;
+        if (!csvData.trim()) return;
+        
+        const lines = csvData.trim().split('\n');
+        this.data = lines.map(line => 
+            line.split(',').map(cell => cell.trim().replace(/^"|"$/g, ''))
+        );
+        
+        this.rows = this.data.length;
+        this.cols = this.data[0] ? this.data[0].length : 0;
+        
+        this.modal.querySelector('#table-rows').value = this.rows;
+        this.modal.querySelector('#table-cols').value = this.cols;
+        
+        this.renderTable();
+        this.updateColumnSettings();
+    }
+    
+    updateTableStyle() {
+        this.style = this.modal.querySelector('#table-style').value;
+        this.color = this.modal.querySelector('.color-option.selected')?.dataset.color || 'blue';
+        
+        // Update features
+        this.features.sortable = this.modal.querySelector('#table-sortable').checked;
+        this.features.filterable = this.modal.querySelector('#table-filterable').checked;
+        this.features.paginated = this.modal.querySelector('#table-paginated').checked;
+        this.features.searchable = this.modal.querySelector('#table-searchable').checked;
+    }
+    
+    updatePreview() {
+        const container = this.modal.querySelector('#table-preview-container');
+        const markdown = this.generateMarkdown();
+        container.innerHTML = `<div class="markdown-preview">${markdown}</div>`;
+    }
+    
+    generateMarkdown() {
+        let markdown = '';
+        
+        // Add table features if enabled
+        if (this.features.searchable || this.features.sortable || this.features.filterable) {
+            markdown += '<!-- table-features: ' + JSON.stringify(this.features) + ' -->\n';
+        }
+        
+        // Add table style
+        if (this.style !== 'default') {
+            markdown += `<!-- table-style: ${this.style} -->\n`;
+        }
+        
+        // Add color theme
+        if (this.color !== 'blue') {
+            markdown += `<!-- table-color: ${this.color} -->\n`;
+        }
+        
+        // Generate table
+        for (let i = 0; i < this.rows; i++) {
+            const row = this.data[i] || [];
+            const cells = row.map(cell => cell || '').join(' | ');
+            markdown += `| ${cells} |\n`;
+            
+            // Add header separator after first row
+            if (i === 0) {
+                const separator = row.map(() => '---').join(' | ');
+                markdown += `| ${separator} |\n`;
+            }
+        }
+        
+        return markdown;
+    }
+    
+    insertTable() {
+        const markdown = this.generateMarkdown();
+        const textarea = this.modal.closest('.rich-markdown-editor').querySelector('textarea');
+        const start = textarea.selectionStart;
+        const end = textarea.selectionEnd;
+        
+        const before = textarea.value.substring(0, start);
+        const after = textarea.value.substring(end);
+        
+        textarea.value = before + '\n\n' + markdown + '\n\n' + after;
+        textarea.focus();
+        textarea.setSelectionRange(start + markdown.length + 4, start + markdown.length + 4);
+        
+        // Trigger change event
+        textarea.dispatchEvent(new Event('input'));
+        
+        this.modal.remove();
+    }
+}
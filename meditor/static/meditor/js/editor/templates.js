@@ -0,0 +1,248 @@
+// Rich Markdown Editor: Content templates
+// Loaded on first use; these methods are added to RichMarkdownEditor.prototype
+export default {
+    showTemplateSelector() {
+        const modal = document.createElement('div');
+        modal.className = 'template-modal';
+        modal.innerHTML = `
+            <div class="template-content">
+                <div class="template-header">
+                    <h3>📋 Content Templates</h3>
+                    <button class="close-modal" onclick="this.closest('.template-modal').remove()">×</button>
+                </div>
+                <div class="template-grid">
+                    <div class="template-item" data-template="blog-post">
+                        <div class="template-icon">📝</div>
+                        <h4>Blog Post</h4>
+                        <p>Complete blog post structure</p>
+                    </div>
+                    <div class="template-item" data-template="tutorial">
+                        <div class="template-icon">📚</div>
+                        <h4>Tutorial</h4>
+                        <p>Step-by-step tutorial format</p>
+                    </div>
+                    <div class="template-item" data-template="review">
+                        <div class="template-icon">⭐</div>
+                        <h4>Review</h4>
+                        <p>Product or service review</p>
+                    </div>
+                    <div class="template-item" data-template="newsletter">
+                        <div class="template-icon">📧</div>
+                        <h4>Newsletter</h4>
+                        <p>Email newsletter format</p>
+                    </div>
+                    <div class="template-item" data-template="documentation">
+                        <div class="template-icon">📖</div>
+                        <h4>Documentation</h4>
+                        <p>Technical documentation</p>
+                    </div>
+                    <div class="template-item" data-template="meeting-notes">
+                        <div class="template-icon">📅</div>
+                        <h4>Meeting Notes</h4>
+                        <p>Meeting summary template</p>
+                    </div>
+                </div>
+            </div>
+        `;
+        
+        document.body.appendChild(modal);
+        
+        // Add click handlers
+        modal.querySelectorAll('.template-item').forEach(item => {
+            item.addEventListener('click', () => {
+                const template = item.dataset.template;
+                this.insertTemplate(template);
+                modal.remove();
+            });
+        });
+        
+        // Close on backdrop click
+        modal.addEventListener('click', (e) => {
+            if (e.target === modal) {
+                modal.remove();
+            }
+        });
+    },
+    
+    insertTemplate(template) {
+        const templates = {
+            'blog-post': `# Blog Post Title
+
+## Introduction
+Start with an engaging introduction that hooks your readers...
+
+## Main Content
+Break your content into logical sections with clear headings.
+
+### Key Points
+- Point 1
+- Point 2
+- Point 3
+
+## Conclusion
+Wrap up your post with a strong conclusion that reinforces your main message.
+
+---
+*Published on [Date] | Tags: [tag1, tag2]*`,
+            
+            'tutorial': `# Tutorial: [Title]
+
+## Prerequisites
+- Requirement 1
+- Requirement 2
+
+## Step 1: [First Step]
+Detailed instructions for the first step...
+
+## Step 2: [Second Step]
+Continue with the next step...
+
+## Step 3: [Third Step]
+Final step instructions...
+
+## Summary
+What we accomplished and next steps.
+
+## Troubleshooting
+Common issues and solutions:
+- **Problem 1**: Solution 1
+- **Problem 2**: Solution 2`,
+            
+            'review': `# Review: [Product/Service Name]
+
+## Overview
+Brief introduction to what you're reviewing...
+
+## Pros
+- ✅ Pro 1
+- ✅ Pro 2
+- ✅ Pro 3
+
+## Cons
+- ❌ Con 1
+- ❌ Con 2
+
+## Features
+| Feature | Rating | Notes |
+|---------|--------|-------|
+| Feature 1 | ⭐⭐⭐⭐⭐ | Excellent |
+| Feature 2 | ⭐⭐⭐⭐ | Good |
+| Feature 3 | ⭐⭐⭐ | Average |
+
+## Verdict
+Final recommendation and summary.
+
+**Rating: ⭐⭐⭐⭐☆ (4/5)**`,
+            
+            'newsletter': `# Newsletter - [Date]
+
+## 🎉 Welcome
+Welcome to our newsletter! Here's what's new this week...
+
+## 📰 Latest News
+- News item 1
+- News item 2
+- News item 3
+
+## 🔗 Quick Links
+- [Link 1](url1)
+- [Link 2](url2)
+- [Link 3](url3)
+
+## 📅 Upcoming Events
+- **Event 1**: Date and time
+- **Event 2**: Date and time
+
+---
+*Subscribe | Unsubscribe | Contact Us*`,
+            
+            'documentation': `# [Feature/API] Documentation
+
+## Overview
+Brief description of the feature or API...
+
+## Installation
+\`\`\`bash
+npm install package-name
+\`\`\`
+
+## Usage
+\`\`\`javascript
+const example = require('package-name');
+example.doSomething();
+\`\`\`
+
+## API Reference
+
+### Function Name
+**Description**: What this function does
+
+**Parameters**:
+- \`param1\` (type): Description
+- \`param2\` (type): Description
+
+**Returns**: Return type and description
+
+**Example**:
+\`\`\`javascript
+// Example code here
+\`\`\`
+
+## Examples
+More detailed examples...
+
+## Troubleshooting
+Common issues and solutions.`,
+            
+            'meeting-notes': `# Meeting Notes - [Topic]
+
+**Date**: [Date]  
+**Time**: [Time]  
+**Attendees**: [Names]  
+**Facilitator**: [Name]
+
+## Agenda
+1. Item 1
+2. Item 2
+3. Item 3
+
+## Discussion Points
+
+### Topic 1
+- Point discussed
+- Decision made
+- Action items
+
+### Topic 2
+- Point discussed
+- Decision made
+- Action items
+
+## Action Items
+- [ ] Task 1 - Assigned to: [Name] - Due: [Date]
+- [ ] Task 2 - Assigned to: [Name] - Due: [Date]
+
+## Next Meeting
+**Date**: [Date]  
+**Time**: [Time]  
+**Agenda**: [Topics]`
+        };
+        
+        const templateContent = templates[template];
+        if (templateContent) {
+            const textarea = this.textarea;
+            const start = textarea.selectionStart;
+            const end = textarea.selectionEnd;
+            
+            const before = textarea.value.substring(0, start);
+            const after = textarea.value.substring(end);
+            
+            textarea.value = before + templateContent + after;
+            textarea.focus();
+            textarea.setSelectionRange(start + templateContent.length, start + templateContent.length);
+            
+            // Trigger change event
+            textarea.dispatchEvent(new Event('input'));
+        }
+    }
+};
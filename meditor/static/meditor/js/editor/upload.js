@@ -0,0 +1,237 @@
+// Rich Markdown Editor: Image uploads: single, batched and chunked/resumable
+// Loaded on first use; these methods are added to RichMarkdownEditor.prototype
+export default {
+    async uploadImage(file) {
+        if (file.size > this.chunkedUploadThreshold && window.crypto && window.crypto.subtle) {
+            try {
+                this.showNotification('Uploading image...', 'info');
+                const data = await this.uploadImageChunked(file);
+                this.handleUploadResult(file, data);
+            } catch (error) {
+                console.error('Chunked upload error:', error);
+                this.showNotification('Upload failed: ' + error.message, 'error');
+            }
+            return;
+        }
+        
+        try {
+            // Create FormData
+            const formData = new FormData();
+            formData.append('image', file);
+            formData.append('csrfmiddlewaretoken', this.getCsrfToken());
+            
+            console.log('Uploading image:', file.name, 'Size:', file.size, 'Type:', file.type);
+            
+            // Show loading notification
+            this.showNotification('Uploading image...', 'info');
+            
+            // Upload to server
+            const response = await fetch('/meditor/upload-image/', {
+                method: 'POST',
+                body: formData
+            });
+            
+            console.log('Upload response status:', response.status);
+            
+            if (response.ok) {
+                const data = await response.json();
+                console.log('Upload response data:', data);
+                
+                this.handleUploadResult(file, data);
+            } else {
+                const errorText = await response.text();
+                console.error('Upload failed with status:', response.status, 'Response:', errorText);
+                this.showNotification('Upload failed: HTTP ' + response.status, 'error');
+            }
+        } catch (error) {
+            console.error('Upload error:', error);
+            this.showNotification('Upload failed: ' + error.message, 'error');
+        }
+    },
+    
+    async uploadImages(files) {
+        this.showNotification(`Uploading ${files.length} images...`, 'info');
+        
+        // Large files keep the resumable path; the rest share batch requests
+        const jobs = [];
+        let batch = [];
+        files.forEach((file, index) => {
+            if (file.size > this.chunkedUploadThreshold && window.crypto && window.crypto.subtle) {
+                jobs.push([index]);
+            } else {
+                batch.push(index);
+                if (batch.length === this.uploadBatchSize) {
+                    jobs.push(batch);
+                    batch = [];
+                }
+            }
+        });
+        if (batch.length) {
+            jobs.push(batch);
+        }
+        
+        // Markdown is inserted in drop order as soon as every earlier file is done
+        const results = new Array(files.length);
+        let nextToInsert = 0;
+        const flush = () => {
+            const lines = [];
+            while (nextToInsert < files.length && results[nextToInsert]) {
+                const data = results[nextToInsert];
+                if (data.success) {
+                    lines.push(`![${files[nextToInsert].name}](${data.url})`);
+                }
+                nextToInsert++;
+            }
+            if (lines.length) {
+                this.insertAtCursor(lines.join('\n') + '\n');
+            }
+        };
+        
+        const runJob = async (indexes) => {
+            let jobResults;
+            try {
+                if (indexes.length === 1 && files[indexes[0]].size > this.chunkedUploadThreshold) {
+                    jobResults = [await this.uploadImageChunked(files[indexes[0]])];
+                } else {
+                    jobResults = await this.sendUploadBatch(indexes.map(index => files[index]));
+                }
+            } catch (error) {
+                jobResults = indexes.map(() => ({ success: false, error: error.message }));
+            }
+            indexes.forEach((index, position) => {
+                results[index] = jobResults[position] || { success: false, error: 'No result returned' };
+            });
+            flush();
+        };
+        
+        const worker = async () => {
+            while (jobs.length) {
+                await runJob(jobs.shift());
+            }
+        };
+        await Promise.all(Array.from({ length: Math.min(this.uploadConcurrency, jobs.length) }, worker));
+        
+        if (this.livePreviewEnabled) {
+            this.updateLivePreview();
+        }
+        const failed = results.filter(data => !data.success);
+        if (failed.length) {
+            console.error('Failed uploads:', failed);
+            this.showNotification(`${files.length - failed.length} of ${files.length} images uploaded. First error: ${failed[0].error}`, 'error');
+        } else {
+            this.showNotification(`${files.length} images uploaded successfully!`, 'success');
+        }
+    },
+    
+    async sendUploadBatch(files) {
+        const formData = new FormData();
+        files.forEach(file => formData.append('images', file));
+        formData.append('csrfmiddlewaretoken', this.getCsrfToken());
+        
+        const response = await fetch('/meditor/upload-images/', {
+            method: 'POST',
+            body: formData
+        });
+        const data = await response.json().catch(() => ({}));
+        if (!response.ok || !data.success) {
+            throw new Error(data.error || `HTTP ${response.status}`);
+        }
+        return data.results;
+    },
+    
+    handleUploadResult(file, data) {
+        if (data.success) {
+            // Insert image markdown only on successful upload
+            const imageMarkdown = `![${file.name}](${data.url})`;
+            this.insertAtCursor(imageMarkdown);
+            
+            // Update live preview if enabled
+            if (this.livePreviewEnabled) {
+                this.updateLivePreview();
+            }
+            
+            // Show success notification
+            this.showNotification('Image uploaded successfully!', 'success');
+        } else {
+            this.showNotification('Upload failed: ' + data.error, 'error');
+        }
+    },
+    
+    async uploadImageChunked(file) {
+        const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+        const sha256 = Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+        const resumeKey = `meditor_upload_${sha256}`;
+        const headers = { 'X-CSRFToken': this.getCsrfToken() };
+        
+        // Resume an interrupted upload of the same file if the server still has it
+        let upload = null;
+        const savedId = localStorage.getItem(resumeKey);
+        if (savedId) {
+            const response = await fetch(`/meditor/uploads/${savedId}/`, { headers });
+            if (response.ok) {
+                upload = await response.json();
+                console.log('Resuming upload:', savedId, upload.received.length, 'chunks already sent');
+            }
+        }
+        if (!upload) {
+            const response = await fetch('/meditor/uploads/', {
+                method: 'POST',
+                headers: { ...headers, 'Content-Type': 'application/json' },
+                body: JSON.stringify({ filename: file.name, size: file.size, sha256 })
+            });
+            upload = await response.json();
+            if (!upload.success) {
+                throw new Error(upload.error);
+            }
+            localStorage.setItem(resumeKey, upload.upload_id);
+        }
+        
+        const received = new Set(upload.received);
+        const pending = [];
+        for (let offset = 0; offset < file.size; offset += upload.chunk_size) {
+            if (!received.has(offset)) {
+                pending.push(offset);
+            }
+        }
+        
+        const sendChunk = async (offset) => {
+            for (let attempt = 0; ; attempt++) {
+                let response = null;
+                try {
+                    response = await fetch(`/meditor/uploads/${upload.upload_id}/?offset=${offset}`, {
+                        method: 'PUT',
+                        headers: { ...headers, 'Content-Type': 'application/octet-stream' },
+                        body: file.slice(offset, offset + upload.chunk_size)
+                    });
+                } catch (error) {
+                    // Network failure, retried below
+                }
+                if (response && response.ok) {
+                    return;
+                }
+                // Client errors will not succeed on retry
+                if ((response && response.status < 500) || attempt >= this.uploadRetries) {
+                    const data = response ? await response.json().catch(() => ({})) : {};
+                    throw new Error(data.error || `Chunk at offset ${offset} could not be sent`);
+                }
+                await new Promise(resolve => setTimeout(resolve, 500 * 2 ** attempt));
+            }
+        };
+        
+        // Keep a few chunks in flight at once
+        const worker = async () => {
+            while (pending.length) {
+                await sendChunk(pending.shift());
+            }
+        };
+        await Promise.all(Array.from({ length: Math.min(this.uploadConcurrency, pending.length) }, worker));
+        
+        const response = await fetch(`/meditor/uploads/${upload.upload_id}/finalize/`, { method: 'POST', headers });
+        const data = await response.json();
+        // 409 means chunks are still missing; anything else ends this upload
+        if (response.status !== 409) {
+            localStorage.removeItem(resumeKey);
+        }
+        return data;
+    }
+};
@@ -0,0 +1,71 @@
+"""
+Content-addressed upload storage for django-meditor
+Files are named after the SHA-256 of their bytes, so identical uploads are
+stored once and every URL points at content that never changes
+"""
+import hashlib
+import os
+from typing import Tuple
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+
+# Pillow format names that do not match their usual file extension
+_FORMAT_EXTENSIONS = {
+    'jpeg': '.jpg',
+    'tiff': '.tif',
+}
+
+
+def upload_path() -> str:
+    return getattr(settings, 'MEDITOR_UPLOAD_PATH', 'meditor/uploads/')
+
+
+def hash_file(uploaded_file) -> str:
+    """SHA-256 hex digest of a file, read chunk by chunk"""
+    digest = hashlib.sha256()
+    if hasattr(uploaded_file, 'seek'):
+        uploaded_file.seek(0)
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    if hasattr(uploaded_file, 'seek'):
+        uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def file_extension(uploaded_file) -> str:
+    """Extension from the decoded image format, falling back to the file name"""
+    # ImageField validation leaves the decoded Pillow image on the file
+    image = getattr(uploaded_file, 'image', None)
+    image_format = getattr(image, 'format', None)
+    if image_format:
+        image_format = image_format.lower()
+        return _FORMAT_EXTENSIONS.get(image_format, f'.{image_format}')
+
+    _, ext = os.path.splitext(uploaded_file.name or '')
+    return ext.lower() or '.png'  # Default to .png if no extension
+
+
+def content_path(digest: str, ext: str) -> str:
+    """Storage path for a digest, sharded by its first two characters"""
+    return os.path.join(upload_path(), digest[:2], f'{digest}{ext}')
+
+
+def store_content_addressed(uploaded_file, digest: str = None) -> Tuple[str, bool]:
+    """Save a file under its content hash
+
+    Returns (path, created). When the content is already stored nothing is
+    written and created is False.
+    """
+    digest = digest or hash_file(uploaded_file)
+    path = content_path(digest, file_extension(uploaded_file))
+    if default_storage.exists(path):
+        return path, False
+
+    saved_path = default_storage.save(path, uploaded_file)
+    if saved_path != path:
+        # A concurrent upload of the same bytes won the race; keep one copy
+        default_storage.delete(saved_path)
+        return path, False
+    return path, True
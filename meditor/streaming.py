@@ -0,0 +1,53 @@
+"""
+Streaming markdown rendering for django-meditor
+Yields HTML block by block so large documents start sending immediately
+"""
+from typing import Iterator
+
+from django.http import StreamingHttpResponse
+
+from .derivatives import responsive_images
+from .preview import iter_rendered_blocks
+
+
+def stream_markdown(value: str) -> Iterator[str]:
+    """Yield the HTML of markdown_to_html(value) in block-sized chunks
+
+    Joining the chunks gives exactly the non-streaming output. Only one
+    block of HTML is held at a time, so peak memory tracks the largest
+    block rather than the whole document. A document with a [TOC] marker
+    is rendered in full (or read from the render cache) for its table of
+    contents before that block is sent.
+    """
+    if not value:
+        return
+
+    previous = None
+    for html in iter_rendered_blocks(value):
+        if not html:
+            continue
+        if previous is not None:
+            yield previous
+        previous = html
+
+    if previous is not None:
+        # A full render strips trailing whitespace from the document
+        yield previous.rstrip()
+
+
+def markdown_streaming_response(value: str, before: str = '', after: str = '',
+                                content_type: str = 'text/html; charset=utf-8', **kwargs) -> StreamingHttpResponse:
+    """Serve rendered markdown through a StreamingHttpResponse
+
+    before and after are sent around the document, e.g. the page head and
+    foot of a template rendered with a placeholder split point.
+    """
+    def chunks():
+        if before:
+            yield before
+        for html in stream_markdown(value):
+            yield responsive_images(html)
+        if after:
+            yield after
+
+    return StreamingHttpResponse(chunks(), content_type=content_type, **kwargs)
@@ -1,20 +1,62 @@
 from django import template
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
 from django.utils.safestring import mark_safe
 import markdown
-import re
-from ..extensions import process_markdown_extensions
+from ..cache import RenderCache, content_hash
+from ..derivatives import responsive_images
+from ..engine import MARKDOWN_EXTENSIONS, engine_pool
+from ..extensions import markdown_processor, process_markdown_extensions
+from ..highlight import highlight_fingerprint
+from ..analysis import empty_analysis
+from ..metrics import timed
+from ..postprocessors import postprocessors_setting
 
 register = template.Library()
 
-# Create markdown instance once for better performance
-_md = markdown.Markdown(extensions=[
-    'markdown.extensions.toc',
-    'markdown.extensions.tables', 
-    'markdown.extensions.fenced_code',
-    'markdown.extensions.codehilite',
-    'markdown.extensions.nl2br',
-    'markdown.extensions.sane_lists',
-])
+
+def extension_template_sources():
+    """(template name, source digest) of every extension template
+    
+    Overriding or editing a template changes the output without touching
+    any setting, so the sources themselves are part of the fingerprint.
+    """
+    sources = []
+    for extension in markdown_processor.extensions:
+        try:
+            template = extension.template.get()
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            sources.append((extension.template_name, None))
+            continue
+        source = getattr(getattr(template, 'template', None), 'source', None) or ''
+        sources.append((extension.template_name, content_hash(source)[:16]))
+    return sources
+
+
+def render_fingerprint():
+    """Everything that changes the rendered output, for cache invalidation"""
+    return (
+        markdown.__version__,
+        highlight_fingerprint(),
+        MARKDOWN_EXTENSIONS,
+        getattr(settings, 'MEDITOR_CUSTOM_EXTENSIONS', []),
+        getattr(settings, 'MEDITOR_EXTENSION_RENDERERS', True),
+        extension_template_sources(),
+        postprocessors_setting(),
+        getattr(settings, 'MEDITOR_INTERNAL_HOSTS', []),
+        getattr(settings, 'MEDITOR_HEADING_ANCHOR_TEXT', '¶'),
+    )
+
+
+# Holds whole documents (see render_document), so the HTML, table of
+# contents and analysis of a page all come from one render
+render_cache = RenderCache('document', render_fingerprint)
+
+
+def renderer_version():
+    """Identifier for the active rendering pipeline, stored with pre-rendered HTML"""
+    return render_cache.fingerprint
+
 
 @register.filter(name='markdown_to_html')
 def markdown_to_html(value):
@@ -22,24 +64,83 @@ def markdown_to_html(value):
     if not value:
         return ''
     
-    # First, process custom markdown extensions (if any are configured)
-    try:
-        processed_content = process_markdown_extensions(value)
-    except Exception:
-        # Fallback to original content if extensions fail
-        processed_content = value
-    
-    # Convert markdown to HTML
-    html = _md.convert(processed_content)
-    
-    # Add target="_blank" to external links
-    html = re.sub(
-        r'<a([^>]*)href="([^"]*)"([^>]*)>',
-        r'<a\1href="\2"\3 target="_blank" rel="noopener noreferrer">',
-        html
-    )
+    with timed('markdown_to_html', len(value)):
+        html = cached_document(value)['html']
+        
+        with timed('responsive_images', len(html)):
+            html = responsive_images(html)
     
-    return mark_safe(html) 
+    return mark_safe(html)
+
+
+def cached_document(value):
+    """render_document through the render cache, unless it is disabled"""
+    if not getattr(settings, 'MEDITOR_RENDER_CACHE_ENABLED', True):
+        return render_document(value)
+    return render_cache.get_or_render(value, render_document)
+
+
+def render_document(value):
+    """Run the full extension + Markdown pipeline without caching
+    
+    Returns {'html', 'toc', 'toc_tokens', 'analysis'} from one conversion;
+    see meditor.analysis for the analysis keys.
+    """
+    with timed('render', len(value)):
+        # First, process custom markdown extensions (if any are configured)
+        try:
+            with timed('extensions', len(value)):
+                processed_content = process_markdown_extensions(value)
+        except Exception:
+            # Fallback to original content if extensions fail
+            processed_content = value
+        
+        # Convert markdown to HTML with a clean engine from the pool. Links,
+        # images and headings are post-processed on its element tree
+        # (meditor.postprocessors), not in the HTML string.
+        document = engine_pool.convert_document(processed_content)
+    
+    document['analysis'] = dict(document['analysis'] or empty_analysis(), characters=len(value))
+    return document
+
+
+def render_markdown(value):
+    """Rendered HTML only, without caching"""
+    return render_document(value)['html']
+
+
+@register.filter(name='markdown_analysis')
+def markdown_analysis(value):
+    """Word count, reading time, heading outline, link/image counts and code
+    languages of a document, cached with its HTML
+    
+    Usage: {% with post.body|markdown_analysis as stats %}{{ stats.words }}{% endwith %}
+    """
+    if not value:
+        return empty_analysis()
+    return cached_document(value)['analysis']
+
+
+@register.simple_tag(name='markdown_document')
+def markdown_document(value):
+    """HTML, table of contents and analysis of a document from one render
+    
+    Usage: {% markdown_document post.body as doc %}
+           <nav>{{ doc.toc }}</nav> <article>{{ doc.html }}</article>
+    
+    toc is the toc extension's <div class="toc">, toc_tokens its nested
+    heading list. The bundle is cached as one unit with markdown_to_html.
+    """
+    if not value:
+        return {'html': '', 'toc': '', 'toc_tokens': [], 'analysis': empty_analysis()}
+    
+    document = cached_document(value)
+    return {
+        'html': mark_safe(responsive_images(document['html'])),
+        'toc': mark_safe(document['toc']),
+        'toc_tokens': document['toc_tokens'],
+        'analysis': document['analysis'],
+    }
 
 
 @register.filter(name='markdown_reading_time')
@@ -48,16 +149,11 @@ def markdown_reading_time(value):
     if not value:
         return "0 min read"
     
-    # Count words in markdown content
-    words = len(value.split())
-    
-    # Average reading speed of 200 words per minute
-    minutes = words / 200
-    
-    # Round to nearest minute, minimum 1 minute
-    minutes = max(1, round(minutes))
+    # Words of the rendered text at 200 words per minute, from the cached
+    # analysis, so a list page re-uses renders instead of re-counting
+    minutes = max(1, markdown_analysis(value)['reading_time'])
     
     if minutes == 1:
         return "1 min read"
     else:
-        return f"{minutes} min read"
\ No newline at end of file
+        return f"{minutes} min read"
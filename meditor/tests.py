@@ -1,3 +1,963 @@
-from django.test import TestCase
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import markdown
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, models
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import isolate_apps
+from django.utils.functional import empty
+from django.urls import include, path, reverse
+
+from .assets import build_assets, build_manifest
+from .checks import check_render_pipeline
+from .benchmarks import compare, load_baseline, markdown_document, measure, office_html, save_baseline
+from .chunked import ChunkedUploadError, assemble_upload, discard_upload, start_upload, write_chunk
+from .derivatives import generate_derivatives, responsive_images
+from .engine import MARKDOWN_EXTENSIONS, MarkdownEnginePool, engine_pool
+from .executor import run_in_executor
+from .fields import MarkdownField
+from .highlight import highlight_cache
+from .metrics import ServerTimingMiddleware, get_sink, timed
+from .models import MarkdownSnippet
+from .paste import PastedHtmlCleaner, convert_pasted_html
+from .storage import content_path, store_content_addressed
+from .postprocessors import PostprocessorExtension
+from .preview import block_cache, diff_blocks, iter_rendered_blocks, render_blocks, split_blocks
+from .search import backend, restore_search_triggers
+from .streaming import stream_markdown
+from .warmup import reload_pipeline, warm_up
+from .widgets import RichMarkdownWidget
+from .templatetags.markdown_filters import (
+    markdown_analysis, markdown_reading_time, markdown_to_html, render_cache, render_document, render_markdown,
+    renderer_version,
+)
+from .extensions import AlertExtension, MarkdownProcessor, QuoteExtension, markdown_processor
+
+
+class MarkdownEnginePoolTests(SimpleTestCase):
+    """Engine pool isolation and concurrency"""
+
+    def test_state_does_not_leak_between_documents(self):
+        pool = MarkdownEnginePool(MARKDOWN_EXTENSIONS, max_size=1)
+        pool.convert("# First\n\n[ref]: https://example.com/")
+        html = pool.convert("[link][ref]")
+        self.assertNotIn('https://example.com/', html)
+        with pool.engine() as md:
+            md.convert("## Only heading")
+            self.assertEqual([t['name'] for t in md.toc_tokens], ['Only heading'])
+
+    def test_pool_is_bounded(self):
+        pool = MarkdownEnginePool(MARKDOWN_EXTENSIONS, max_size=2)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(pool.convert, ["# doc %d" % i for i in range(64)]))
+        self.assertLessEqual(pool.stats()['created'], 2)
+
+    def test_clear_retires_checked_out_engines(self):
+        pool = MarkdownEnginePool(MARKDOWN_EXTENSIONS, max_size=1)
+        with pool.engine() as md:
+            pool.clear()
+        self.assertEqual(pool.stats(), {'created': 0, 'idle': 0, 'max_size': 1})
+        with pool.engine() as fresh:
+            self.assertIsNot(fresh, md)
+
+    def test_concurrent_stress(self):
+        """Each document must come back with only its own content, and
+        throughput must not collapse as threads are added"""
+        pool = MarkdownEnginePool(MARKDOWN_EXTENSIONS, max_size=8)
+
+        def document(i):
+            return "# Title %d\n\n[link][r%d]\n\n[r%d]: https://example.com/%d\n\n```python\nx = %d\n```\n" % (i, i, i, i, i)
+
+        def check(i):
+            html = pool.convert(document(i))
+            assert 'https://example.com/%d"' % i in html, html
+            assert 'Title %d<' % i in html, html
+            return html
+
+        jobs = 200
+        throughput = {}
+        for workers in (1, 4, 8):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(check, range(jobs)))
+            throughput[workers] = jobs / (time.perf_counter() - start)
+
+        # Conversion is CPU bound and holds the GIL, so the bar is that the
+        # pool adds no contention, not linear speed-up
+        self.assertGreater(throughput[8], throughput[1] * 0.5, throughput)
+
+
+class MarkdownProcessorTests(SimpleTestCase):
+    """Single-pass extension scanner"""
+
+    def setUp(self):
+        self.processor = MarkdownProcessor()
+
+    def sequential(self, content):
+        for extension in self.processor.extensions:
+            content = extension.pattern.sub(extension.render, content)
+        return content
+
+    def test_matches_per_extension_substitution(self):
+        documents = [
+            "no blocks here",
+            "a {{gallery}}![x](y.png){{/gallery}} b {{code:py}}x = 1{{/code}}",
+            "{{alert:a}} {{alert:b}} x {{/alert}} y {{/alert}}",
+            "{{{quote:Someone}}words{{/quote}} {{alert}}not an alert{{/alert}}",
+            "{{gallery:x}}a{{/gallery}} {{unknown}}b{{/unknown}}",
+        ]
+        for document in documents:
+            self.assertEqual(self.processor.process(document), self.sequential(document))
+
+    def test_unclosed_openers_scale_linearly(self):
+        def elapsed(n):
+            start = time.perf_counter()
+            self.processor.process("{{gallery}} {{code:x}} " * n)
+            return time.perf_counter() - start
+
+        small, large = elapsed(2000), elapsed(16000)
+        self.assertLess(large, small * 8 * 4 + 0.05)
+
+    def test_python_renderers_match_templates(self):
+        samples = [
+            (AlertExtension(), "{{alert:Warning}}a <b>\n\nc{{/alert}}"),
+            (QuoteExtension(), "{{quote:Me & you}}q\nline{{/quote}}"),
+            (QuoteExtension(), "{{quote: }}q{{/quote}}"),
+        ]
+        for extension, source in samples:
+            data = extension.extract_data(extension.pattern.search(source))
+            self.assertTrue(extension.use_renderer())
+            self.assertEqual(extension.renderer(data), extension.render_template(data))
+
+
+@isolate_apps('meditor')
+class MarkdownFieldTests(SimpleTestCase):
+    """Pre-rendered HTML storage"""
+
+    def make_model(self):
+        class Article(models.Model):
+            body = MarkdownField()
+            title = models.CharField(max_length=100, blank=True)
+
+            class Meta:
+                app_label = 'meditor'
+
+        return Article
+
+    def test_companion_fields(self):
+        Article = self.make_model()
+        fields = Article._meta.concrete_fields
+        self.assertEqual(
+            [field.name for field in fields], ['id', 'body', 'title', 'body_rendered', 'body_renderer_version']
+        )
+        # Fields compare by creation counter, so the companions must not share one with title
+        self.assertEqual(len(set(fields)), len(fields))
+        _, _, _, kwargs = Article._meta.get_field('body').deconstruct()
+        self.assertFalse(kwargs['add_companion_fields'])
+
+    def test_pre_save_stores_html_and_version(self):
+        Article = self.make_model()
+        article = Article(body="# Title")
+        Article._meta.get_field('body').pre_save(article, True)
+        self.assertIn('<h1 id="title">Title</h1>', article.body_rendered)
+        self.assertTrue(article.body_renderer_version)
+        self.assertEqual(article.body_html, article.body_rendered)
+
+    def test_stored_html_matches_rerender_and_srcset_is_added_on_read(self):
+        import io
+        from PIL import Image
+        from django.core.files.storage import default_storage
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (600, 300), 'blue').save(buffer, 'PNG')
+        Article = self.make_model()
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root, MEDIA_URL='/media/', MEDITOR_IMAGE_WIDTHS=[480]):
+            path, _ = store_content_addressed(SimpleUploadedFile('photo.png', buffer.getvalue()))
+            generate_derivatives(path)
+            article = Article(body=f"![photo]({default_storage.url(path)})")
+            Article._meta.get_field('body').pre_save(article, True)
+
+            self.assertEqual(article.body_rendered, render_markdown(article.body))
+            self.assertNotIn('srcset', article.body_rendered)
+            self.assertIn('-480w.webp 480w', article.body_html)
+
+
+@isolate_apps('meditor', attr_name='apps')
+class RerenderCommandTests(TransactionTestCase):
+    """meditor_rerender bulk re-rendering"""
+
+    def setUp(self):
+        class Post(models.Model):
+            body = MarkdownField()
+
+            class Meta:
+                app_label = 'meditor'
+
+        self.Post = Post
+        with connection.schema_editor() as editor:
+            editor.create_model(Post)
+        self.addCleanup(self.drop_table)
+        patcher = mock.patch('meditor.management.commands.meditor_rerender.apps', self.apps)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        Post.objects.bulk_create([Post(body=f"# Post {i}") for i in range(5)])
+
+    def drop_table(self):
+        with connection.schema_editor() as editor:
+            editor.delete_model(self.Post)
+
+    def rerender(self, *args, **options):
+        out = StringIO()
+        call_command('meditor_rerender', 'meditor.Post', *args, workers=1, stdout=out, **options)
+        return out.getvalue()
+
+    def test_renders_every_row_in_chunks(self):
+        self.Post.objects.update(body_rendered='', body_renderer_version='')
+        output = self.rerender(chunk_size=2)
+        self.assertIn("5 row(s) to render", output)
+        self.assertEqual([line.split()[0] for line in output.splitlines() if 'rows/s' in line], ['2/5', '4/5', '5/5'])
+        for post in self.Post.objects.all():
+            self.assertEqual(post.body_rendered, render_markdown(post.body))
+            self.assertEqual(post.body_renderer_version, renderer_version())
+
+    def test_stale_only_skips_current_rows(self):
+        pks = list(self.Post.objects.order_by('pk').values_list('pk', flat=True))
+        self.Post.objects.filter(pk__in=pks[:2]).update(body_rendered='old', body_renderer_version='old')
+        self.Post.objects.filter(pk=pks[2]).update(body_rendered='edited')
+        output = self.rerender('body', stale_only=True)
+        self.assertIn("2 row(s) to render", output)
+        rendered = dict(self.Post.objects.values_list('pk', 'body_rendered'))
+        self.assertEqual(rendered[pks[0]], render_markdown("# Post 0"))
+        self.assertEqual(rendered[pks[2]], 'edited')
+
+    def test_template_override_marks_rows_stale(self):
+        version = renderer_version()
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, 'meditor', 'extensions'))
+            with open(os.path.join(directory, 'meditor', 'extensions', 'alert.html'), 'w') as f:
+                f.write('<aside>{{ content }}</aside>')
+            templates = [dict(settings.TEMPLATES[0], DIRS=[directory])]
+            with override_settings(TEMPLATES=templates):
+                self.assertNotEqual(renderer_version(), version)
+        with override_settings(MEDITOR_EXTENSION_RENDERERS=False):
+            self.assertNotEqual(renderer_version(), version)
+        self.assertEqual(renderer_version(), version)
+
+
+class BlockPreviewTests(SimpleTestCase):
+    """Incremental block preview"""
+
+    document = (
+        "# Intro\n\nSee [the docs][docs].\n\n- a\n- b\n\n- c\n\n"
+        "```python\nx = 1\n\ny = 2\n```\n\n{{alert:info}}\nfirst\n\nsecond\n{{/alert}}\n\n"
+        "# Intro\n\n| a | b |\n|---|---|\n| 1 | 2 |\n\n[docs]: https://example.com/docs\n"
+    )
+
+    def test_blocks_keep_multi_paragraph_constructs_whole(self):
+        blocks = split_blocks(self.document)
+        self.assertIn("- a\n- b\n\n- c", blocks)
+        self.assertIn("```python\nx = 1\n\ny = 2\n```", blocks)
+        self.assertIn("{{alert:info}}\nfirst\n\nsecond\n{{/alert}}", blocks)
+
+    def test_blocks_match_full_render(self):
+        documents = [
+            self.document,
+            "# Title\n- a\n\n- b\n\nafter",
+            "## Steps\n1. one\n\n2. two\n",
+            "# Title\n> q1\n\n> q2",
+            "Text\n> q1\n\n> q2\n\nafter",
+        ]
+        for document in documents:
+            joined = ''.join(block['html'] for block in render_blocks(document))
+            self.assertEqual(joined.rstrip(), render_markdown(document))
+
+    def test_known_blocks_are_not_resent(self):
+        blocks = render_blocks(self.document)
+        result = diff_blocks(blocks, [blocks[0]['id']])
+        self.assertEqual(result['blocks'][0], {'id': blocks[0]['id']})
+        self.assertIn('html', result['blocks'][1])
+
+    def test_raw_html_and_toc_blocks_match_full_render(self):
+        documents = [
+            "Intro\n\n<div class=\"note\">\nfirst\n\nsecond *not em*\n</div>\n\nAfter *text*\n",
+            "[TOC]\n\n# One\n\ntext\n\n## Two\n\n# One\n",
+        ]
+        for document in documents:
+            self.assertEqual(''.join(iter_rendered_blocks(document)).rstrip(), render_markdown(document))
+
+    def test_repeated_blocks_keep_their_html(self):
+        blocks = render_blocks("same\n\nother\n\nsame")
+        self.assertEqual(blocks[0]['id'], blocks[2]['id'])
+        # Only ids the client sent count as known, not ids earlier in the response
+        self.assertEqual([block['html'] for block in diff_blocks(blocks, [])['blocks']], [block['html'] for block in blocks])
+        result = diff_blocks(blocks, [blocks[0]['id']])
+        self.assertEqual([sorted(block) for block in result['blocks']], [['id'], ['html', 'id'], ['id']])
+
+
+class StreamingRenderTests(SimpleTestCase):
+    """Block-by-block streaming output"""
+
+    def test_stream_matches_full_render(self):
+        documents = [
+            BlockPreviewTests.document,
+            "a\nb\n\n> quote\n\n> more\n\n1. x\n2. y\n\n***\n\n<div>\nraw\n</div>\n\ntext *em*\n\n    code\n",
+            "# H\n\n## H\n\n# H\n\n* a\n\n    nested para\n\n* b\n\nfinal",
+            "```\nunclosed\n\nfence",
+        ]
+        for document in documents:
+            self.assertEqual(''.join(stream_markdown(document)), render_markdown(document))
+
+    def test_raw_html_with_blank_lines_matches_full_render(self):
+        documents = [
+            "Intro\n\n<div class=\"note\">\nfirst\n\nsecond *not em*\n</div>\n\nAfter *text*\n",
+            "<div>\n<div>\na\n\nb\n</div>\n\nc\n</div>\n\n<!--\nhidden\n\ncomment\n-->\n\nend",
+        ]
+        for document in documents:
+            self.assertEqual(''.join(stream_markdown(document)), render_markdown(document))
+
+    def test_toc_marker_matches_full_render(self):
+        document = "[TOC]\n\n# One\n\ntext\n\n## Two\n\n# One\n"
+        html = ''.join(stream_markdown(document))
+        self.assertEqual(html, render_markdown(document))
+        self.assertIn('href="#one_1"', html)
+
+    def test_lists_and_quotes_after_other_lines_match_full_render(self):
+        documents = [
+            "# Title\n- a\n\n- b",
+            "## Steps\n1. one\n\n2. two\n",
+            "# Title\n> q1\n\n> q2",
+            "Text\n> q1\n\n> q2",
+            "Text\n\n  - nested\n- a\n\n- b",
+            "> q\n    lazy\n<!-- unclosed\n1. one\n\n> more",
+        ]
+        for document in documents:
+            self.assertEqual(''.join(stream_markdown(document)), render_markdown(document))
+
+    def test_extension_and_fence_boundaries_match_full_render(self):
+        documents = [
+            "{{quote}}\ntext\n{{alert:info}}\na\n{{/quote}}\n\n{{/alert}}\n\n- b",
+            "~~~js\nnot closed by\n~~~js\n\n> q",
+            "<div>\n<!-- c\n</div>\n-->\n\nstill raw\n</div>\n\nafter",
+        ]
+        for document in documents:
+            self.assertEqual(''.join(stream_markdown(document)), render_markdown(document))
+
+    def test_toc_marker_swallowed_by_raw_html_matches_full_render(self):
+        for document in ("<div>unclosed\n\n[TOC]", "# One\n\n<div>\n[TOC]\n\n[TOC]\n"):
+            html = ''.join(stream_markdown(document))
+            self.assertEqual(html, render_markdown(document))
+            self.assertNotIn('MEDITORBLOCKEND', html)
+
+    def test_empty_document_streams_nothing(self):
+        self.assertEqual(list(stream_markdown('')), [])
+
+
+class PostprocessorTests(SimpleTestCase):
+    """Element tree post-processing"""
+
+    def convert(self, text, processors):
+        pool = MarkdownEnginePool(MARKDOWN_EXTENSIONS[:-1] + [PostprocessorExtension(processors=processors)])
+        return pool.convert(text)
+
+    @override_settings(MEDITOR_INTERNAL_HOSTS=['.example.com'])
+    def test_only_external_links_open_in_new_tab(self):
+        html = self.convert(
+            "[a](https://other.org/) [b](/local) [c](https://docs.example.com/) [d](mailto:me@other.org)",
+            ['external_links'],
+        )
+        self.assertEqual(html.count('target="_blank"'), 1)
+        self.assertIn('<a href="https://other.org/" rel="noopener noreferrer" target="_blank">', html)
+
+    def test_images_and_headings(self):
+        html = self.convert("# Title\n\n![alt](/a.png)", ['lazy_images', 'heading_anchors'])
+        self.assertIn('<img alt="alt" decoding="async" loading="lazy" src="/a.png" />', html)
+        self.assertIn('<a class="headerlink" href="#title" title="Permanent link">', html)
+
+    def test_block_preview_renames_heading_anchors(self):
+        try:
+            with override_settings(MEDITOR_POSTPROCESSORS=['heading_anchors']):
+                engine_pool.clear()
+                block_cache.clear()
+                html = ''.join(iter_rendered_blocks("# Intro\n\n# Intro"))
+        finally:
+            engine_pool.clear()
+            block_cache.clear()
+        self.assertIn('<h1 id="intro_1">Intro<a class="headerlink" href="#intro_1"', html)
+
+
+class DocumentAnalysisTests(SimpleTestCase):
+    """Analysis gathered while rendering"""
+
+    document = (
+        "# Intro\n\nSee [the docs](https://example.com) and ![a chart](/chart.png) below\n\n"
+        "## Usage\n\n```python\nimport meditor\n```\n\n~~~ {.js}\nrender()\n~~~\n\n```python\npass\n```\n"
+    )
+
+    def test_analysis_counts_rendered_prose(self):
+        analysis = render_document(self.document)['analysis']
+        # Prose and the code inside the fenced blocks
+        self.assertEqual(analysis['words'], 11)
+        self.assertEqual(analysis['characters'], len(self.document))
+        self.assertEqual(analysis['reading_time'], 1)
+        self.assertEqual([(h['level'], h['id']) for h in analysis['headings']], [(1, 'intro'), (2, 'usage')])
+        self.assertEqual((analysis['links'], analysis['images']), (1, 1))
+        self.assertEqual(analysis['code_blocks'], 3)
+        self.assertEqual(analysis['code_languages'], ['python', 'js'])
+
+    def test_stashed_html_words_are_counted(self):
+        body = ' '.join(['word'] * 600)
+        for document in (f"<div>\n{body}\n</div>", f"{{{{alert:info}}}}\n{body}\n{{{{/alert}}}}", f"Intro\n\n```\n{body}\n```"):
+            self.assertGreaterEqual(render_document(document)['analysis']['words'], 600)
+            self.assertEqual(markdown_reading_time(document), '3 min read')
+        self.assertEqual(render_document("a <span>b</span> c")['analysis']['words'], 3)
+
+    def test_unclosed_fence_is_not_a_code_block(self):
+        analysis = render_document("```js\nunclosed\n\n~~~ {.py}\nclosed\n~~~")['analysis']
+        self.assertEqual(analysis['code_blocks'], 1)
+        self.assertEqual(analysis['code_languages'], ['py'])
+
+    def test_filters_share_one_cached_render(self):
+        render_cache.clear()
+        render_cache.reset_stats()
+        markdown_to_html(self.document)
+        self.assertEqual(markdown_reading_time(self.document), '1 min read')
+        self.assertEqual(markdown_analysis(self.document)['images'], 1)
+        self.assertEqual(render_cache.stats()['misses'], 1)
+
+
+class RenderBundleTests(SimpleTestCase):
+    """HTML and table of contents from one render"""
+
+    def test_template_gets_body_and_toc_from_one_conversion(self):
+        render_cache.clear()
+        render_cache.reset_stats()
+        template = Template(
+            "{% load markdown_filters %}{% markdown_document body as doc %}"
+            "<nav>{{ doc.toc }}</nav>{{ doc.html }}{{ doc.toc_tokens.0.children.0.id }}"
+        )
+        html = template.render(Context({'body': "# Guide\n\n## Install <b>now</b>\n\ntext"}))
+
+        self.assertIn('<li><a href="#install-now">Install now</a></li>', html)
+        self.assertIn('<h2 id="install-now">Install <b>now</b></h2>', html)
+        self.assertTrue(html.endswith('install-now'))
+        self.assertEqual(render_cache.stats()['misses'], 1)
+        self.assertEqual(markdown_to_html("# Guide\n\n## Install <b>now</b>\n\ntext").count('<h2'), 1)
+        self.assertEqual(render_cache.stats()['misses'], 1)
+
+
+class HighlightCacheTests(SimpleTestCase):
+    """Code blocks highlighted once per distinct source"""
+
+    def test_repeated_blocks_are_highlighted_once(self):
+        source = "```bash\npip install django-meditor\n```\n\ntext\n\n```bash\npip install django-meditor\n```\n"
+        uncached = markdown.Markdown(extensions=[name for name in MARKDOWN_EXTENSIONS if name != 'meditor.highlight'])
+        highlight_cache.clear()
+        highlight_cache.reset_stats()
+
+        self.assertEqual(engine_pool.convert(source), uncached.convert(source))
+        self.assertEqual(engine_pool.convert(source), uncached.convert(source))
+        self.assertEqual((highlight_cache.stats()['misses'], highlight_cache.stats()['hits']), (1, 3))
+
+    def test_options_are_part_of_the_key(self):
+        source = "```python\nx = 1\n```"
+        highlight_cache.clear()
+        plain = MarkdownEnginePool(MARKDOWN_EXTENSIONS).convert(source)
+        numbered = MarkdownEnginePool(
+            MARKDOWN_EXTENSIONS, {'markdown.extensions.codehilite': {'linenums': True}}
+        ).convert(source)
+        self.assertNotIn('linenos', plain)
+        self.assertIn('linenos', numbered)
+
+
+class MetricsTests(SimpleTestCase):
+    """Render pipeline instrumentation"""
+
+    def tearDown(self):
+        engine_pool.clear()
+
+    @override_settings(MEDITOR_METRICS_SINK='meditor.metrics.MemorySink')
+    def test_stages_and_extensions_are_timed_by_name(self):
+        engine_pool.clear()
+        source = "{{alert:info}}Careful{{/alert}}\n\n```python\nx = 1\n```\n"
+        render_markdown(source)
+
+        stats = get_sink().stats()
+        for stage in ('render', 'extensions', 'extension.alert', 'markdown', 'markdown.CachedHiliteTreeprocessor'):
+            self.assertEqual(stats[stage]['count'], 1, stage)
+        self.assertEqual(stats['render']['size'], len(source))
+
+    @override_settings(MEDITOR_METRICS_SINK=None, MEDITOR_SERVER_TIMING=False)
+    def test_disabled_timers_are_shared_no_ops(self):
+        self.assertIs(timed('render'), timed('markdown'))
+
+    @override_settings(MEDITOR_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        middleware = ServerTimingMiddleware(lambda request: HttpResponse(render_markdown('# Title')))
+        response = middleware(RequestFactory().get('/'))
+        self.assertRegex(response['Server-Timing'], r'meditor-render;dur=[0-9.]+;desc="x1"')
+
+    @override_settings(MEDITOR_SERVER_TIMING=True)
+    async def test_server_timing_includes_executor_work(self):
+        async def view(request):
+            return HttpResponse(await run_in_executor(render_markdown, '# Title'))
+
+        response = await ServerTimingMiddleware(view)(RequestFactory().get('/'))
+        self.assertRegex(response['Server-Timing'], r'meditor-render;dur=[0-9.]+;desc="x1"')
+
+
+class WarmUpTests(SimpleTestCase):
+    """Lazy construction, warm-up and settings-change reload"""
+
+    def test_warm_up_builds_pipeline_ahead_of_first_render(self):
+        reload_pipeline()
+        self.assertIs(markdown_processor._wrapped, empty)
+        self.assertEqual(engine_pool.stats()['created'], 0)
+
+        timings = warm_up(['python'])
+        self.assertEqual(set(timings), {'extensions', 'engine', 'lexers', 'render'})
+        self.assertIsNot(markdown_processor._wrapped, empty)
+        self.assertGreaterEqual(engine_pool.stats()['idle'], 1)
+
+    def test_setting_change_rebuilds_pipeline(self):
+        source = "[[note]]Hello[[/note]]"
+        note = {'pattern': r'\[\[note\]\](.*?)\[\[/note\]\]', 'template': 'meditor/extensions/quote.html', 'name': 'note'}
+        with override_settings(MEDITOR_CUSTOM_EXTENSIONS=[note]):
+            self.assertNotIn('[[note]]', render_markdown(source))
+        self.assertIn('[[note]]', render_markdown(source))
+
+    def test_failed_extensions_are_logged_and_checked(self):
+        with self.assertLogs('meditor', 'WARNING'):
+            with override_settings(MEDITOR_CUSTOM_EXTENSIONS=['meditor.missing.Extension'],
+                                   MEDITOR_POSTPROCESSORS=['meditor.missing.Processor']):
+                messages = check_render_pipeline()
+        self.assertEqual([message.id for message in messages], ['meditor.W001', 'meditor.W002'])
+
+
+class EditorAssetTests(SimpleTestCase):
+    """Editor core script selection and the minified build"""
+
+    def test_widget_includes_built_core_script(self):
+        with override_settings(MEDITOR_MINIFIED_ASSETS=True):
+            scripts = RichMarkdownWidget().media._js
+        self.assertEqual(scripts, [f"meditor/js/dist/{build_manifest()['core.js']}"])
+        with override_settings(MEDITOR_MINIFIED_ASSETS=False):
+            scripts = RichMarkdownWidget().media._js
+        self.assertEqual(scripts, ['meditor/js/editor/core.js'])
+
+    def test_build_is_up_to_date(self):
+        try:
+            import rjsmin  # noqa: F401
+        except ImportError:
+            self.skipTest("rjsmin is not installed")
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(build_assets(output_dir=directory), build_manifest())
+
+
+class BenchmarkTests(SimpleTestCase):
+    """Benchmark corpus and baselines"""
+
+    def test_corpus_is_reproducible(self):
+        self.assertEqual(markdown_document(5), markdown_document(5))
+        self.assertNotEqual(markdown_document(5), markdown_document(5, seed=1))
+        self.assertEqual(office_html(30), office_html(30))
+
+    def test_baseline_flags_regressions(self):
+        result = measure('large', lambda: None, 10)
+        result.update(p50_us=100.0, p90_us=120.0, peak_kb=10.0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline(path, {'render': [result]})
+            baseline = load_baseline(path)
+
+        self.assertEqual(list(compare({'render': [result]}, baseline)), [])
+        result.update(p50_us=130.0, p90_us=140.0)
+        regressions = list(compare({'render': [result]}, baseline, tolerance=0.25))
+        self.assertEqual([(r['key'], r['metric']) for r in regressions], [('render: large', 'p50_us')])
+
+
+class PastedHtmlTests(SimpleTestCase):
+    """Office paste pre-processing"""
+
+    office_html = (
+        "<html><head><style>p.MsoNormal{mso-style-parent:'';}</style></head><body>"
+        "<!--[if gte mso 9]><xml><w:WordDocument></w:WordDocument></xml><![endif]-->"
+        "<p class=MsoNormal style='mso-margin-top-alt:auto'><span style='mso-bidi-font-family:Calibri'>"
+        "Hello <b>world</b><o:p></o:p></span></p>"
+        "<img src=\"data:image/png;base64,iVBORw0KGgo=\" alt=\"pic\">"
+        "</body></html>"
+    )
+
+    def test_office_bloat_is_stripped(self):
+        result = convert_pasted_html(self.office_html)
+        self.assertEqual(result['markdown'].strip(), 'Hello **world**')
+        self.assertLess(result['stats']['cleaned_bytes'], result['stats']['input_bytes'] / 2)
+        self.assertEqual(result['stats']['images_dropped'], 1)
+
+    def test_inline_images_are_externalized(self):
+        saved = []
+
+        def save(image_file):
+            saved.append(image_file.read())
+            return '/media/pasted.png'
+
+        result = convert_pasted_html(self.office_html, save_image=save)
+        self.assertIn('![pic](/media/pasted.png)', result['markdown'])
+        self.assertEqual(len(saved), 1)
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=1024, MEDITOR_PASTE_MAX_SIZE=4096)
+    def test_paste_limit_is_independent_of_upload_memory_limit(self):
+        url = reverse('meditor:html_to_markdown')
+        response = self.client.post(url, {'html': '<p>word</p>' * 200}, 'application/json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(url, {'html': '<p>word</p>' * 500}, 'application/json')
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('too large', response.json()['error'])
+
+    def test_unclosed_blocks_clean_in_linear_time(self):
+        cleaner = PastedHtmlCleaner()
+
+        def elapsed(n):
+            start = time.perf_counter()
+            for opener in ('<!--', '<style>', '<p ', '<o:p '):
+                cleaner.clean(opener * n)
+            return time.perf_counter() - start
+
+        small, large = elapsed(1000), elapsed(8000)
+        self.assertLess(large, small * 8 * 4 + 0.05)
+
+
+class ContentAddressedStorageTests(SimpleTestCase):
+    """Deduplicating upload storage"""
+
+    def test_identical_uploads_are_stored_once(self):
+        import tempfile
+        from django.core.files.storage import default_storage
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            first, created = store_content_addressed(SimpleUploadedFile('a.PNG', b'same bytes'))
+            second, created_again = store_content_addressed(SimpleUploadedFile('b.png', b'same bytes'))
+            self.assertTrue(created)
+            self.assertFalse(created_again)
+            self.assertEqual(first, second)
+            self.assertTrue(first.endswith('.png'))
+            self.assertEqual(len(default_storage.listdir(os.path.dirname(first))[1]), 1)
+
+    def test_path_is_derived_from_content(self):
+        self.assertEqual(content_path('abcdef', '.png'), 'meditor/uploads/ab/abcdef.png')
+
+
+class ImageDerivativeTests(SimpleTestCase):
+    """Responsive WebP copies of uploads"""
+
+    def test_derivatives_are_resized_stripped_and_linked(self):
+        import io
+        import tempfile
+        from PIL import Image
+        from django.core.files.storage import default_storage
+
+        image = Image.new('RGB', (1000, 500), 'red')
+        exif = image.getexif()
+        exif[0x010f] = 'Camera'
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', exif=exif)
+
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root, MEDIA_URL='/media/', MEDITOR_IMAGE_WIDTHS=[480, 1600]):
+            path, _ = store_content_addressed(SimpleUploadedFile('photo.jpg', buffer.getvalue()))
+            self.assertEqual(generate_derivatives(path), [480, 1000])
+
+            with default_storage.open(path.replace('.jpg', '-480w.webp')) as derivative:
+                resized = Image.open(derivative)
+                self.assertEqual(resized.size, (480, 240))
+                self.assertEqual(dict(resized.getexif()), {})
+
+            html = responsive_images(f'<p><img alt="x" src="{default_storage.url(path)}" /></p>')
+            self.assertIn('-480w.webp 480w, ', html)
+            self.assertIn('-1000w.webp 1000w" sizes="', html)
+            self.assertEqual(responsive_images('<img src="/elsewhere.png" />'), '<img src="/elsewhere.png" />')
+
+    @override_settings(MEDITOR_IMAGE_MANIFEST_CACHE_SIZE=2)
+    def test_manifest_lookups_are_bounded(self):
+        from .derivatives import _manifest_widths, stats
+        for i in range(5):
+            _manifest_widths(f'{i:064x}', f'missing/{i}.png')
+        self.assertEqual(stats()['missing'], 2)
+
+
+class ChunkedUploadTests(SimpleTestCase):
+    """Resumable chunked uploads"""
+
+    def test_chunks_assemble_in_any_order_and_are_verified(self):
+        import hashlib
+        import io
+        import tempfile
+        from types import SimpleNamespace
+
+        user = SimpleNamespace(pk=1)
+        data = bytes(range(256)) * 40
+        with tempfile.TemporaryDirectory() as upload_dir, \
+                override_settings(MEDITOR_CHUNKED_UPLOAD_DIR=upload_dir, MEDITOR_UPLOAD_CHUNK_SIZE=4096):
+            upload = start_upload(user, 'a.bin', len(data), hashlib.sha256(data).hexdigest())
+            upload_id = upload['upload_id']
+            for offset in (8192, 0):
+                write_chunk(user, upload_id, offset, io.BytesIO(data[offset:offset + 4096]))
+
+            with self.assertRaises(ChunkedUploadError) as missing:
+                assemble_upload(user, upload_id)
+            self.assertEqual(missing.exception.status, 409)
+            with self.assertRaises(ChunkedUploadError):
+                write_chunk(SimpleNamespace(pk=2), upload_id, 4096, io.BytesIO(data[4096:8192]))
+
+            status = write_chunk(user, upload_id, 4096, io.BytesIO(data[4096:8192]))
+            self.assertEqual(status['received'], [0, 4096, 8192])
+            with assemble_upload(user, upload_id) as assembled:
+                self.assertEqual(assembled.read(), data)
+            discard_upload(upload_id)
+
+            upload = start_upload(user, 'b.bin', 3, '0' * 64)
+            write_chunk(user, upload['upload_id'], 0, io.BytesIO(b'abc'))
+            with self.assertRaises(ChunkedUploadError) as mismatch:
+                assemble_upload(user, upload['upload_id'])
+            self.assertEqual(mismatch.exception.status, 422)
+
+
+class BatchUploadTests(SimpleTestCase):
+    """Multi-file uploads"""
+
+    def test_results_are_per_file_and_in_order(self):
+        import io
+        import tempfile
+        from PIL import Image
+        from django.test import RequestFactory
+        from .views import batch_upload_result
+
+        def png(name, width):
+            buffer = io.BytesIO()
+            Image.new('RGB', (width, 10)).save(buffer, 'PNG')
+            return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+        files = [png('a.png', 10), SimpleUploadedFile('b.png', b'not an image'), png('c.png', 20)]
+        request = RequestFactory().post('/meditor/upload-images/')
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root, MEDITOR_IMAGE_DERIVATIVES=False):
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                results = list(executor.map(lambda image_file: batch_upload_result(request, image_file), files))
+
+        self.assertEqual([result['filename'] for result in results], ['a.png', 'b.png', 'c.png'])
+        self.assertEqual([result['success'] for result in results], [True, False, True])
+        self.assertIn('Invalid image file', results[1]['error'])
+
+
+# AsyncViewTests serve the async views from this module
+urlpatterns = [path('meditor/', include('meditor.async_urls'))]
+
+
+@override_settings(ROOT_URLCONF='meditor.tests')
+class AsyncViewTests(TestCase):
+    """Request-level tests of the async views"""
+
+    def setUp(self):
+        self.async_client.force_login(User.objects.create_user('staff', is_staff=True))
+
+    def png(self):
+        import io
+        from PIL import Image
+        buffer = io.BytesIO()
+        Image.new('RGB', (10, 10)).save(buffer, 'PNG')
+        return SimpleUploadedFile('a.png', buffer.getvalue(), 'image/png')
+
+    async def test_block_preview(self):
+        url = reverse('meditor:block_preview')
+        data = (await self.async_client.post(url, {'content': '# Title\n\ntext', 'known': []}, 'application/json')).json()
+        self.assertTrue(data['success'])
+        self.assertEqual([block['html'] for block in data['blocks']], ['<h1 id="title">Title</h1>\n', '<p>text</p>\n'])
+
+        response = await self.async_client.post(url, 'not json', 'application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((await self.async_client.get(url)).status_code, 405)
+
+    async def test_upload_image(self):
+        url = reverse('meditor:upload_image')
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root, MEDITOR_IMAGE_DERIVATIVES=False):
+            data = (await self.async_client.post(url, {'image': self.png()})).json()
+        self.assertTrue(data['success'])
+        self.assertTrue(data['url'].endswith('.png'))
+
+        response = await self.async_client.post(url, {'image': SimpleUploadedFile('b.png', b'not an image')})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((await self.async_client.post(url)).status_code, 400)
+
+    async def test_upload_failure_is_logged(self):
+        with mock.patch('meditor.async_views.store_image', side_effect=OSError('disk full')), \
+                self.assertLogs('meditor', 'ERROR') as logs:
+            response = await self.async_client.post(reverse('meditor:upload_image'), {'image': self.png()})
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json()['error'], 'Upload failed: disk full')
+        self.assertIn('disk full', logs.output[0])
+
+    def test_sync_upload_failure_is_logged(self):
+        from .views import upload_image
+
+        request = RequestFactory().post('/meditor/upload-image/', {'image': self.png()})
+        request.user = User(username='staff', is_staff=True)
+        with mock.patch('meditor.views.store_image', side_effect=OSError('disk full')), \
+                self.assertLogs('meditor', 'ERROR') as logs:
+            response = upload_image(request)
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('disk full', logs.output[0])
+
+    async def test_html_to_markdown(self):
+        url = reverse('meditor:html_to_markdown')
+        data = (await self.async_client.post(url, {'html': '<p><strong>bold</strong></p>'}, 'application/json')).json()
+        self.assertTrue(data['success'])
+        self.assertIn('**bold**', data['markdown'])
+
+        self.assertEqual((await self.async_client.post(url, 'not json', 'application/json')).status_code, 400)
+        with override_settings(MEDITOR_PASTE_MAX_SIZE=10):
+            response = await self.async_client.post(url, {'html': '<p>too long</p>'}, 'application/json')
+        self.assertEqual(response.status_code, 413)
+
+
+class SnippetListTests(TestCase):
+    """Paginated snippet listing"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('owner', is_staff=True)
+        other = User.objects.create_user('other')
+        for i in range(4):
+            MarkdownSnippet.objects.create(user=self.user, name=f'own {i}', content='x' * 150, is_public=i == 0)
+        MarkdownSnippet.objects.create(user=other, name='public', content='shared', is_public=True)
+        self.private = MarkdownSnippet.objects.create(user=other, name='private', content='secret')
+        self.client.force_login(self.user)
+
+    def test_pages_cover_own_and_public_snippets_once(self):
+        names = []
+        cursor = ''
+        while True:
+            with self.assertNumQueries(4):  # session, user, own and public rows of one page
+                data = self.client.get(reverse('meditor:snippets_list'), {'limit': 2, 'cursor': cursor}).json()
+            names += [snippet['name'] for snippet in data['snippets']]
+            self.assertNotIn('content', data['snippets'][0])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(names, ['public', 'own 3', 'own 2', 'own 1', 'own 0'])
+        self.assertEqual(len(data['snippets'][-1]['preview']), 103)
+
+    def test_detail_returns_content_of_visible_snippets_only(self):
+        public = MarkdownSnippet.objects.get(name='public')
+        self.assertEqual(self.client.get(reverse('meditor:snippet_detail', args=[public.id])).json()['snippet']['content'], 'shared')
+        self.assertEqual(self.client.get(reverse('meditor:snippet_detail', args=[self.private.id])).status_code, 404)
+
+
+class SnippetSearchTests(TestCase):
+    """Full-text snippet search"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('owner', is_staff=True)
+        other = User.objects.create_user('other')
+        MarkdownSnippet.objects.create(user=self.user, name='Django tables', category='code', content='| a |')
+        MarkdownSnippet.objects.create(user=self.user, name='Notes', category='misc', content='about django tables')
+        MarkdownSnippet.objects.create(user=other, name='Django private', content='tables', is_public=False)
+        self.client.force_login(self.user)
+
+    def search(self, query):
+        data = self.client.get(reverse('meditor:snippet_search'), {'q': query}).json()
+        return [snippet['name'] for snippet in data['snippets']]
+
+    def test_prefix_terms_are_ranked_by_field(self):
+        self.assertEqual(self.search('dja tab'), ['Django tables', 'Notes'])
+        self.assertEqual(self.search('nothing here'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        snippet = MarkdownSnippet.objects.get(name='Notes')
+        snippet.content = 'renamed'
+        snippet.save()
+        self.assertEqual(self.search('renam'), ['Notes'])
+        snippet.delete()
+        self.assertEqual(self.search('renam'), [])
+
+    @override_settings(MEDITOR_SNIPPET_SEARCH_WINDOW=2)
+    def test_paging_continues_past_the_ranked_window(self):
+        for i in range(3):
+            MarkdownSnippet.objects.create(user=self.user, name=f'Table {i}', content='x')
+        names, cursor = [], None
+        while True:
+            params = {'q': 'tab', 'limit': 2, **({'cursor': cursor} if cursor else {})}
+            data = self.client.get(reverse('meditor:snippet_search'), params).json()
+            names += [snippet['name'] for snippet in data['snippets']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(sorted(names), ['Django tables', 'Notes', 'Table 0', 'Table 1', 'Table 2'])
+
+    def test_dropped_triggers_are_restored(self):
+        if backend(connection) != 'sqlite':
+            self.skipTest("SQLite FTS5 index not in use")
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER meditor_snippet_fts_insert")
+        MarkdownSnippet.objects.create(user=self.user, name='Unindexed', content='x')
+        self.assertEqual(self.search('unindex'), [])
+
+        self.assertEqual(restore_search_triggers(), ['meditor_snippet_fts_insert'])
+        self.assertEqual(self.search('unindex'), ['Unindexed'])
+        MarkdownSnippet.objects.create(user=self.user, name='Indexed again', content='x')
+        self.assertEqual(self.search('again'), ['Indexed again'])
+        self.assertEqual(restore_search_triggers(), [])
+
+
+@override_settings(DEBUG=False, TEMPLATES=[{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'OPTIONS': {'loaders': [('django.template.loaders.locmem.Loader', {
+        'meditor/markdownsnippet_preview.html': '{{ markdownsnippet.name }}|{{ preview_message }}',
+    })]},
+}])
+class GenericPreviewTests(TestCase):
+    """Draft storage and cached preview pages"""
+
+    def setUp(self):
+        from . import views
+        views._preview_templates.clear()
+        self.user = User.objects.create_user('owner', is_staff=True)
+        self.snippet = MarkdownSnippet.objects.create(user=self.user, name='Saved', content='x')
+        self.url = reverse('meditor:generic_preview', args=['meditor', 'markdownsnippet', self.snippet.pk])
+        self.client.force_login(self.user)
+
+    def test_saved_object_revalidates_until_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.content, b'Saved|This is a preview.')
+        etag = response['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        MarkdownSnippet.objects.filter(pk=self.snippet.pk).update(name='Renamed', updated_at=self.snippet.updated_at.replace(year=2100))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'Renamed|This is a preview.')
+
+    def test_posted_draft_is_rendered_from_its_token(self):
+        draft = {'name': 'Draft ' + 'x' * 10000}
+        first = self.client.post(self.url, draft).json()
+        second = self.client.post(self.url, draft).json()
+        self.assertEqual(first['token'], second['token'])
+
+        response = self.client.get(first['url'])
+        self.assertTrue(response.content.startswith(b'Draft xxx'))
+        self.assertEqual(self.client.get(first['url'], HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        other = User.objects.create_user('other', is_staff=True)
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(first['url']).status_code, 404)
@@ -1,13 +1,20 @@
 from django.urls import path
-from .views import HtmlToMarkdownView, generic_preview, upload_image, snippets_list, save_snippet, delete_snippet
+from .views import HtmlToMarkdownView, block_preview, generic_preview, upload_image, upload_images, chunked_upload_start, chunked_upload, chunked_upload_finalize, snippets_list, snippet_detail, snippet_search, save_snippet, delete_snippet
 
 app_name = 'meditor'
 
 urlpatterns = [
     path('html2md/', HtmlToMarkdownView.as_view(), name='html_to_markdown'),
     path('upload-image/', upload_image, name='upload_image'),
+    path('upload-images/', upload_images, name='upload_images'),
+    path('uploads/', chunked_upload_start, name='chunked_upload_start'),
+    path('uploads/<str:upload_id>/', chunked_upload, name='chunked_upload'),
+    path('uploads/<str:upload_id>/finalize/', chunked_upload_finalize, name='chunked_upload_finalize'),
     path('snippets/', snippets_list, name='snippets_list'),
     path('snippets/save/', save_snippet, name='save_snippet'),
+    path('snippets/search/', snippet_search, name='snippet_search'),
+    path('snippets/<int:snippet_id>/', snippet_detail, name='snippet_detail'),
     path('snippets/<int:snippet_id>/delete/', delete_snippet, name='delete_snippet'),
+    path('preview/blocks/', block_preview, name='block_preview'),
     path('preview/<str:app_label>/<str:model_name>/<int:pk>/', generic_preview, name='generic_preview'),
 ] 
\ No newline at end of file
@@ -1,54 +1,483 @@
-from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
-import html2text
+import base64
+import heapq
 import json
+import logging
 from django.apps import apps
 from django.template.loader import select_template
 from django.contrib.admin.views.decorators import staff_member_required
-from django.http import Http404
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.db.models import Q
 from django.template.defaultfilters import mark_safe
 from meditor.templatetags.markdown_filters import markdown_to_html
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.core.files.images import ImageFile
-from django.core.exceptions import ValidationError
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.conf import settings
-import os
+import time
 from datetime import datetime
-from .models import MarkdownSnippet
+from .models import MarkdownSnippet, truncate_preview
+from .paste import PasteBudgetExceeded, convert_pasted_html, paste_deadline, paste_max_size
+from .preview import diff_blocks, render_blocks
+from .search import search_snippets
+from .chunked import ChunkedUploadError, assemble_upload, discard_upload, start_upload, upload_status, write_chunk
+from .cache import content_hash
+from .derivatives import schedule_derivatives
+from .drafts import last_modified_field, load_draft, page_cache, store_draft
+from .executor import get_executor
+from .storage import store_content_addressed
+
+logger = logging.getLogger('meditor')
 
 # Create your views here.
 
+def validate_image(image_file):
+    """Return an error message for an invalid upload, or None if it is acceptable"""
+    # Use Django's ImageField validation
+    from django.forms import ImageField
+    
+    # Create a temporary ImageField to validate the file
+    temp_field = ImageField()
+    
+    # Validate the file using Django's built-in validation
+    try:
+        temp_field.clean(image_file, None)
+    except ValidationError as e:
+        return f'Invalid image file: {", ".join(e.messages)}'
+    
+    # Validate file size using configurable setting
+    max_size = getattr(settings, 'EDITOR_MAX_IMAGE_SIZE', 20 * 1024 * 1024)  # Default 20MB
+    if image_file.size > max_size:
+        max_size_mb = max_size / (1024 * 1024)
+        file_size_mb = image_file.size / (1024 * 1024)
+        return f'File too large: {file_size_mb:.1f}MB. Maximum size is {max_size_mb:.0f}MB.'
+    
+    return None
+
+
+def get_upload_handler():
+    """Return the configured MEDITOR_UPLOAD_HANDLER callable, if any"""
+    custom_upload_handler = getattr(settings, 'MEDITOR_UPLOAD_HANDLER', None)
+    if custom_upload_handler:
+        # Import and use custom upload handler
+        from django.utils.module_loading import import_string
+        return import_string(custom_upload_handler)
+    return None
+
+
+def store_image(image_file, digest=None):
+    """Default upload behavior - save to media directory and return the URL
+    
+    Files are content-addressed (MEDITOR_UPLOAD_PATH/ab/abcdef....ext), so
+    re-uploading the same image reuses the stored copy and its URL. Pass
+    digest when the SHA-256 is already known to skip hashing the file again.
+    """
+    path, created = store_content_addressed(image_file, digest=digest)
+    # Resized WebP copies are produced in the background
+    schedule_derivatives(path)
+    return default_storage.url(path)
+
+
+def pasted_image_saver(request, user):
+    """Return a callable that stores images extracted from pasted HTML
+    
+    Only staff may upload, matching upload_image; for anyone else inline
+    images are dropped from the paste instead.
+    """
+    if not (user.is_active and user.is_staff):
+        return None
+    if not getattr(settings, 'MEDITOR_PASTE_EXTRACT_IMAGES', True):
+        return None
+    
+    def save(image_file):
+        if validate_image(image_file):
+            return None
+        handler = get_upload_handler()
+        if handler:
+            response = handler(request, image_file)
+            data = json.loads(response.content)
+            return data.get('url') if data.get('success') else None
+        return store_image(image_file)
+    
+    return save
+
+
+def convert_paste_request(request, user):
+    """Shared body of the HTML to Markdown views; returns (payload, status)"""
+    started = time.perf_counter()
+    try:
+        max_size = paste_max_size()
+        if max_size:
+            # request.body stops at DATA_UPLOAD_MAX_MEMORY_SIZE, which is usually
+            # below MEDITOR_PASTE_MAX_SIZE, so read the stream with our own bound
+            size = int(request.META.get('CONTENT_LENGTH') or 0)
+            body = b'' if size > max_size else request.read(max_size + 1)
+            size = max(size, len(body))
+            if size > max_size:
+                return {
+                    'success': False,
+                    'error': f'Pasted HTML too large: {size / (1024 * 1024):.1f}MB. '
+                             f'Maximum size is {max_size / (1024 * 1024):.0f}MB.'
+                }, 413
+        else:
+            body = request.body
+        
+        data = json.loads(body)
+        html_content = data.get('html', '')
+        
+        result = convert_pasted_html(
+            html_content,
+            save_image=pasted_image_saver(request, user),
+            deadline=paste_deadline()
+        )
+        
+        return {
+            'success': True,
+            'markdown': result['markdown'],
+            'conversion_ms': round((time.perf_counter() - started) * 1000, 1),
+            'stats': result['stats']
+        }, 200
+    except PasteBudgetExceeded as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'conversion_ms': round((time.perf_counter() - started) * 1000, 1)
+        }, 413
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }, 400
+
+
+def upload_batch_size():
+    return getattr(settings, 'MEDITOR_UPLOAD_BATCH_SIZE', 20)
+
+
+def batch_upload_result(request, image_file):
+    """Validate and store one file of a batch upload, returning its result dict"""
+    try:
+        error = validate_image(image_file)
+        if error:
+            return {'success': False, 'filename': image_file.name, 'error': error}
+        
+        handler = get_upload_handler()
+        if handler:
+            result = json.loads(handler(request, image_file).content)
+            result.setdefault('filename', image_file.name)
+            return result
+        
+        return {'success': True, 'url': store_image(image_file), 'filename': image_file.name}
+    except Exception as e:
+        return {'success': False, 'filename': image_file.name, 'error': f'Upload failed: {str(e)}'}
+
+
+def batch_upload_response(results):
+    return JsonResponse({
+        'success': True,
+        'uploaded': sum(1 for result in results if result.get('success')),
+        'failed': sum(1 for result in results if not result.get('success')),
+        'results': results
+    })
+
+
+def chunked_start_request(request, user):
+    """Begin a chunked upload from a JSON {filename, size, sha256} body
+    
+    Returns (payload, status) for a JsonResponse.
+    """
+    try:
+        data = json.loads(request.body)
+        return start_upload(user, data.get('filename'), data.get('size'), data.get('sha256')), 200
+    except json.JSONDecodeError:
+        return {'success': False, 'error': 'Invalid JSON data'}, 400
+    except ChunkedUploadError as e:
+        return {'success': False, 'error': str(e)}, e.status
+
+
+def chunked_chunk_request(request, user, upload_id):
+    """GET reports received chunks, PUT ?offset=N stores one, DELETE aborts"""
+    try:
+        if request.method == 'GET':
+            return upload_status(user, upload_id), 200
+        if request.method == 'PUT':
+            try:
+                offset = int(request.GET.get('offset', ''))
+            except ValueError:
+                return {'success': False, 'error': 'Chunk offset is required'}, 400
+            return write_chunk(user, upload_id, offset, request), 200
+        if request.method == 'DELETE':
+            upload_status(user, upload_id)
+            discard_upload(upload_id)
+            return {'success': True}, 200
+    except ChunkedUploadError as e:
+        return {'success': False, 'error': str(e)}, e.status
+    return {'success': False, 'error': 'Invalid request method'}, 405
+
+
+def chunked_finalize_request(request, user, upload_id):
+    """Verify an assembled chunked upload and store it like upload_image would"""
+    try:
+        image_file = assemble_upload(user, upload_id)
+    except ChunkedUploadError as e:
+        return {'success': False, 'error': str(e)}, e.status
+    
+    try:
+        error = validate_image(image_file)
+        if error:
+            return {'success': False, 'error': error}, 400
+        
+        handler = get_upload_handler()
+        if handler:
+            response = handler(request, image_file)
+            return json.loads(response.content), response.status_code
+        
+        url = store_image(image_file, digest=image_file.sha256)
+        return {'success': True, 'url': url, 'filename': image_file.name}, 200
+    finally:
+        image_file.close()
+        discard_upload(upload_id)
+
+
+def snippet_data(snippet, is_owner):
+    """Serialize a snippet for the editor"""
+    return {
+        'id': snippet.id,
+        'name': snippet.name,
+        'content': snippet.content,
+        'category': snippet.category,
+        'preview': snippet.preview,
+        'is_owner': is_owner,
+        'created_at': snippet.created_at.isoformat()
+    }
+
+
+def snippet_summary(row, user):
+    """Serialize a MarkdownSnippet.objects.summaries() row for the listing"""
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'category': row['category'],
+        'preview': truncate_preview(row['preview_source']),
+        'is_owner': row['user_id'] == user.pk,
+        'created_at': row['created_at'].isoformat()
+    }
+
+
+def encode_snippet_cursor(row):
+    value = f"{row['updated_at'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def snippet_page_query(user, cursor=None, limit=None):
+    """Querysets for one page of snippets, newest first
+    
+    Keyset pagination on (updated_at, id): the cursor is the last row of the
+    previous page, so every page is an index range scan however deep it is.
+    The user's own snippets and other users' public ones are separate
+    queries, one per index, because an OR of the two defeats both indexes;
+    snippet_page merges them. One extra row is fetched to tell whether
+    another page follows. Raises ValueError for a malformed cursor.
+    """
+    max_limit = getattr(settings, 'MEDITOR_SNIPPET_PAGE_SIZE', 50)
+    limit = max(1, min(int(limit or max_limit), max_limit))
+    queries = [
+        MarkdownSnippet.objects.filter(user=user),
+        # is_public=True compiles to a bare column test, which SQLite will
+        # not match against an index; IN (true) is the same test and will
+        MarkdownSnippet.objects.filter(is_public__in=[True]).exclude(user=user),
+    ]
+    if cursor:
+        updated_at, snippet_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        updated_at = datetime.fromisoformat(updated_at)
+        after = Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=int(snippet_id))
+        queries = [queryset.filter(after) for queryset in queries]
+    return [queryset.order_by('-updated_at', '-id').summaries()[:limit + 1] for queryset in queries], limit
+
+
+def snippet_page(results, limit, user):
+    """Build the snippets_list payload from the rows of snippet_page_query's querysets"""
+    rows = list(heapq.merge(*results, key=lambda row: (row['updated_at'], row['id']), reverse=True))
+    return {
+        'success': True,
+        'snippets': [snippet_summary(row, user) for row in rows[:limit]],
+        'next_cursor': encode_snippet_cursor(rows[limit - 1]) if len(rows) > limit else None
+    }
+
+
+def snippet_search_request(request, user):
+    """Ranked search over the user's and public snippets: ?q=&limit=&cursor=
+    
+    Returns (payload, status) in the snippets_list format; the cursor is
+    the offset of the next page.
+    """
+    max_limit = getattr(settings, 'MEDITOR_SNIPPET_PAGE_SIZE', 50)
+    try:
+        limit = max(1, min(int(request.GET.get('limit') or max_limit), max_limit))
+        offset = max(0, int(request.GET.get('cursor') or 0))
+    except ValueError:
+        return {'success': False, 'error': 'Invalid cursor or limit'}, 400
+    
+    rows, has_more = search_snippets(user, request.GET.get('q', ''), limit, offset)
+    return {
+        'success': True,
+        'snippets': [snippet_summary(row, user) for row in rows],
+        'next_cursor': str(offset + limit) if has_more else None
+    }, 200
+
+
+# (app_label, model_name) -> (model, template); templates are only looked
+# up again when DEBUG is on, so new templates show up during development
+_preview_templates = {}
+
+
+def resolve_preview_template(app_label, model_name):
+    """Return the model class and template used by generic_preview"""
+    key = (app_label, model_name)
+    if key in _preview_templates and not settings.DEBUG:
+        return _preview_templates[key]
+    
+    try:
+        model = apps.get_model(app_label, model_name)
+    except LookupError:
+        raise Http404("Model not found")
+    
+    # Use the existing template for this model
+    template_names = [
+        f"{app_label}/{model_name}_preview.html",
+        f"{app_label}/{model_name}.html",
+    ]
+    _preview_templates[key] = model, select_template(template_names)
+    return _preview_templates[key]
+
+
+def build_preview_context(request, model, model_name, obj, data=None):
+    """Build the generic_preview context for a saved object or a dummy draft (obj=None)
+    
+    data holds draft field values. They are applied to the saved object, or
+    to the dummy one; without data a dummy object is filled from request.GET.
+    """
+    if not obj:
+        # Create a dummy object of the actual model
+        obj = model()
+        obj.pk = 999999  # Give it a temporary ID for template compatibility
+        obj.id = 999999  # Also set id for consistency
+        if data is None:
+            data = request.GET
+    
+    # Set attributes from form data, but skip many-to-many fields
+    for key, value in (data or {}).items():
+        if hasattr(obj, key):
+            try:
+                field = obj._meta.get_field(key)
+            except FieldDoesNotExist:
+                # Properties and methods are not draft fields
+                continue
+            if field.is_relation and field.many_to_many:
+                # Skip many-to-many fields - they need special handling
+                continue
+            else:
+                setattr(obj, key, value)
+    
+    # Create context with the object (real or dummy)
+    # Pass the object with the model name as the key (e.g., 'post' for Post model)
+    context = {
+        model_name: obj,  # Dynamic: 'post', 'article', 'product', etc.
+        "object": obj,
+        "is_preview": True,
+        "preview_message": "This is a preview of unsaved content." if not obj.pk or obj.pk == 999999 else "This is a preview."
+    }
+    
+    # Also add individual fields to context for the generic template fallback
+    if not obj.pk or obj.pk == 999999:
+        # For dummy objects, add fields to context for generic template
+        for field in obj._meta.fields:
+            if hasattr(obj, field.name):
+                context[field.name] = getattr(obj, field.name)
+    
+    return context
+
+
+def store_preview_draft(request, user, app_label, model_name, pk):
+    """Store POSTed draft fields (form data or a JSON object) for generic_preview
+    
+    Returns (payload, status); payload['url'] renders the draft.
+    """
+    resolve_preview_template(app_label, model_name)
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return {'success': False, 'error': 'Invalid JSON data'}, 400
+        if not isinstance(data, dict):
+            return {'success': False, 'error': 'Draft must be a JSON object'}, 400
+    else:
+        data = request.POST.dict()
+        data.pop('csrfmiddlewaretoken', None)
+    
+    token = store_draft(user, app_label, model_name, pk, data)
+    return {'success': True, 'token': token, 'url': f"{request.path}?draft={token}"}, 200
+
+
+def preview_response(request, user, app_label, model_name, pk):
+    """Render generic_preview, reusing cached pages and answering 304s
+    
+    Drafts are versioned by their token (a hash of their content) and saved
+    objects by their auto_now timestamp. Requests with ad-hoc GET fields,
+    objects without a timestamp, and DEBUG mode always render fresh.
+    """
+    model, template = resolve_preview_template(app_label, model_name)
+    data = None
+    version = None
+    
+    token = request.GET.get('draft')
+    if token:
+        data = load_draft(user, token, app_label, model_name, pk)
+        if data is None:
+            raise Http404("Draft not found or expired")
+        version = f"draft:{token}"
+    elif not request.GET:
+        field = last_modified_field(model)
+        if field:
+            modified = model.objects.filter(pk=pk).values_list(field, flat=True).first()
+            if modified:
+                version = f"saved:{modified.isoformat()}"
+    
+    cacheable = version is not None and not settings.DEBUG
+    if cacheable:
+        source = f"{user.pk}|{app_label}|{model_name}|{pk}|{version}|{template.origin.name}"
+        etag = f'"{content_hash(page_cache.make_key(source))[:32]}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+    
+    def render_page(_source):
+        obj = model.objects.filter(pk=pk).first()
+        context = build_preview_context(request, model, model_name, obj, data)
+        return template.render(context, request)
+    
+    if not cacheable:
+        return HttpResponse(render_page(None))
+    
+    response = HttpResponse(page_cache.get_or_render(source, render_page))
+    response['ETag'] = etag
+    # Let the browser keep the page but ask every time, so unchanged previews are 304s
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class HtmlToMarkdownView(View):
     """Convert HTML to Markdown via AJAX"""
     
     def post(self, request):
-        try:
-            data = json.loads(request.body)
-            html_content = data.get('html', '')
-            
-            # Configure html2text
-            h = html2text.HTML2Text()
-            h.ignore_links = False
-            h.ignore_images = False
-            h.body_width = 0  # No line wrapping
-            
-            # Convert HTML to Markdown
-            markdown_content = h.handle(html_content)
-            
-            return JsonResponse({
-                'success': True,
-                'markdown': markdown_content
-            })
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            }, status=400)
+        payload, status = convert_paste_request(request, request.user)
+        return JsonResponse(payload, status=status)
 
 @staff_member_required
 def upload_image(request):
@@ -57,68 +486,19 @@ def upload_image(request):
         try:
             image_file = request.FILES['image']
             
-            # Use Django's ImageField validation
-            from django.forms import ImageField
-            from django.core.files.uploadedfile import UploadedFile
-            
-            # Create a temporary ImageField to validate the file
-            temp_field = ImageField()
-            
-            # Validate the file using Django's built-in validation
-            try:
-                temp_field.clean(image_file, None)
-            except ValidationError as e:
-                return JsonResponse({
-                    'success': False,
-                    'error': f'Invalid image file: {", ".join(e.messages)}'
-                }, status=400)
-            
-            # Validate file size using configurable setting
-            max_size = getattr(settings, 'EDITOR_MAX_IMAGE_SIZE', 20 * 1024 * 1024)  # Default 20MB
-            if image_file.size > max_size:
-                max_size_mb = max_size / (1024 * 1024)
-                file_size_mb = image_file.size / (1024 * 1024)
+            error = validate_image(image_file)
+            if error:
                 return JsonResponse({
                     'success': False,
-                    'error': f'File too large: {file_size_mb:.1f}MB. Maximum size is {max_size_mb:.0f}MB.'
+                    'error': error
                 }, status=400)
             
             # Check if custom upload handler is configured
-            custom_upload_handler = getattr(settings, 'MEDITOR_UPLOAD_HANDLER', None)
-            if custom_upload_handler:
-                # Import and use custom upload handler
-                from django.utils.module_loading import import_string
-                handler = import_string(custom_upload_handler)
+            handler = get_upload_handler()
+            if handler:
                 return handler(request, image_file)
             
-            # Default upload behavior - save to media directory
-            from datetime import datetime
-            import hashlib
-            import os
-            
-            # Get current date for directory structure
-            now = datetime.now()
-            year_month = now.strftime('%Y/%m')
-            
-            # Generate hash from filename and timestamp
-            hash_input = f"{image_file.name}_{now.isoformat()}"
-            file_hash = hashlib.md5(hash_input.encode()).hexdigest()[:8]
-            
-            # Get file extension
-            name, ext = os.path.splitext(image_file.name)
-            if not ext:
-                ext = '.png'  # Default to .png if no extension
-            
-            # Create filename: YYYY/MM/hash.ext
-            filename = f"{year_month}/{file_hash}{ext}"
-            
-            # Use Django's default storage
-            upload_path = getattr(settings, 'MEDITOR_UPLOAD_PATH', 'meditor/uploads/')
-            full_path = os.path.join(upload_path, filename)
-            
-            # Save file using default storage
-            saved_path = default_storage.save(full_path, image_file)
-            url = default_storage.url(saved_path)
+            url = store_image(image_file)
             
             return JsonResponse({
                 'success': True,
@@ -127,9 +507,7 @@ def upload_image(request):
             })
             
         except Exception as e:
-            import traceback
-            print(f"Image upload error: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Image upload failed")
             return JsonResponse({
                 'success': False,
                 'error': f'Upload failed: {str(e)}'
@@ -140,43 +518,114 @@ def upload_image(request):
         'error': 'No image file provided'
     }, status=400)
 
+@staff_member_required
+def upload_images(request):
+    """Handle several image uploads in one request
+    
+    Files are validated and stored concurrently; results come back in the
+    order the files were sent, each with its own success flag.
+    """
+    if request.method != 'POST':
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid request method'
+        }, status=405)
+    
+    image_files = request.FILES.getlist('images')
+    if not image_files:
+        return JsonResponse({
+            'success': False,
+            'error': 'No image files provided'
+        }, status=400)
+    if len(image_files) > upload_batch_size():
+        return JsonResponse({
+            'success': False,
+            'error': f'Too many files: at most {upload_batch_size()} per request'
+        }, status=400)
+    
+    results = list(get_executor().map(lambda image_file: batch_upload_result(request, image_file), image_files))
+    return batch_upload_response(results)
+
+@staff_member_required
+def chunked_upload_start(request):
+    """Begin a chunked, resumable image upload"""
+    if request.method == 'POST':
+        payload, status = chunked_start_request(request, request.user)
+        return JsonResponse(payload, status=status)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+@staff_member_required
+def chunked_upload(request, upload_id):
+    """Report, receive or abort the chunks of a chunked upload"""
+    payload, status = chunked_chunk_request(request, request.user, upload_id)
+    return JsonResponse(payload, status=status)
+
+@staff_member_required
+def chunked_upload_finalize(request, upload_id):
+    """Verify and store a completed chunked upload"""
+    if request.method == 'POST':
+        payload, status = chunked_finalize_request(request, request.user, upload_id)
+        return JsonResponse(payload, status=status)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
 @staff_member_required
 def snippets_list(request):
-    """Get list of available snippets for the current user"""
+    """Get one page of the snippets available to the current user
+    
+    Returns names and previews only; fetch full content per snippet from
+    snippet_detail. Pass next_cursor back as ?cursor= for the next page.
+    """
     if request.method == 'GET':
-        # Get user's snippets and public snippets
-        user_snippets = MarkdownSnippet.objects.filter(user=request.user)
-        public_snippets = MarkdownSnippet.objects.filter(is_public=True).exclude(user=request.user)
-        
-        snippets = []
-        
-        # Add user's snippets
-        for snippet in user_snippets:
-            snippets.append({
-                'id': snippet.id,
-                'name': snippet.name,
-                'content': snippet.content,
-                'category': snippet.category,
-                'preview': snippet.preview,
-                'is_owner': True,
-                'created_at': snippet.created_at.isoformat()
-            })
+        try:
+            queries, limit = snippet_page_query(request.user, request.GET.get('cursor'), request.GET.get('limit'))
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid cursor or limit'
+            }, status=400)
         
-        # Add public snippets
-        for snippet in public_snippets:
-            snippets.append({
-                'id': snippet.id,
-                'name': snippet.name,
-                'content': snippet.content,
-                'category': snippet.category,
-                'preview': snippet.preview,
-                'is_owner': False,
-                'created_at': snippet.created_at.isoformat()
-            })
+        return JsonResponse(snippet_page([list(rows) for rows in queries], limit, request.user))
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+@staff_member_required
+def snippet_search(request):
+    """Full-text search over snippet names, categories and content"""
+    if request.method == 'GET':
+        payload, status = snippet_search_request(request, request.user)
+        return JsonResponse(payload, status=status)
+    
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+@staff_member_required
+def snippet_detail(request, snippet_id):
+    """Get one snippet, including its full content"""
+    if request.method == 'GET':
+        try:
+            snippet = MarkdownSnippet.objects.visible_to(request.user).get(id=snippet_id)
+        except MarkdownSnippet.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'error': 'Snippet not found'
+            }, status=404)
         
         return JsonResponse({
             'success': True,
-            'snippets': snippets
+            'snippet': snippet_data(snippet, is_owner=snippet.user_id == request.user.pk)
         })
     
     return JsonResponse({
@@ -228,15 +677,7 @@ def save_snippet(request):
             
             return JsonResponse({
                 'success': True,
-                'snippet': {
-                    'id': snippet.id,
-                    'name': snippet.name,
-                    'content': snippet.content,
-                    'category': snippet.category,
-                    'preview': snippet.preview,
-                    'is_owner': True,
-                    'created_at': snippet.created_at.isoformat()
-                }
+                'snippet': snippet_data(snippet, is_owner=True)
             })
             
         except json.JSONDecodeError:
@@ -285,51 +726,46 @@ def delete_snippet(request, snippet_id):
     }, status=405)
 
 @staff_member_required
-def generic_preview(request, app_label, model_name, pk):
-    model = apps.get_model(app_label, model_name)
-    if not model:
-        raise Http404("Model not found")
-    
-    # Check if we have an existing object
-    obj = model.objects.filter(pk=pk).first()
-    
-    if not obj:
-        # Create a dummy object of the actual model
-        obj = model()
-        obj.pk = 999999  # Give it a temporary ID for template compatibility
-        obj.id = 999999  # Also set id for consistency
-        
-        # Set attributes from form data, but skip many-to-many fields
-        for key, value in request.GET.items():
-            if hasattr(obj, key):
-                field = obj._meta.get_field(key)
-                if field.is_relation and field.many_to_many:
-                    # Skip many-to-many fields - they need special handling
-                    continue
-                else:
-                    setattr(obj, key, value)
-    
-    # Use the existing template for this model
-    template_names = [
-        f"{app_label}/{model_name}_preview.html",
-        f"{app_label}/{model_name}.html",
-    ]
-    template = select_template(template_names)
+def block_preview(request):
+    """Render a draft block by block, returning HTML only for blocks the client lacks"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            content = data.get('content', '')
+            known = data.get('known', [])
+            
+            result = diff_blocks(render_blocks(content), known)
+            
+            return JsonResponse({
+                'success': True,
+                'revision': result['revision'],
+                'blocks': result['blocks']
+            })
+            
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid JSON data'
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
     
-    # Create context with the object (real or dummy)
-    # Pass the object with the model name as the key (e.g., 'post' for Post model)
-    context = {
-        model_name: obj,  # Dynamic: 'post', 'article', 'product', etc.
-        "object": obj,
-        "is_preview": True,
-        "preview_message": "This is a preview of unsaved content." if not obj.pk or obj.pk == 999999 else "This is a preview."
-    }
+    return JsonResponse({
+        'success': False,
+        'error': 'Invalid request method'
+    }, status=405)
+
+@staff_member_required
+def generic_preview(request, app_label, model_name, pk):
+    """Preview a saved object, a stored draft (?draft=<token>), or GET fields
     
-    # Also add individual fields to context for the generic template fallback
-    if not obj.pk or obj.pk == 999999:
-        # For dummy objects, add fields to context for generic template
-        for field in obj._meta.fields:
-            if hasattr(obj, field.name):
-                context[field.name] = getattr(obj, field.name)
+    POST draft fields to store them and get back the draft's preview URL.
+    """
+    if request.method == 'POST':
+        payload, status = store_preview_draft(request, request.user, app_label, model_name, pk)
+        return JsonResponse(payload, status=status)
     
-    return render(request, template.template.name, context)
+    return preview_response(request, request.user, app_label, model_name, pk)
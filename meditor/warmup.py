@@ -0,0 +1,113 @@
+"""
+Start-up and settings-change hooks for django-meditor
+The extension processor, Markdown engines and templates are all built on
+first use. warm_up() builds them ahead of the first request instead, and
+reload_pipeline() throws them away when a setting they were built from
+changes, so they are rebuilt from the new value.
+"""
+import logging
+import time
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+
+
+logger = logging.getLogger('meditor')
+
+DEFAULT_WARM_UP_LANGUAGES = ['python', 'javascript', 'html', 'css', 'bash', 'json']
+
+# Exercises every built-in block, fenced code and the post-processors
+WARM_UP_DOCUMENT = (
+    "# Warm-up\n\n"
+    "Some *text* with [a link](https://example.com) and ![an image](/image.png).\n\n"
+    "{{alert:info}}Alert{{/alert}}\n\n"
+    "{{quote:Author}}Quote{{/quote}}\n\n"
+    "{{code:python}}x = 1{{/code}}\n\n"
+    "{{gallery}}/image.png{{/gallery}}\n\n"
+    "```python\nx = 1\n```\n\n"
+    "| a | b |\n|---|---|\n| 1 | 2 |\n"
+)
+
+# Settings outside the MEDITOR_ namespace that rendering depends on
+RELOAD_SETTINGS = {'TEMPLATES'}
+
+
+def warm_up_languages() -> Iterable[str]:
+    return getattr(settings, 'MEDITOR_WARM_UP_LANGUAGES', DEFAULT_WARM_UP_LANGUAGES)
+
+
+def warm_up(languages: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Build what the first render would otherwise build, and time each step
+
+    Returns seconds per step. Failures are logged, never raised, so a broken
+    custom extension cannot stop a worker from booting.
+    """
+    from .engine import engine_pool
+    from .extensions import markdown_processor
+    from .templatetags.markdown_filters import render_markdown
+
+    timings = {}
+
+    start = time.perf_counter()
+    for extension in markdown_processor.extensions:
+        for compiled in (extension.template, getattr(extension, 'style', None)):
+            if compiled is None:
+                continue
+            try:
+                compiled.get()
+            except (TemplateDoesNotExist, TemplateSyntaxError) as e:
+                logger.warning("Failed to load template %s: %s", compiled.template_name, e)
+    timings['extensions'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with engine_pool.engine():
+        pass
+    timings['engine'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        from pygments.formatters import get_formatter_by_name
+        from pygments.lexers import get_lexer_by_name
+        from pygments.util import ClassNotFound
+    except ImportError:
+        pass
+    else:
+        get_formatter_by_name('html')
+        for language in warm_up_languages() if languages is None else languages:
+            try:
+                get_lexer_by_name(language)
+            except ClassNotFound:
+                logger.warning("No Pygments lexer for %s", language)
+    timings['lexers'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    render_markdown(WARM_UP_DOCUMENT)
+    timings['render'] = time.perf_counter() - start
+
+    return timings
+
+
+def reload_pipeline() -> None:
+    """Discard everything built from settings; it is rebuilt lazily on next use"""
+    from . import views
+    from .drafts import page_cache
+    from .engine import engine_pool
+    from .extensions import reset_markdown_processor
+    from .highlight import highlight_cache
+    from .preview import block_cache
+    from .templatetags.markdown_filters import render_cache
+
+    reset_markdown_processor()
+    engine_pool.clear()
+    for cache in (render_cache, block_cache, page_cache, highlight_cache):
+        cache.clear()
+    views._preview_templates.clear()
+
+
+@receiver(setting_changed)
+def _reload_on_setting_change(setting, **kwargs):
+    if setting.startswith('MEDITOR_') or setting in RELOAD_SETTINGS:
+        reload_pipeline()
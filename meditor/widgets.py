@@ -9,6 +9,8 @@ import re
 from bs4 import BeautifulSoup
 import html2text
 
+from .assets import editor_script
+
 class RichMarkdownWidget(forms.Textarea):
     """Enhanced markdown widget with toolbar, rich editing, and HTML conversion"""
     
@@ -23,11 +25,13 @@ class RichMarkdownWidget(forms.Textarea):
         super().__init__(default_attrs)
         self.auto_convert_html = auto_convert_html
     
-    class Media:
-        css = {
-            'all': ('meditor/css/rich-markdown-editor.css',)
-        }
-        js = ('meditor/js/rich-markdown-editor.js',)
+    @property
+    def media(self):
+        # Only the core script; it imports the editor's other modules when they are first used
+        return forms.Media(
+            css={'all': ('meditor/css/rich-markdown-editor.css',)},
+            js=(editor_script(),),
+        )
     
     def render(self, name, value, attrs=None, renderer=None):
         # Render the textarea first